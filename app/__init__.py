@@ -6,10 +6,13 @@ from flask_cors import CORS
 from .config import Config
 from .extensions import db, jwt, migrate
 
-def create_app():
+def create_app(config_overrides: dict | None = None):
     app = Flask(__name__, instance_relative_config=True)
     app.url_map.strict_slashes = False
     app.config.from_object(Config)
+    if config_overrides:
+        # used by the benchmarks / load tests to point at a local database
+        app.config.update(config_overrides)
 
     CORS(
         app,
@@ -27,6 +30,27 @@ def create_app():
 
     from . import models  # noqa
 
+    from .ml.registry import model_registry
+    from .ml.cache import score_cache
+    score_cache.init_app(app, model_registry)
+    model_registry.init_app(app)
+
+    from .services import fx_history
+    from .services.fx_client import fx_client
+    from .services.fx_store import fx_store
+    fx_client.init_app(app)
+    fx_history.init_app(app, fx_store)
+    fx_store.init_app(app)
+
+    from .services.holiday_calendar import holiday_calendar
+    holiday_calendar.init_app(app)
+
+    from .services.timeline import timelines
+    timelines.init_app(app)
+
+    from .services.search_index import search_index
+    search_index.init_app(app)
+
     api = Api(app)
 
     from .api.auth_routes import blp as AuthBLP
@@ -39,6 +63,7 @@ def create_app():
     from .api.task_routes import blp as TaskBLP
     from .api.calendar_routes import blp as CalendarBLP
     from .api.scoring_routes import blp as ScoringBLP
+    from .api.search_routes import blp as SearchBLP
     
     api.register_blueprint(AuthBLP, url_prefix="/api")
     api.register_blueprint(StartupBLP, url_prefix="/api")
@@ -49,6 +74,7 @@ def create_app():
     api.register_blueprint(FxBLP, url_prefix="/api")
     api.register_blueprint(TaskBLP, url_prefix="/api")
     api.register_blueprint(CalendarBLP, url_prefix="/api")
+    api.register_blueprint(SearchBLP, url_prefix="/api")
     api.register_blueprint(ScoringBLP, url_prefix="/api/scoring")
     
     
@@ -2,15 +2,35 @@
 from datetime import date as dt_date
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
-from flask import current_app
-from marshmallow import Schema, fields
-import requests
+from marshmallow import Schema, fields, validate
+
+from ..services.business_days import classify_range
+from ..services.holiday_calendar import HolidayProviderError, holiday_calendar
+
+blp = Blueprint("calendar", __name__, description="Calendar endpoints (greeting, holidays, business days)")
+
+# every country-year asked for is fetched from Calendarific and stored for good
+COUNTRY_CODE = validate.Regexp(r"^[A-Za-z]{2}$", error="country must be a 2-letter ISO code.")
+MIN_YEAR = 2000
+MAX_YEARS_AHEAD = 5
+
+
+def _check_years(*days):
+    max_year = dt_date.today().year + MAX_YEARS_AHEAD
+    for d in days:
+        if not MIN_YEAR <= d.year <= max_year:
+            abort(400, message=f"Dates must fall between {MIN_YEAR} and {max_year}.")
 
-blp = Blueprint("calendar", __name__, description="Calendar greeting endpoints")
 
 class GreetingQuerySchema(Schema):
     date = fields.Date(required=False)      # optional: ?date=2026-01-10
-    country = fields.Str(required=False)    # optional: ?country=TN
+    country = fields.Str(required=False, validate=COUNTRY_CODE)    # optional: ?country=TN
+
+
+class RangeQuerySchema(Schema):
+    date_from = fields.Date(required=True, data_key="from")   # ?from=2026-03-01
+    date_to = fields.Date(required=True, data_key="to")       # ?to=2026-03-31
+    country = fields.Str(required=False, validate=COUNTRY_CODE)
 
 
 @blp.route("/calendar/greeting")
@@ -20,43 +40,22 @@ class CalendarGreeting(MethodView):
         """
         Returns a greeting based on:
         - weekend (Sat/Sun)
-        - public holiday (via Calendarific)
+        - public holiday (Calendarific, cached per country-year)
         Priority: Holiday > Weekend > Normal day
         """
-        api_key = current_app.config.get("CALENDARIFIC_API_KEY", "")
-        base_url = current_app.config.get("CALENDARIFIC_BASE_URL", "https://calendarific.com/api/v2")
-        default_country = current_app.config.get("CALENDARIFIC_COUNTRY", "TN")
-
-        if not api_key:
-            abort(500, message="CALENDARIFIC_API_KEY is not set in environment.")
-
         d = args.get("date") or dt_date.today()
-        country = (args.get("country") or default_country).upper()
+        _check_years(d)
+        country = (args.get("country") or holiday_calendar.default_country).upper()
 
         # Weekend check (Sat=5, Sun=6 in Python weekday())
         is_weekend = d.weekday() in (5, 6)
 
-        # Calendarific call
-        # Calendarific requires api_key, country, year. month/day are optional filters. :contentReference[oaicite:1]{index=1}
-        params = {
-            "api_key": api_key,
-            "country": country,
-            "year": d.year,
-            "month": d.month,
-            "day": d.day,
-            "type": "national",
-        }
-
         try:
-            r = requests.get(f"{base_url}/holidays", params=params, timeout=10)
-            r.raise_for_status()
-            payload = r.json()
-        except requests.RequestException:
-            abort(502, message="Holiday provider error (Calendarific request failed).")
-
-        holidays = payload.get("response", {}).get("holidays", []) or []
+            holidays = holiday_calendar.holidays_on(d, country)
+        except HolidayProviderError as e:
+            abort(e.status, message=str(e))
         is_holiday = len(holidays) > 0
-        holiday_names = [h.get("name") for h in holidays if h.get("name")]
+        holiday_names = [name for name in holidays if name]
 
         if is_holiday:
             # You can customize the message format
@@ -84,3 +83,20 @@ class CalendarGreeting(MethodView):
             "holidays": [],
             "message": "Have a productive day!"
         }, 200
+
+
+@blp.route("/calendar/range")
+class CalendarRange(MethodView):
+    @blp.arguments(RangeQuerySchema, location="query")
+    def get(self, args):
+        """
+        Classifies every day of [from, to] as WORKDAY / WEEKEND / HOLIDAY
+        (e.g. a whole month for the frontend calendar) in one call.
+        """
+        _check_years(args["date_from"], args["date_to"])
+        try:
+            return classify_range(args["date_from"], args["date_to"], args.get("country")), 200
+        except HolidayProviderError as e:
+            abort(e.status, message=str(e))
+        except ValueError as e:
+            abort(400, message=str(e))
@@ -1,10 +1,13 @@
 # app/api/fx_routes.py
-import os
-import requests
+from datetime import date
+
 from flask import request
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 
+from ..services import fx_history
+from ..services.fx_store import FxUnavailable, fx_store
+
 blp = Blueprint("fx", __name__, description="FX (exchange rates) endpoints")
 
 # Tunisia-relevant defaults (you can edit this list anytime)
@@ -27,14 +30,11 @@ class FxLatest(MethodView):
         {
           "base": "TND",
           "timestamp": <unix>,
-          "rates": { "TND": 1.0, "USD": ..., "EUR": ..., ... }
+          "rates": { "TND": 1.0, "USD": ..., "EUR": ..., ... },
+          "cache": { "age_seconds": ..., "fetched_at": <unix>, "stale": false, "last_error": null }
         }
         """
 
-        app_id = os.getenv("OXR_APP_ID")
-        if not app_id:
-            abort(500, message="Missing OXR_APP_ID environment variable")
-
         # Optional symbols override from query
         symbols_param = request.args.get("symbols", "").strip()
         if symbols_param:
@@ -46,44 +46,43 @@ class FxLatest(MethodView):
         if "TND" not in symbols_list:
             symbols_list.append("TND")
 
-        # If you want USD always included too, uncomment:
-        # if "USD" not in symbols_list:
-        #     symbols_list.append("USD")
-
-        url = "https://openexchangerates.org/api/latest.json"
-        params = {
-            "app_id": app_id,
-            "symbols": ",".join(sorted(set(symbols_list))),
-        }
-
+        # Served from the in-memory USD table (refreshed in the background),
+        # re-pivoted to TND locally for whatever symbols were asked for.
         try:
-            r = requests.get(url, params=params, timeout=10)
-            r.raise_for_status()
-            data = r.json()
-        except requests.exceptions.HTTPError as e:
-            abort(502, message=f"OXR HTTP error: {str(e)}")
-        except requests.exceptions.RequestException as e:
-            abort(502, message=f"OXR request failed: {str(e)}")
+            return fx_store.latest_tnd(symbols_list)
+        except FxUnavailable as e:
+            abort(e.status, message=str(e))
+
 
-        rates_usd = data.get("rates", {})
-        usd_to_tnd = rates_usd.get("TND")
-        if not usd_to_tnd:
-            abort(502, message="TND rate missing from OXR response")
+def _parse_date(name: str):
+    value = request.args.get(name, "").strip()
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be a YYYY-MM-DD date")
 
-        # Convert all requested currencies to BASE=TND
-        # Formula: (USD->CCY) / (USD->TND) = (TND->CCY)
-        rates_tnd = {"TND": 1.0}
 
-        for ccy in symbols_list:
-            if ccy == "TND":
-                continue
-            usd_to_ccy = rates_usd.get(ccy)
-            if usd_to_ccy is None:
-                continue
-            rates_tnd[ccy] = round(usd_to_ccy / usd_to_tnd, 6)
+@blp.route("/fx/history")
+class FxHistory(MethodView):
+    def get(self):
+        """
+        GET /api/fx/history?symbol=EUR&from=2026-01-01&to=2026-03-31
+        Daily TND-based rates recorded by the FX refresher ('to' defaults to
+        today, 'from' to 30 days before 'to').
 
-        return {
-            "base": "TND",
-            "timestamp": data.get("timestamp"),
-            "rates": dict(sorted(rates_tnd.items())),
+        Returns:
+        {
+          "base": "TND", "symbol": "EUR", "from": "...", "to": "...",
+          "points": [ { "date": "2026-01-01", "rate": ... }, ... ]
         }
+        """
+        symbol = request.args.get("symbol", "").strip().upper()
+        if not symbol:
+            abort(400, message="'symbol' is required")
+
+        try:
+            return fx_history.history(symbol, _parse_date("from"), _parse_date("to"))
+        except ValueError as e:
+            abort(400, message=str(e))
@@ -1,30 +1,29 @@
-import json
-import os
+from datetime import date
+
+from flask import Response, request
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
+from marshmallow import Schema, fields, validate
+
+from ..services.hub_service import LOAN_SORTS, HubDataError, best_rates, loans_payload, query_loan_rates
 
 blp = Blueprint("hub", __name__, description="Loans hub")
 
-# -------------------------------------------------
-# Helpers
-# -------------------------------------------------
-def _seed_data_dir():
-    # app/api -> app
-    api_dir = os.path.dirname(__file__)
-    app_dir = os.path.dirname(api_dir)
-    return os.path.join(app_dir, "seed", "data")
 
+class LoanQuerySchema(Schema):
+    bank = fields.Str(required=False)                 # bank name or id
+    product = fields.Str(required=False)              # exact product name
+    max_rate = fields.Float(required=False)
+    valid_on = fields.Date(required=False)            # ?valid_on=2026-01-10
+    sort = fields.Str(required=False, validate=validate.OneOf(list(LOAN_SORTS)))
+    limit = fields.Int(required=False, validate=validate.Range(min=1, max=500))
+    offset = fields.Int(required=False, validate=validate.Range(min=0))
 
-def _read_json(filename):
-    path = os.path.join(_seed_data_dir(), filename)
-    if not os.path.exists(path):
-        abort(500, message=f"File not found: {path}")
 
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        abort(500, message=str(e))
+class BestRateQuerySchema(Schema):
+    product = fields.Str(required=True)
+    on = fields.Date(required=False)                  # default: today
+    limit = fields.Int(required=False, validate=validate.Range(min=1, max=20))
 
 
 # -------------------------------------------------
@@ -32,11 +31,50 @@ def _read_json(filename):
 # -------------------------------------------------
 @blp.route("/hub/loans")
 class HubLoans(MethodView):
-    def get(self):
-        banks = _read_json("banks.json")
-        rates = _read_json("loan_rates.json")
-
-        return {
-            "banks": banks,
-            "rates": rates
-        }
\ No newline at end of file
+    @blp.arguments(LoanQuerySchema, location="query")
+    def get(self, args):
+        """
+        Without query parameters:
+          { "banks": [...], "rates": [...] } from the seed data files, served
+          from pre-serialized bytes with an ETag; a matching If-None-Match
+          gets 304 Not Modified.
+
+        With any of ?bank=&product=&max_rate=&valid_on=&sort=rate&limit=&offset=
+          { "count": N, "limit": ..., "offset": ..., "items": [...] }
+          from the loan_rates table.
+        """
+        if args:
+            return query_loan_rates(
+                bank=args.get("bank"),
+                product=args.get("product"),
+                max_rate=args.get("max_rate"),
+                valid_on=args.get("valid_on"),
+                sort=args.get("sort", "rate"),
+                limit=args.get("limit", 100),
+                offset=args.get("offset", 0),
+            )
+
+        try:
+            body, etag = loans_payload.get()
+        except HubDataError as e:
+            abort(500, message=str(e))
+
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+        return Response(body, status=200, mimetype="application/json", headers=headers)
+
+
+@blp.route("/hub/loans/best")
+class HubBestRate(MethodView):
+    @blp.arguments(BestRateQuerySchema, location="query")
+    def get(self, args):
+        """
+        Lowest rate(s) for a product valid on a date.
+        GET /api/hub/loans/best?product=Crédit Mawilni&on=2026-01-10&limit=3
+        """
+        on = args.get("on") or date.today()
+        items = best_rates.best(args["product"], on, limit=args.get("limit", 1))
+        if not items:
+            abort(404, message="No rate found for this product on this date.")
+        return {"product": args["product"], "on": on.isoformat(), "items": items}
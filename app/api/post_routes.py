@@ -1,12 +1,19 @@
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from sqlalchemy import or_
 
 from ..extensions import db
 from ..models.post import Post, Comment, Reaction
 from ..models.notification import Notification
-from ..schemas import PostCreateSchema, PostSchema, CommentCreateSchema, ReactionCreateSchema
+from ..schemas import (
+    PostCreateSchema, PostSchema, PostFeedQuerySchema, PostPageSchema, CommentCreateSchema, ReactionCreateSchema,
+    CommentSchema, CommentPageSchema, CommentPreviewQuerySchema, CommentThreadQuerySchema,
+)
+from ..services import comment_service
+from ..services.feed_service import DEFAULT_PAGE_SIZE, feed_page
+from ..services.post_counters import REACTION_COUNTERS, bump_post_counter
+from ..services.search_index import search_index
+from ..services.timeline import timelines
 
 blp = Blueprint("Posts", "posts", description="Posts endpoints")
 
@@ -43,24 +50,91 @@ class Posts(MethodView):
         )
         db.session.add(post)
         db.session.commit()
+        timelines.push(post)
+        search_index.add_post(post)
         return post
 
     @jwt_required()
-    @blp.response(200, PostSchema(many=True))
-    def get(self):
+    @blp.arguments(PostFeedQuerySchema, location="query")
+    @blp.response(200, PostPageSchema)
+    def get(self, args):
+        """
+        Newest first, one page at a time:
+        GET /api/posts?limit=20 -> { "items": [...], "next_cursor": "...", "limit": 20 }
+        GET /api/posts?limit=20&cursor=<next_cursor> for the next page (next_cursor is null on the last one).
+        """
         claims = get_jwt()
         my_startup_id = claims.get("startup_id")
 
-        q = Post.query
-        if my_startup_id:
-            q = q.filter(or_(Post.startup_id == my_startup_id, Post.startup_id.is_(None)))
-        else:
-            q = q.filter(Post.startup_id.is_(None))
+        try:
+            return feed_page(my_startup_id, args.get("limit", DEFAULT_PAGE_SIZE), args.get("cursor"))
+        except ValueError as e:
+            abort(400, message=str(e))
 
-        return q.order_by(Post.id.desc()).all()
+MAX_PREVIEW_POSTS = 100
+
+@blp.route("/posts/comments")
+class PostCommentPreviews(MethodView):
+    @jwt_required()
+    @blp.arguments(CommentPreviewQuerySchema, location="query")
+    def get(self, args):
+        """
+        Latest comments of several posts (e.g. a feed page) in one call:
+        GET /api/posts/comments?post_ids=12,11,9&per_post=3
+        -> { "per_post": 3, "posts": { "12": { "count": 5, "items": [...] }, ... } }
+        Posts that do not exist or are not visible to you are left out.
+        """
+        claims = get_jwt()
+        my_startup_id = claims.get("startup_id")
+
+        try:
+            post_ids = list(dict.fromkeys(int(x) for x in args["post_ids"].split(",") if x.strip()))
+        except ValueError:
+            abort(400, message="post_ids must be a comma-separated list of ids")
+        if not post_ids or len(post_ids) > MAX_PREVIEW_POSTS:
+            abort(400, message=f"post_ids must contain 1 to {MAX_PREVIEW_POSTS} ids")
+
+        q = db.select(Post.id).where(Post.id.in_(post_ids))
+        if claims.get("role") != "ADMIN":
+            q = q.where(db.or_(Post.startup_id.is_(None), Post.startup_id == my_startup_id))
+        visible = set(db.session.execute(q).scalars())
+
+        per_post = args.get("per_post", 3)
+        previews = comment_service.comment_previews([pid for pid in post_ids if pid in visible], per_post)
+        item_schema = CommentSchema(many=True)
+        return {
+            "per_post": per_post,
+            "posts": {
+                str(pid): {"count": p["count"], "items": item_schema.dump(p["items"])}
+                for pid, p in previews.items()
+            },
+        }
 
 @blp.route("/posts/<int:post_id>/comments")
 class PostComments(MethodView):
+    @jwt_required()
+    @blp.arguments(CommentThreadQuerySchema, location="query")
+    @blp.response(200, CommentPageSchema)
+    def get(self, args, post_id):
+        """
+        Oldest first, one page at a time:
+        GET /api/posts/<id>/comments?limit=20 -> { "post_id", "items": [...], "next_cursor": "...", "limit": 20 }
+        """
+        claims = get_jwt()
+        my_startup_id = claims.get("startup_id")
+
+        post = Post.query.get_or_404(post_id)
+
+        if post.startup_id is not None and post.startup_id != my_startup_id and claims.get("role") != "ADMIN":
+            abort(403, message="Forbidden: not your workspace")
+
+        try:
+            return comment_service.comment_page(
+                post_id, args.get("limit", comment_service.DEFAULT_PAGE_SIZE), args.get("cursor")
+            )
+        except ValueError as e:
+            abort(400, message=str(e))
+
     @jwt_required()
     @blp.arguments(CommentCreateSchema)
     def post(self, payload, post_id):
@@ -75,11 +149,13 @@ class PostComments(MethodView):
 
         comment = Comment(content=payload["content"], author_id=user_id, post_id=post_id)
         db.session.add(comment)
+        bump_post_counter(post_id, "comment_count")
 
         if post.author_id != user_id:
             notify(post.author_id, "New comment on your post", kind="COMMENT", related_post_id=post_id)
 
         db.session.commit()
+        search_index.add_comment(comment, post)
         return {"message": "Comment added"}, 201
 
 @blp.route("/posts/<int:post_id>/reactions")
@@ -102,6 +178,7 @@ class PostReactions(MethodView):
 
         r = Reaction(type=payload["type"], user_id=user_id, post_id=post_id)
         db.session.add(r)
+        bump_post_counter(post_id, REACTION_COUNTERS[payload["type"]])
 
         if post.author_id != user_id:
             notify(post.author_id, f"New reaction: {payload['type']}", kind="REACTION", related_post_id=post_id)
@@ -1,40 +1,275 @@
 from pathlib import Path
 
-from flask import request
+from flask import current_app, request
 from flask.views import MethodView
-from flask_smorest import Blueprint
+from flask_smorest import Blueprint, abort
+from flask_jwt_extended import jwt_required
 
-from ..ml.inference import CATEGORICAL_COLS, NUMERIC_COLS, explain_logreg, predict, load_models
+from ..ml.cache import score_cache
+from ..ml.inference import predict_batch, score_and_explain, sensitivity, validate_payload
+from ..ml.registry import ModelNotFound, model_registry
+from ..models.startup import Startup
+from ..services.permission_service import require_roles
+from ..services.portfolio_scoring_service import portfolio_job_status, start_portfolio_job
 
 
 blp = Blueprint("scoring", __name__, description="Startup 100k scoring")
 
+MAX_BATCH_SIZE = 5000
+
 
 def _model_dir():
-    return Path(__file__).resolve().parents[2] / "models"
+    return Path(current_app.config["MODEL_DIR"])
+
+
+def _requested_version():
+    """
+    Optional ?version=<name|hash> to score against a non-active resident model
+    (loaded by an admin through POST /models/reload).
+    """
+    return (request.args.get("version") or "").strip() or None
 
 
 @blp.route("/predict")
 class ScoringPredict(MethodView):
     def post(self):
-        payload = request.get_json(silent=True) or {}
+        payload, error = validate_payload(request.get_json(silent=True) or {})
+        if error:
+            return error, 400
+
+        try:
+            result, drivers = score_and_explain(payload, _model_dir(), version=_requested_version())
+        except ModelNotFound as e:
+            abort(404, message=str(e))
+
+        return {"input": payload, "result": result, "drivers": drivers}, 200
+
+
+@blp.route("/predict/batch")
+class ScoringPredictBatch(MethodView):
+    def post(self):
+        """
+        Body: {"items": [<payload>, ...]} (a bare JSON list is accepted too).
+        Rows failing validation come back with an "error" instead of a "result".
+        """
+        body = request.get_json(silent=True)
+        items = body.get("items") if isinstance(body, dict) else body
+        if not isinstance(items, list) or not items:
+            return {"message": "Expected a non-empty list of payloads in 'items'."}, 400
+        if len(items) > MAX_BATCH_SIZE:
+            return {"message": f"Batch too large (max {MAX_BATCH_SIZE} items)."}, 400
+
+        try:
+            results = predict_batch(items, _model_dir(), version=_requested_version())
+        except ModelNotFound as e:
+            abort(404, message=str(e))
+        errors = sum(1 for r in results if "error" in r)
+
+        return {
+            "count": len(results),
+            "ok": len(results) - errors,
+            "errors": errors,
+            "results": results,
+        }, 200
 
-        required = CATEGORICAL_COLS + NUMERIC_COLS
-        missing = [k for k in required if k not in payload or payload[k] in ("", None)]
-        if missing:
-            return {"message": "Missing fields", "missing": missing}, 400
 
-        for key in NUMERIC_COLS:
+@blp.route("/predict/compare")
+class ScoringPredictCompare(MethodView):
+    def post(self):
+        """
+        A/B comparison of one payload across resident model versions.
+        Body: {"payload": {...}, "versions": ["active", "<name>", ...]}
+        """
+        body = request.get_json(silent=True) or {}
+        payload, error = validate_payload(body.get("payload") or {})
+        if error:
+            return error, 400
+
+        versions = body.get("versions") or [model_registry.ACTIVE]
+        if not isinstance(versions, list):
+            return {"message": "'versions' must be a list."}, 400
+
+        results = {}
+        for version in versions:
             try:
-                if key in payload:
-                    payload[key] = float(payload[key])
-            except (TypeError, ValueError):
-                return {"message": f"Invalid numeric value for {key}."}, 400
+                result, drivers = score_and_explain(payload, _model_dir(), version=str(version))
+            except ModelNotFound as e:
+                abort(404, message=str(e))
+            results[str(version)] = {"result": result, "drivers": drivers}
 
-        payload["customer_traction"] = str(payload["customer_traction"])
+        return {"input": payload, "results": results}, 200
 
-        clf, _reg = load_models(_model_dir())
-        result = predict(payload, _model_dir())
-        drivers = explain_logreg(clf, payload)
 
-        return {"input": payload, "result": result, "drivers": drivers}, 200
+@blp.route("/sensitivity")
+class ScoringSensitivity(MethodView):
+    def post(self):
+        """
+        What-if curve/surface for one or two numeric fields.
+        Body: {
+          "payload": {...},
+          "sweeps": [
+            {"field": "monthly_burn_tnd", "start": 2000, "stop": 20000, "steps": 25},
+            {"field": "team_size", "values": [1, 2, 4, 8]}
+          ]
+        }
+        """
+        body = request.get_json(silent=True) or {}
+        payload, error = validate_payload(body.get("payload") or {})
+        if error:
+            return error, 400
+
+        try:
+            data = sensitivity(payload, body.get("sweeps"), _model_dir(), version=_requested_version())
+        except ValueError as e:
+            abort(400, message=str(e))
+        except ModelNotFound as e:
+            abort(404, message=str(e))
+
+        return {"input": payload, **data}, 200
+
+
+@blp.route("/models")
+class ScoringModels(MethodView):
+    def get(self):
+        """
+        Active model version/checksum plus every resident and on-disk version.
+        """
+        model_registry.set_model_dir(_model_dir())
+        try:
+            active = model_registry.get().info()
+        except ModelNotFound as e:
+            abort(503, message=str(e))
+
+        return {
+            "active": active,
+            "resident": model_registry.resident(),
+            "available": model_registry.available_versions(),
+        }, 200
+
+
+@blp.route("/models/reload")
+class ScoringModelsReload(MethodView):
+    @jwt_required()
+    def post(self):
+        """
+        ADMIN: reload the active artifacts, or load models/versions/<version>
+        and keep it resident when {"version": "<name>"} is given.
+        """
+        require_roles("ADMIN")
+        body = request.get_json(silent=True) or {}
+        name = body.get("version") or model_registry.ACTIVE
+        if not isinstance(name, str) or not name.strip():
+            abort(400, message="version must be a non-empty string.")
+        name = name.strip()
+
+        model_registry.set_model_dir(_model_dir())
+        try:
+            bundle = model_registry.load(name)
+        except ModelNotFound as e:
+            abort(404, message=str(e))
+
+        return {"loaded": bundle.info()}, 200
+
+    @jwt_required()
+    def delete(self):
+        """
+        ADMIN: drop a non-active resident version (?version=<name>).
+        """
+        require_roles("ADMIN")
+        name = _requested_version()
+        if not name or name == model_registry.ACTIVE:
+            abort(400, message="Specify a non-active ?version= to unload.")
+        model_registry.unload(name)
+        return {"message": f"Unloaded {name}."}, 200
+
+
+@blp.route("/cache")
+class ScoringCache(MethodView):
+    def get(self):
+        """
+        Hit/miss counters of the /predict result cache.
+        """
+        return score_cache.stats(), 200
+
+    @jwt_required()
+    def delete(self):
+        require_roles("ADMIN")
+        score_cache.clear(invalidation=True)
+        return {"message": "Scoring cache cleared."}, 200
+
+
+@blp.route("/portfolio/run")
+class ScoringPortfolioRun(MethodView):
+    @jwt_required()
+    def post(self):
+        """
+        ADMIN: score every startup with stored metrics in the background and
+        persist the probability, band and model version on the startup rows.
+        Body (optional): {"chunk_size": 1000, "version": "<name>"}
+        """
+        require_roles("ADMIN")
+        body = request.get_json(silent=True) or {}
+        try:
+            chunk_size = int(body.get("chunk_size") or 1000)
+        except (TypeError, ValueError):
+            abort(400, message="chunk_size must be an integer.")
+        if chunk_size < 1:
+            abort(400, message="chunk_size must be positive.")
+        version = body.get("version")
+        if version is not None:
+            if not isinstance(version, str) or not version.strip():
+                abort(400, message="version must be a non-empty string.")
+            version = version.strip()
+            # scoring only uses resident versions; load it here, as the admin asked for it
+            model_registry.set_model_dir(_model_dir())
+            try:
+                model_registry.get_by_version(version, load=True)
+            except ModelNotFound as e:
+                abort(404, message=str(e))
+
+        started = start_portfolio_job(current_app._get_current_object(), chunk_size, version)
+        if not started:
+            return {"message": "A portfolio scoring job is already running.", "status": portfolio_job_status()}, 409
+        return {"message": "Portfolio scoring started.", "status": portfolio_job_status()}, 202
+
+
+@blp.route("/portfolio/status")
+class ScoringPortfolioStatus(MethodView):
+    @jwt_required()
+    def get(self):
+        require_roles("ADMIN")
+        return portfolio_job_status(), 200
+
+
+@blp.route("/portfolio/top")
+class ScoringPortfolioTop(MethodView):
+    @jwt_required()
+    def get(self):
+        """
+        ADMIN: startups ranked by their precomputed p_reach_100k.
+        Optional: ?limit=20&band=High
+        """
+        require_roles("ADMIN")
+        try:
+            limit = min(max(int(request.args.get("limit", 20)), 1), 200)
+        except ValueError:
+            abort(400, message="limit must be an integer.")
+
+        q = Startup.query.filter(Startup.p_reach_100k.is_not(None))
+        band = (request.args.get("band") or "").strip()
+        if band:
+            q = q.filter(Startup.score_band == band)
+
+        startups = q.order_by(Startup.p_reach_100k.desc(), Startup.id.asc()).limit(limit).all()
+        return [
+            {
+                "id": s.id,
+                "name": s.name,
+                "industry": s.industry,
+                "p_reach_100k": s.p_reach_100k,
+                "score_band": s.score_band,
+                "score_model_version": s.score_model_version,
+                "scored_at": s.scored_at.isoformat() if s.scored_at else None,
+            }
+            for s in startups
+        ], 200
@@ -0,0 +1,42 @@
+from flask.views import MethodView
+from flask_jwt_extended import jwt_required, get_jwt
+from flask_smorest import Blueprint, abort
+from marshmallow import Schema, fields, validate
+
+from ..services.search_index import KINDS, search
+
+blp = Blueprint("search", __name__, description="Search posts, comments and legal resources")
+
+
+class SearchQuerySchema(Schema):
+    q = fields.Str(required=True, validate=validate.Length(min=1, max=200))
+    types = fields.Str(required=False)                # ?types=post,legal (default: all)
+    limit = fields.Int(required=False, validate=validate.Range(min=1, max=100))
+    offset = fields.Int(required=False, validate=validate.Range(min=0, max=1000))
+
+
+@blp.route("/search")
+class Search(MethodView):
+    @jwt_required()
+    @blp.arguments(SearchQuerySchema, location="query")
+    def get(self, args):
+        """
+        Ranked full-text search; posts and comments follow the feed's visibility
+        (public + your startup's workspace).
+        GET /api/search?q=fintech pitch&types=post,comment&limit=20&offset=0
+        -> { "query", "count", "limit", "offset", "items": [{ "type", "id", "score", "snippet", ... }] }
+        """
+        kinds = KINDS
+        if args.get("types"):
+            kinds = tuple(t.strip() for t in args["types"].split(",") if t.strip())
+            unknown = [t for t in kinds if t not in KINDS]
+            if unknown or not kinds:
+                abort(400, message=f"types must be a comma-separated subset of: {', '.join(KINDS)}")
+
+        return search(
+            args["q"],
+            startup_id=get_jwt().get("startup_id"),
+            kinds=kinds,
+            limit=args.get("limit", 20),
+            offset=args.get("offset", 0),
+        )
@@ -35,6 +35,11 @@ class StartupSchema(Schema):
     join_code = fields.Str(allow_none=True)
     created_at = fields.Str(allow_none=True)
 
+    # precomputed by the portfolio scoring job
+    p_reach_100k = fields.Float(allow_none=True)
+    score_band = fields.Str(allow_none=True)
+    scored_at = fields.DateTime(allow_none=True)
+
     # Helpful for frontend to decide owner vs member UI
     is_owner = fields.Bool(dump_only=True)
 
@@ -3,8 +3,6 @@
 # app/api/task_routes.py
 from datetime import date as dt_date
 
-import requests
-from flask import current_app
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
@@ -15,6 +13,7 @@ from ..models.user import User
 from ..models.task import Task
 from ..models.startup import Startup
 from ..models.notification import Notification
+from ..services.holiday_calendar import HolidayProviderError, holiday_calendar
 from ..services.score_service import add_score_event
 
 blp = Blueprint("tasks", __name__, description="Tasks endpoints")
@@ -138,29 +137,10 @@ def _notify_task_assignee(user_id: int, task_title: str):
 
 
 def _is_holiday_tn(d: dt_date) -> bool:
-    api_key = current_app.config.get("CALENDARIFIC_API_KEY", "")
-    base_url = current_app.config.get("CALENDARIFIC_BASE_URL", "https://calendarific.com/api/v2")
-    if not api_key:
-        abort(500, message="CALENDARIFIC_API_KEY is not set in environment.")
-
-    params = {
-        "api_key": api_key,
-        "country": "TN",
-        "year": d.year,
-        "month": d.month,
-        "day": d.day,
-        "type": "national",
-    }
-
     try:
-        r = requests.get(f"{base_url}/holidays", params=params, timeout=10)
-        r.raise_for_status()
-        payload = r.json()
-    except requests.RequestException:
-        abort(502, message="Holiday provider error (Calendarific request failed).")
-
-    holidays = payload.get("response", {}).get("holidays", []) or []
-    return len(holidays) > 0
+        return holiday_calendar.is_holiday(d, "TN")
+    except HolidayProviderError as e:
+        abort(e.status, message=str(e))
 
 
 # ----------------
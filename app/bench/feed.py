@@ -0,0 +1,177 @@
+"""
+Post feed pagination benchmark.
+
+Grows a posts table in steps (SQLite file by default) and at each size
+times, for a workspace member:
+- cursor: feed_page() for the first page (served from the timeline cache)
+  and for a page deep in the feed (cursor taken from a post ~90% of the way
+  down, past the trimmed timelines)
+- offset: the equivalent LIMIT/OFFSET query, for comparison
+- route: GET /api/posts?limit=N through the Flask test client
+
+Keyset pages should stay flat as the table grows; offset pages grow with
+the depth.
+
+Run using: python -m app.bench.feed [--sizes 10000,100000,300000] [--limit 20]
+           [--database-url sqlite:////tmp/feed.db] [--json out.json]
+           [--baseline old.json --max-regression 0.2]
+"""
+import argparse
+import json
+import random
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from .timing import compare_to_baseline, percentiles, print_table, time_calls
+
+BENCH_STARTUPS = 50
+
+
+def _fill(db, Post, target: int, rnd: random.Random, author_id: int, batch_size: int = 10000):
+    have = db.session.query(Post).count()
+    rows = []
+    for _ in range(have, target):
+        # ~70% public posts, the rest spread over the workspaces
+        startup_id = None if rnd.random() < 0.7 else rnd.randint(1, BENCH_STARTUPS)
+        rows.append({
+            "title": "Benchmark post",
+            "content": "Lorem ipsum dolor sit amet.",
+            "post_type": "UPDATE",
+            "author_id": author_id,
+            "startup_id": startup_id,
+            "created_at": datetime.utcnow(),
+        })
+        if len(rows) >= batch_size:
+            db.session.execute(db.insert(Post), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(Post), rows)
+    db.session.commit()
+
+
+def _offset_page(db, Post, startup_id: int, limit: int, offset: int):
+    q = (
+        db.select(Post)
+        .where(db.or_(Post.startup_id == startup_id, Post.startup_id.is_(None)))
+        .order_by(Post.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    return db.session.execute(q).scalars().all()
+
+
+def bench_size(app, size: int, limit: int, repeats: int, token: str, startup_id: int) -> dict:
+    from app.extensions import db
+    from app.models import Post
+    from app.services.feed_service import encode_cursor, feed_page
+
+    client = app.test_client()
+    with app.app_context():
+        visible = db.session.execute(
+            db.select(db.func.count(Post.id)).where(db.or_(Post.startup_id == startup_id, Post.startup_id.is_(None)))
+        ).scalar_one()
+        deep_offset = int(visible * 0.9)
+        deep_id = db.session.execute(
+            db.select(Post.id)
+            .where(db.or_(Post.startup_id == startup_id, Post.startup_id.is_(None)))
+            .order_by(Post.id.desc())
+            .offset(deep_offset)
+            .limit(1)
+        ).scalar_one()
+        deep_cursor = encode_cursor(deep_id)
+
+        def _cursor(cursor):
+            feed_page(startup_id, limit, cursor)
+            db.session.remove()
+
+        def _offset(offset):
+            _offset_page(db, Post, startup_id, limit, offset)
+            db.session.remove()
+
+        out = {
+            f"cursor_first[{size}]": percentiles(time_calls(_cursor, [(None,)] * repeats, warmup=3)),
+            f"cursor_deep[{size}]": percentiles(time_calls(_cursor, [(deep_cursor,)] * repeats, warmup=3)),
+            f"offset_first[{size}]": percentiles(time_calls(_offset, [(0,)] * repeats, warmup=3)),
+            f"offset_deep[{size}]": percentiles(time_calls(_offset, [(deep_offset,)] * repeats, warmup=3)),
+        }
+
+    headers = {"Authorization": f"Bearer {token}"}
+    out[f"GET /api/posts[{size}]"] = percentiles(time_calls(
+        lambda: client.get(f"/api/posts?limit={limit}", headers=headers), [()] * repeats, warmup=3
+    ))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Post feed pagination benchmark")
+    parser.add_argument("--sizes", default="10000,100000,300000", help="comma-separated posts table sizes")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=100)
+    parser.add_argument("--database-url", default=None,
+                        help="default: fresh sqlite file in the temp dir")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_out", default=None, help="write results to this file")
+    parser.add_argument("--baseline", default=None, help="results file from a previous run")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    from flask_jwt_extended import create_access_token
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import Post, User
+
+    database_url = args.database_url
+    if database_url is None:
+        path = Path(tempfile.gettempdir()) / "tunistartups_feed_bench.db"
+        path.unlink(missing_ok=True)
+        database_url = f"sqlite:///{path}"
+
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "FX_PROVIDER": "stub",
+        "FX_BACKGROUND_REFRESH": False,
+        "HOLIDAY_PREFETCH": False,
+        "SCORING_MODEL_WATCH_INTERVAL": 0,
+    })
+    rnd = random.Random(args.seed)
+    startup_id = 1
+
+    with app.app_context():
+        db.create_all()
+        author = User.query.filter_by(username="feed_bench").first()
+        if author is None:
+            author = User(username="feed_bench", email="feed_bench@example.test", password_hash="-", role="STARTUPER")
+            db.session.add(author)
+            db.session.commit()
+        author_id = author.id
+        token = create_access_token(
+            identity=str(author_id), additional_claims={"role": "STARTUPER", "startup_id": startup_id}
+        )
+
+    results = {"feed": {}}
+    for size in sorted(int(s) for s in args.sizes.split(",")):
+        with app.app_context():
+            _fill(db, Post, size, rnd, author_id)
+        print(f"posts: {size}")
+        results["feed"].update(bench_size(app, size, args.limit, args.repeats, token, startup_id))
+
+    for section, cases in results.items():
+        print_table(section, cases)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.max_regression)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print("\nNo p95 regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
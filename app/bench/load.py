@@ -0,0 +1,362 @@
+"""
+End-to-end API load test.
+
+Boots the app against a local database (SQLite file by default), fills it
+with synthetic data (app/seed/load_data.py) when empty, replaces
+Calendarific and OpenExchangeRates with in-process stubs and drives a
+weighted mix of real requests through the Flask test client from several
+threads:
+
+  login, /users/me, post feed, comments, reactions, notifications, tasks,
+  contracts, scoring, calendar greeting, FX, loans hub
+
+Per endpoint it reports requests, non-2xx/3xx responses, latency
+percentiles, throughput and SQL statements per request.
+
+Run using: python -m app.bench.load [--users 2000] [--requests 3000] [--threads 4]
+           [--database-url sqlite:////tmp/load.db] [--json out.json]
+           [--baseline old.json --max-regression 0.2]
+"""
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import event
+
+from .timing import compare_to_baseline
+
+STUB_HOLIDAYS = ["01-01", "01-14", "03-20", "04-09", "05-01", "07-25", "08-13", "10-15", "12-17"]
+
+
+def stub_holidays(country: str, year: int) -> list:
+    return [{"date": f"{year}-{md}", "name": f"Stub holiday {md}"} for md in STUB_HOLIDAYS]
+
+
+class QueryCounter:
+    """
+    Counts SQL statements per thread (one request runs on one thread).
+    """
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args, **kwargs):
+        self._local.n = getattr(self._local, "n", 0) + 1
+
+    def reset(self):
+        self._local.n = 0
+
+    @property
+    def value(self) -> int:
+        return getattr(self._local, "n", 0)
+
+
+# -------------------------
+# Setup
+# -------------------------
+def build_app(database_url: str, users: int, seed: int):
+    from app import create_app
+    from app.extensions import db
+    from app.models import User
+    from app.seed.load_data import generate_load_data, plan_counts
+    from app.services.holiday_calendar import holiday_calendar
+
+    overrides = {
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "FX_PROVIDER": "stub",
+        "FX_BACKGROUND_REFRESH": False,
+        "HOLIDAY_PREFETCH": False,
+        "SCORING_MODEL_WATCH_INTERVAL": 0,
+    }
+    if database_url.startswith("sqlite"):
+        overrides["SQLALCHEMY_ENGINE_OPTIONS"] = {"connect_args": {"timeout": 30, "check_same_thread": False}}
+
+    app = create_app(overrides)
+    holiday_calendar.set_fetcher(stub_holidays)
+
+    with app.app_context():
+        db.create_all()
+        if db.session.query(User).filter(User.username.like("load\\_%", escape="\\")).count() < 2:
+            print(f"Generating load data for {users} users ...")
+            generate_load_data(plan_counts(users), seed=seed)
+    return app
+
+
+def pick_sessions(app, n: int, seed: int) -> list:
+    """
+    A mix of startup owners, members and unaffiliated users.
+    """
+    from app.extensions import db
+    from app.models import Startup, User
+    from app.seed.load_data import USERNAME_PREFIX
+
+    rnd = random.Random(seed)
+    with app.app_context():
+        owner_ids = set(db.session.execute(db.select(Startup.owner_id)).scalars())
+        users = db.session.execute(
+            db.select(User.id, User.email, User.startup_id).where(User.username.like(f"{USERNAME_PREFIX}%"))
+        ).all()
+    rnd.shuffle(users)
+    owners = [u for u in users if u.id in owner_ids][: n // 3]
+    others = [u for u in users if u.id not in owner_ids][: n - len(owners)]
+    return [
+        {"user_id": u.id, "email": u.email, "startup_id": u.startup_id, "is_owner": u.id in owner_ids, "post_ids": []}
+        for u in owners + others
+    ]
+
+
+def scoring_payloads(app, n: int, seed: int) -> list:
+    from app.bench.scoring import _categories, synthetic_payloads
+    from app.ml import inference
+    from app.ml.registry import ModelNotFound
+
+    try:
+        clf, _ = inference.load_models(app.config["MODEL_DIR"])
+    except (ModelNotFound, FileNotFoundError):
+        return []
+    return synthetic_payloads(n, _categories(clf), seed=seed)
+
+
+# -------------------------
+# Traffic
+# -------------------------
+def _auth(s):
+    return {"Authorization": f"Bearer {s['token']}"}
+
+
+def login(client, s, rnd, ctx):
+    from app.seed.load_data import LOAD_PASSWORD
+
+    r = client.post("/api/auth/login", json={"email": s["email"], "password": LOAD_PASSWORD})
+    if r.status_code == 200:
+        s["token"] = r.get_json()["access_token"]
+    return "POST /api/auth/login", r
+
+
+def me(client, s, rnd, ctx):
+    return "GET /api/users/me", client.get("/api/users/me", headers=_auth(s))
+
+
+def feed(client, s, rnd, ctx):
+    r = client.get("/api/posts", headers=_auth(s))
+    if r.status_code == 200:
+        body = r.get_json()
+        items = body.get("items", []) if isinstance(body, dict) else body
+        s["post_ids"] = [p["id"] for p in items[:50]]
+    return "GET /api/posts", r
+
+
+def comment(client, s, rnd, ctx):
+    if not s["post_ids"]:
+        return feed(client, s, rnd, ctx)
+    pid = rnd.choice(s["post_ids"])
+    return "POST /api/posts/<id>/comments", client.post(
+        f"/api/posts/{pid}/comments", json={"content": "load test comment"}, headers=_auth(s)
+    )
+
+
+def react(client, s, rnd, ctx):
+    if not s["post_ids"]:
+        return feed(client, s, rnd, ctx)
+    pid = rnd.choice(s["post_ids"])
+    return "POST /api/posts/<id>/reactions", client.post(
+        f"/api/posts/{pid}/reactions", json={"type": rnd.choice(["LIKE", "SAVE"])}, headers=_auth(s)
+    )
+
+
+def notifications(client, s, rnd, ctx):
+    return "GET /api/notifications", client.get("/api/notifications", headers=_auth(s))
+
+
+def unread_count(client, s, rnd, ctx):
+    return "GET /api/notifications/unread-count", client.get("/api/notifications/unread-count", headers=_auth(s))
+
+
+def tasks(client, s, rnd, ctx):
+    return "GET /api/tasks", client.get("/api/tasks", headers=_auth(s))
+
+
+def create_task(client, s, rnd, ctx):
+    if not s["is_owner"]:
+        return tasks(client, s, rnd, ctx)
+    return "POST /api/tasks", client.post(
+        "/api/tasks", json={"title": "Load test task", "priority": "MEDIUM"}, headers=_auth(s)
+    )
+
+
+def contracts(client, s, rnd, ctx):
+    return "GET /api/contracts", client.get("/api/contracts", headers=_auth(s))
+
+
+def predict(client, s, rnd, ctx):
+    if not ctx["payloads"]:
+        return greeting(client, s, rnd, ctx)
+    return "POST /api/scoring/predict", client.post("/api/scoring/predict", json=rnd.choice(ctx["payloads"]))
+
+
+def greeting(client, s, rnd, ctx):
+    d = date(2026, rnd.randint(1, 12), rnd.randint(1, 28))
+    return "GET /api/calendar/greeting", client.get(f"/api/calendar/greeting?date={d.isoformat()}")
+
+
+def fx_latest(client, s, rnd, ctx):
+    return "GET /api/fx/latest", client.get("/api/fx/latest")
+
+
+def hub_loans(client, s, rnd, ctx):
+    return "GET /api/hub/loans", client.get("/api/hub/loans")
+
+
+TRAFFIC_MIX = [
+    (login, 2),
+    (me, 3),
+    (feed, 25),
+    (comment, 5),
+    (react, 5),
+    (notifications, 10),
+    (unread_count, 10),
+    (tasks, 10),
+    (create_task, 3),
+    (contracts, 5),
+    (predict, 8),
+    (greeting, 5),
+    (fx_latest, 5),
+    (hub_loans, 4),
+]
+
+
+def run_worker(app, sessions, n_requests, seed, ctx, counter, records, lock):
+    rnd = random.Random(seed)
+    ops, weights = zip(*TRAFFIC_MIX)
+    client = app.test_client()
+    local = []
+    for _ in range(n_requests):
+        s = rnd.choice(sessions)
+        op = rnd.choices(ops, weights=weights)[0]
+        counter.reset()
+        t0 = time.perf_counter()
+        label, response = op(client, s, rnd, ctx)
+        elapsed = time.perf_counter() - t0
+        local.append((label, elapsed, response.status_code, counter.value))
+    with lock:
+        records.extend(local)
+
+
+def summarize(records, wall_s: float) -> dict:
+    by_label = defaultdict(list)
+    for label, elapsed, status, queries in records:
+        by_label[label].append((elapsed, status, queries))
+
+    out = {}
+    for label in sorted(by_label):
+        rows = by_label[label]
+        ms = np.asarray([r[0] for r in rows]) * 1000.0
+        statuses = defaultdict(int)
+        for r in rows:
+            statuses[r[1]] += 1
+        out[label] = {
+            "n": len(rows),
+            "errors": sum(c for code, c in statuses.items() if code >= 400),
+            "statuses": {str(k): v for k, v in sorted(statuses.items())},
+            "p50_ms": round(float(np.percentile(ms, 50)), 3),
+            "p95_ms": round(float(np.percentile(ms, 95)), 3),
+            "p99_ms": round(float(np.percentile(ms, 99)), 3),
+            "max_ms": round(float(ms.max()), 3),
+            "throughput_per_s": round(len(rows) / wall_s, 2),
+            "queries_per_request": round(float(np.mean([r[2] for r in rows])), 2),
+        }
+    return out
+
+
+def print_report(endpoints: dict, total: dict):
+    print(f"\n  {'endpoint':<36} {'n':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'sql/req':>8}")
+    for name, r in endpoints.items():
+        print(
+            f"  {name:<36} {r['n']:>6} {r['errors']:>5} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+            f"{r['p99_ms']:>9.2f} {r['throughput_per_s']:>8.1f} {r['queries_per_request']:>8.2f}"
+        )
+    print(f"\n  total: {total['requests']} requests in {total['wall_s']:.2f}s "
+          f"({total['throughput_per_s']:.1f} req/s, {total['threads']} threads)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end API load test")
+    parser.add_argument("--database-url", default=None,
+                        help="default: sqlite file in the temp dir (kept between runs)")
+    parser.add_argument("--users", type=int, default=2000, help="users to generate when the database is empty")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--sessions", type=int, default=60, help="distinct logged-in users")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_out", default=None, help="write results to this file")
+    parser.add_argument("--baseline", default=None, help="results file from a previous run")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{Path(tempfile.gettempdir()) / 'tunistartups_load.db'}"
+    app = build_app(database_url, args.users, args.seed)
+
+    from app.extensions import db
+
+    with app.app_context():
+        counter = QueryCounter(db.engine)
+
+    sessions = pick_sessions(app, args.sessions, args.seed)
+    ctx = {"payloads": scoring_payloads(app, 200, args.seed)}
+    client = app.test_client()
+    rnd = random.Random(args.seed)
+    for s in sessions:
+        login(client, s, rnd, ctx)
+    sessions = [s for s in sessions if s.get("token")]
+    if not sessions:
+        raise SystemExit("No session could log in.")
+
+    records = []
+    lock = threading.Lock()
+    per_thread = args.requests // args.threads
+    workers = [
+        threading.Thread(target=run_worker, args=(app, sessions, per_thread, args.seed + i, ctx, counter, records, lock))
+        for i in range(args.threads)
+    ]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    wall_s = time.perf_counter() - t0
+
+    results = {
+        "endpoints": summarize(records, wall_s),
+        "total": {
+            "requests": len(records),
+            "wall_s": round(wall_s, 3),
+            "throughput_per_s": round(len(records) / wall_s, 2),
+            "threads": args.threads,
+            "database": database_url.split("://")[0],
+        },
+    }
+    print_report(results["endpoints"], results["total"])
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.max_regression)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print("\nNo p95 regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
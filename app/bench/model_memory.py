@@ -0,0 +1,98 @@
+"""
+Per-worker memory of the scoring models, pickled vs memory-mapped.
+
+Forks N workers (like a prefork server), each loads the active models and
+scores one row, then reports its memory while all workers are alive:
+- rss:     resident set size (counts shared pages in every worker)
+- pss:     proportional set size (shared pages divided between workers)
+- private: pages only this worker holds
+
+Run using: python -m app.bench.model_memory [--workers 4] [--model-dir models]
+Linux only (reads /proc/self/status and /proc/self/smaps_rollup).
+"""
+import argparse
+import multiprocessing as mp
+from pathlib import Path
+
+
+def _memory_kb() -> dict:
+    out = {}
+    with open("/proc/self/status", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                out["rss"] = int(line.split()[1])
+    try:
+        private = 0
+        with open("/proc/self/smaps_rollup", encoding="utf-8") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key == "Pss":
+                    out["pss"] = int(rest.split()[0])
+                elif key in ("Private_Clean", "Private_Dirty"):
+                    private += int(rest.split()[0])
+        out["private"] = private
+    except OSError:
+        pass
+    return out
+
+
+def _worker(model_dir, mmap, payload, barrier, results):
+    from app.ml.inference import _score_rows
+    from app.ml.registry import ModelBundle
+
+    barrier.wait()
+    before = _memory_kb()
+    barrier.wait()
+    bundle = ModelBundle("active", Path(model_dir), mmap=mmap)
+    _score_rows([payload], bundle)
+    barrier.wait()
+    after = _memory_kb()
+    barrier.wait()
+    results.put({k: after[k] - before.get(k, 0) for k in after})
+
+
+def measure(model_dir: Path, workers: int, mmap: bool, payload: dict) -> list:
+    ctx = mp.get_context("fork")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_worker, args=(str(model_dir), mmap, payload, barrier, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    rows = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return rows
+
+
+def _summary(rows: list) -> str:
+    keys = [k for k in ("rss", "pss", "private") if all(k in r for r in rows)]
+    avg = {k: sum(r[k] for r in rows) / len(rows) / 1024 for k in keys}
+    return "  ".join(f"{k}={avg[k]:7.2f} MiB" for k in keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--model-dir", default=str(Path(__file__).resolve().parents[2] / "models"))
+    args = parser.parse_args()
+
+    import pandas as pd
+    from app.ml.inference import CATEGORICAL_COLS, NUMERIC_COLS, validate_payload
+    from app.ml.registry import ModelBundle
+
+    csv = Path(__file__).resolve().parents[1] / "seed" / "data" / "tunistartups_plausible_200.csv"
+    payload, _ = validate_payload(pd.read_csv(csv)[CATEGORICAL_COLS + NUMERIC_COLS].iloc[0].to_dict())
+
+    # export the forest arrays up front so no worker pays for it
+    ModelBundle("active", Path(args.model_dir), mmap=True)
+
+    print(f"Per-worker memory added by loading models ({args.workers} workers):")
+    for label, mmap in (("pickle (before)", False), ("mmap   (after) ", True)):
+        print(f"  {label}: {_summary(measure(Path(args.model_dir), args.workers, mmap, payload))}")
+
+
+if __name__ == "__main__":
+    main()
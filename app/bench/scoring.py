@@ -0,0 +1,176 @@
+"""
+Scoring latency benchmarks.
+
+Cases:
+- cold start: ModelBundle load (pickle vs memory-mapped forest)
+- single: predict(), explain_logreg(), score_and_explain() on the compiled
+  and sklearn paths, cache disabled
+- cached: score_and_explain() on repeated payloads (cache hits)
+- batch: predict_batch() at several batch sizes (per-row throughput)
+- route: POST /api/scoring/predict and /predict/batch through the Flask test client
+
+Run using: python -m app.bench.scoring [--n 500] [--json out.json]
+           [--baseline old.json --max-regression 0.2]
+Exits non-zero when a case's p95 regressed past --max-regression.
+"""
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from app.ml import inference
+from app.ml.cache import score_cache
+from app.ml.inference import CATEGORICAL_COLS, NUMERIC_COLS, validate_payload
+from app.ml.registry import ModelBundle
+
+from .timing import compare_to_baseline, percentiles, print_table, time_calls
+
+# value ranges of the seed dataset (app/seed/data/tunistartups_plausible_200.csv)
+NUMERIC_RANGES = {
+    "team_size": (1, 12, int),
+    "founder_experience_years": (0, 12, int),
+    "has_technical_cofounder": (0, 1, int),
+    "mvp_ready": (0, 1, int),
+    "months_since_start": (1, 60, int),
+    "monthly_growth_rate_pct": (-15.0, 40.0, float),
+    "initial_capital_tnd": (0, 200000, int),
+    "monthly_burn_tnd": (1000, 22000, int),
+    "revenue_tnd_current_month": (0, 35000, int),
+    "has_investor": (0, 1, int),
+}
+
+
+def _categories(clf_pipeline) -> dict:
+    encoder = clf_pipeline.named_steps["preprocess"].named_transformers_["cat"]
+    return {col: cats.tolist() for col, cats in zip(CATEGORICAL_COLS, encoder.categories_)}
+
+
+def synthetic_payloads(n: int, categories: dict, seed: int = 42) -> list:
+    """
+    Raw request bodies (as the frontend would post them) drawn from the
+    model's categories and the seed data's numeric ranges.
+    """
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        payload = {col: rnd.choice(categories[col]) for col in CATEGORICAL_COLS}
+        for col in NUMERIC_COLS:
+            lo, hi, kind = NUMERIC_RANGES[col]
+            payload[col] = rnd.randint(lo, hi) if kind is int else round(rnd.uniform(lo, hi), 2)
+        out.append(payload)
+    return out
+
+
+def bench_cold_start(model_dir: Path, repeats: int = 3) -> dict:
+    out = {}
+    for label, mmap in (("load_pickle", False), ("load_mmap", True)):
+        ModelBundle("active", model_dir, mmap=mmap)  # makes sure arrays are exported
+        samples = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            ModelBundle("active", model_dir, mmap=mmap)
+            samples.append(time.perf_counter() - t0)
+        out[label] = percentiles(samples)
+    return out
+
+
+def bench_single(model_dir: Path, payloads: list) -> dict:
+    out = {}
+    clf, _ = inference.load_models(model_dir)
+    args = [(p,) for p in payloads]
+    for label, compiled in (("compiled", True), ("sklearn", False)):
+        inference.set_compiled_enabled(compiled)
+        out[f"predict[{label}]"] = percentiles(time_calls(lambda p: inference.predict(p, model_dir), args))
+        out[f"explain_logreg[{label}]"] = percentiles(time_calls(lambda p: inference.explain_logreg(clf, p), args))
+        out[f"score_and_explain[{label}]"] = percentiles(
+            time_calls(lambda p: inference.score_and_explain(p, model_dir, use_cache=False), args)
+        )
+    inference.set_compiled_enabled(True)
+    return out
+
+
+def bench_cached(model_dir: Path, payloads: list, distinct: int = 20) -> dict:
+    score_cache.clear()
+    hot = payloads[:distinct]
+    args = [(hot[i % len(hot)],) for i in range(len(payloads))]
+    samples = time_calls(lambda p: inference.score_and_explain(p, model_dir), args)
+    result = percentiles(samples)
+    result["cache"] = score_cache.stats()
+    return {"score_and_explain[cache]": result}
+
+
+def bench_batch(model_dir: Path, raw_payloads: list, sizes=(1, 10, 100, 1000)) -> dict:
+    out = {}
+    for size in sizes:
+        batch = (raw_payloads * (size // len(raw_payloads) + 1))[:size]
+        samples = time_calls(lambda b: inference.predict_batch(b, model_dir), [(batch,)] * 10, warmup=2)
+        r = percentiles(samples)
+        r["rows_per_s"] = round(size / (sum(samples) / len(samples)), 1)
+        out[f"predict_batch[{size}]"] = r
+    return out
+
+
+def bench_route(model_dir: Path, raw_payloads: list) -> dict:
+    from app import create_app
+
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "MODEL_DIR": str(model_dir),
+        "SCORING_MODEL_WATCH_INTERVAL": 0,
+    })
+    client = app.test_client()
+
+    out = {}
+    score_cache.clear()
+    args = [(p,) for p in raw_payloads]
+    out["POST /predict"] = percentiles(
+        time_calls(lambda p: client.post("/api/scoring/predict", json=p), args)
+    )
+    batch = raw_payloads[:100]
+    out["POST /predict/batch[100]"] = percentiles(
+        time_calls(lambda b: client.post("/api/scoring/predict/batch", json={"items": b}), [(batch,)] * 20, warmup=2)
+    )
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring latency benchmarks")
+    parser.add_argument("--n", type=int, default=500, help="payloads per single-call case")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--model-dir", default=str(Path(__file__).resolve().parents[2] / "models"))
+    parser.add_argument("--json", dest="json_out", default=None, help="write results to this file")
+    parser.add_argument("--baseline", default=None, help="results file from a previous run")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    model_dir = Path(args.model_dir)
+    results = {"cold_start": bench_cold_start(model_dir)}
+
+    clf, _ = inference.load_models(model_dir)
+    raw = synthetic_payloads(args.n, _categories(clf), seed=args.seed)
+    payloads = [validate_payload(p)[0] for p in raw]
+
+    results["single"] = bench_single(model_dir, payloads)
+    results["cached"] = bench_cached(model_dir, payloads)
+    results["batch"] = bench_batch(model_dir, raw)
+    results["route"] = bench_route(model_dir, raw)
+
+    for section, cases in results.items():
+        print_table(section, cases)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.max_regression)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print("\nNo p95 regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Search benchmark: inverted index vs LIKE scanning.
+
+Fills a database with app/seed/load_data.py (SQLite file by default, reused
+between runs) and times, for one- and two-word queries drawn from the
+generated vocabulary:
+- build: full index build (done in the background after a process's first search)
+- index: search() (ranked page incl. hydration) as a workspace member
+- like: search_index.like_search(), the LIKE '%term%' fallback served
+  while the index is being built (newest first, unranked)
+- route: GET /api/search through the Flask test client
+
+Run using: python -m app.bench.search [--users 5000] [--queries 200]
+           [--database-url sqlite:////tmp/search.db] [--json out.json]
+           [--baseline old.json --max-regression 0.2]
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from .timing import compare_to_baseline, percentiles, print_table, time_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search benchmark")
+    parser.add_argument("--users", type=int, default=5000, help="load-data size when the database is empty")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--database-url", default=None,
+                        help="default: sqlite file in the temp dir (kept between runs)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_out", default=None, help="write results to this file")
+    parser.add_argument("--baseline", default=None, help="results file from a previous run")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    from flask_jwt_extended import create_access_token
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import Post
+    from app.seed.load_data import WORDS, generate_load_data, plan_counts
+    from app.services.search_index import like_search, search, search_index
+
+    database_url = args.database_url or f"sqlite:///{Path(tempfile.gettempdir()) / 'tunistartups_search_bench.db'}"
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "FX_PROVIDER": "stub",
+        "FX_BACKGROUND_REFRESH": False,
+        "HOLIDAY_PREFETCH": False,
+        "SCORING_MODEL_WATCH_INTERVAL": 0,
+        "SEARCH_SYNC_INTERVAL": 3600,
+    })
+
+    rnd = random.Random(args.seed)
+    queries = [
+        " ".join(rnd.sample(WORDS, 1 if i % 2 else 2)) for i in range(args.queries)
+    ]
+
+    results = {}
+    with app.app_context():
+        db.create_all()
+        if db.session.query(Post).count() == 0:
+            print(f"Generating load data for {args.users} users ...")
+            generate_load_data(plan_counts(args.users), seed=args.seed)
+
+        startup_id = db.session.execute(
+            db.select(Post.startup_id).where(Post.startup_id.is_not(None)).limit(1)
+        ).scalar()
+        token = create_access_token(identity="1", additional_claims={"role": "STARTUPER", "startup_id": startup_id})
+
+        t0 = time.perf_counter()
+        search_index.build()
+        build_s = time.perf_counter() - t0
+        info = search_index.info()
+        print(f"index: {info['documents']} documents, {info['terms']} terms, built in {build_s:.2f}s")
+        results["build"] = {"full_build": percentiles([build_s])}
+
+        def _index(q):
+            search(q, startup_id=startup_id)
+            db.session.remove()
+
+        def _like(q):
+            like_search(q, startup_id)
+            db.session.remove()
+
+        args_list = [(q,) for q in queries]
+        results["query"] = {
+            "index": percentiles(time_calls(_index, args_list)),
+            "like": percentiles(time_calls(_like, args_list[: max(args.queries // 4, 10)], warmup=2)),
+        }
+
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    results["route"] = {
+        "GET /api/search": percentiles(time_calls(
+            lambda q: client.get("/api/search", query_string={"q": q}, headers=headers), [(q,) for q in queries]
+        )),
+    }
+
+    for section, cases in results.items():
+        print_table(section, cases)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.max_regression)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print("\nNo p95 regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Small timing helpers shared by the benchmark scripts in app/bench.
+"""
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+def percentiles(samples_s: list) -> dict:
+    """
+    Latency summary in milliseconds plus throughput (calls/s).
+    """
+    arr = np.asarray(samples_s, dtype=float) * 1000.0
+    total_s = float(np.sum(samples_s))
+    return {
+        "n": int(arr.size),
+        "mean_ms": round(float(arr.mean()), 4),
+        "p50_ms": round(float(np.percentile(arr, 50)), 4),
+        "p95_ms": round(float(np.percentile(arr, 95)), 4),
+        "p99_ms": round(float(np.percentile(arr, 99)), 4),
+        "max_ms": round(float(arr.max()), 4),
+        "throughput_per_s": round(arr.size / total_s, 2) if total_s > 0 else None,
+    }
+
+
+def time_calls(fn, args_list: list, warmup: int = 5) -> list:
+    """
+    Call fn(*args) for every args tuple and return per-call durations (seconds).
+    """
+    for args in args_list[:warmup]:
+        fn(*args)
+    samples = []
+    for args in args_list:
+        t0 = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def print_table(title: str, rows: dict):
+    print(f"\n{title}")
+    print(f"  {'case':<34} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>11}")
+    for name, r in rows.items():
+        print(
+            f"  {name:<34} {r['n']:>6} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} "
+            f"{r['p99_ms']:>9.3f} {r['throughput_per_s'] or 0:>11.1f}"
+        )
+
+
+def compare_to_baseline(results: dict, baseline_path: str | Path, max_regression: float) -> list:
+    """
+    Cases whose p95 got more than `max_regression` (0.2 = 20%) slower than
+    in a previously saved results file.
+    """
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    regressions = []
+    for section, cases in results.items():
+        if not isinstance(cases, dict):
+            continue
+        for name, r in cases.items():
+            old = baseline.get(section, {}).get(name)
+            if not isinstance(r, dict) or not isinstance(old, dict) or "p95_ms" not in r or not old.get("p95_ms"):
+                continue
+            ratio = r["p95_ms"] / old["p95_ms"]
+            if ratio > 1.0 + max_regression:
+                regressions.append(f"{section}/{name}: p95 {old['p95_ms']:.3f} -> {r['p95_ms']:.3f} ms ({ratio:.2f}x)")
+    return regressions
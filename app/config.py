@@ -64,3 +64,51 @@ class Config:
     CALENDARIFIC_API_KEY = os.getenv("CALENDARIFIC_API_KEY", "uiGRcN4IqZnG2gMBpXg8ZV6kmCxMqncz")
     CALENDARIFIC_COUNTRY = os.getenv("CALENDARIFIC_COUNTRY", "TN")
     CALENDARIFIC_BASE_URL = "https://calendarific.com/api/v2"
+    # fetch next year's holidays in the background once the current year is loaded
+    HOLIDAY_PREFETCH = os.getenv("HOLIDAY_PREFETCH", "1") != "0"
+
+    # Scoring models (app/ml/registry.py)
+    MODEL_DIR = os.getenv("MODEL_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models"))
+    # load the active models on the first request a server process handles
+    # (never in CLI commands) instead of on the first scoring request
+    SCORING_EAGER_LOAD = os.getenv("SCORING_EAGER_LOAD", "1") != "0"
+    # model versions kept in memory at once, the active one included
+    SCORING_MAX_RESIDENT = int(os.getenv("SCORING_MAX_RESIDENT", "4"))
+    # share the forest between workers through memory-mapped arrays
+    SCORING_MMAP = os.getenv("SCORING_MMAP", "1") != "0"
+    # seconds between checks for changed artifacts under MODEL_DIR (0 disables hot reload)
+    SCORING_MODEL_WATCH_INTERVAL = float(os.getenv("SCORING_MODEL_WATCH_INTERVAL", "30"))
+    # result cache for /api/scoring/predict (size 0 disables it)
+    SCORING_CACHE_SIZE = int(os.getenv("SCORING_CACHE_SIZE", "2048"))
+    SCORING_CACHE_TTL = float(os.getenv("SCORING_CACHE_TTL", "600"))
+
+    # FX provider (app/services/fx_client.py): "oxr" or "stub" (local, no network)
+    FX_PROVIDER = os.getenv("FX_PROVIDER", "oxr")
+    # required for FX_PROVIDER=oxr; unset fails loudly ("Missing OXR_APP_ID"), use FX_PROVIDER=stub locally
+    OXR_APP_ID = os.getenv("OXR_APP_ID")
+    FX_TIMEOUT = float(os.getenv("FX_TIMEOUT", "10"))
+    FX_RETRIES = int(os.getenv("FX_RETRIES", "2"))
+    FX_RETRY_BACKOFF = float(os.getenv("FX_RETRY_BACKOFF", "0.5"))
+    # consecutive failures before calls fail fast, and seconds before retrying
+    FX_BREAKER_THRESHOLD = int(os.getenv("FX_BREAKER_THRESHOLD", "5"))
+    FX_BREAKER_RESET = float(os.getenv("FX_BREAKER_RESET", "30"))
+
+    # FX rates (app/services/fx_store.py): USD table kept in memory
+    FX_REFRESH_INTERVAL = float(os.getenv("FX_REFRESH_INTERVAL", "3600"))
+    # periodic refresh thread, started by the first request a server process handles
+    # (never by CLI commands); off by default, reads then refresh on demand and FX
+    # history (fx_snapshots) relies on a daily `flask seed fx-backfill`
+    FX_BACKGROUND_REFRESH = os.getenv("FX_BACKGROUND_REFRESH", "0") == "1"
+
+    # Feed timelines (app/services/timeline.py): newest post ids per workspace (0 disables)
+    TIMELINE_MAX_LEN = int(os.getenv("TIMELINE_MAX_LEN", "500"))
+    # seconds between catch-up queries for posts written by other workers (in-memory store)
+    TIMELINE_SYNC_INTERVAL = float(os.getenv("TIMELINE_SYNC_INTERVAL", "2"))
+    # shared store for all workers, e.g. redis://localhost:6379/0 (needs the redis package)
+    TIMELINE_REDIS_URL = os.getenv("TIMELINE_REDIS_URL")
+
+    # Search (app/services/search_index.py): seconds between background catch-up passes
+    # for rows written by other workers
+    SEARCH_SYNC_INTERVAL = float(os.getenv("SEARCH_SYNC_INTERVAL", "5"))
+    # seconds between full background rebuilds, which drop deleted rows (0 disables)
+    SEARCH_REBUILD_INTERVAL = float(os.getenv("SEARCH_REBUILD_INTERVAL", "3600"))
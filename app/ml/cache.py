@@ -0,0 +1,103 @@
+"""
+LRU + TTL cache for single-payload scoring results.
+
+Keys are the model version plus the validated payload values in feature
+order, so a reload can never serve a stale score; entries are also dropped
+whenever the registry swaps in new artifacts.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+class ScoreCache:
+    def __init__(self, maxsize: int = 2048, ttl: float = 600.0):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def init_app(self, app, registry):
+        self.configure(
+            maxsize=int(app.config.get("SCORING_CACHE_SIZE", self.maxsize)),
+            ttl=float(app.config.get("SCORING_CACHE_TTL", self.ttl)),
+        )
+        registry.on_reload(lambda _name, _bundle: self.clear(invalidation=True))
+
+    def configure(self, maxsize: int, ttl: float):
+        with self._lock:
+            self.maxsize = maxsize
+            self.ttl = ttl
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get(self, key):
+        """
+        Returns a copy of the cached value, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if self.ttl > 0 and expires_at <= now:
+                del self._data[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self, invalidation: bool = False):
+        with self._lock:
+            self._data.clear()
+            if invalidation:
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+score_cache = ScoreCache()
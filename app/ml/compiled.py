@@ -0,0 +1,295 @@
+"""
+Pandas-free scoring path.
+
+The fitted sklearn pipelines are unpacked once into flat NumPy arrays:
+- OneHotEncoder categories -> {value: column} lookups
+- LogisticRegression coef_/intercept_
+- RandomForest trees -> concatenated node arrays walked for all trees at once
+
+Scoring a dict then costs a few array ops instead of a DataFrame build and a
+ColumnTransformer pass. `check_parity()` compares both paths on real rows.
+"""
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder
+
+
+class CompileError(ValueError):
+    pass
+
+
+class CompiledPreprocessor:
+    def __init__(self, preprocessor):
+        cat_lookups = []
+        num_cols = []
+        offset = 0
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == "remainder":
+                if transformer != "drop":
+                    raise CompileError("Unsupported remainder transformer.")
+                continue
+            if isinstance(transformer, OneHotEncoder):
+                if transformer.drop_idx_ is not None or transformer.handle_unknown != "ignore":
+                    raise CompileError("Only OneHotEncoder(handle_unknown='ignore', drop=None) is supported.")
+                for col, cats in zip(columns, transformer.categories_):
+                    lookup = {value: offset + i for i, value in enumerate(cats.tolist())}
+                    cat_lookups.append((col, lookup))
+                    offset += len(cats)
+            elif transformer == "passthrough" or (
+                isinstance(transformer, FunctionTransformer) and transformer.func is None
+            ):
+                num_cols.extend((col, offset + i) for i, col in enumerate(columns))
+                offset += len(columns)
+            else:
+                raise CompileError(f"Unsupported transformer: {name}")
+
+        self.cat_lookups = cat_lookups
+        self.num_cols = num_cols
+        self.n_features = offset
+        self.feature_names = preprocessor.get_feature_names_out()
+
+    def same_encoding(self, other) -> bool:
+        return (
+            self.n_features == other.n_features
+            and self.cat_lookups == other.cat_lookups
+            and self.num_cols == other.num_cols
+        )
+
+    def numeric_position(self, col: str) -> int:
+        for name, pos in self.num_cols:
+            if name == col:
+                return pos
+        raise KeyError(col)
+
+    def transform_one(self, payload: dict) -> np.ndarray:
+        x = np.zeros(self.n_features)
+        for col, lookup in self.cat_lookups:
+            pos = lookup.get(payload[col])
+            if pos is not None:
+                x[pos] = 1.0
+        for col, pos in self.num_cols:
+            x[pos] = float(payload[col])
+        return x
+
+    def transform_many(self, payloads: list) -> np.ndarray:
+        X = np.zeros((len(payloads), self.n_features))
+        for row, payload in enumerate(payloads):
+            for col, lookup in self.cat_lookups:
+                pos = lookup.get(payload[col])
+                if pos is not None:
+                    X[row, pos] = 1.0
+            for col, pos in self.num_cols:
+                X[row, pos] = float(payload[col])
+        return X
+
+
+FOREST_ARRAYS = ("left", "right", "feature", "threshold", "value", "roots")
+FOREST_META = "forest.json"
+PREPROCESS_FILENAME = "preprocess.joblib"
+
+
+class CompiledForest:
+    """
+    All trees of a RandomForestRegressor packed into one node table.
+    Leaves point to themselves so every tree can be stepped `max_depth` times
+    without per-tree branching.
+    """
+
+    def __init__(self, left, right, feature, threshold, value, roots, max_depth: int):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for est in forest.estimators_:
+            tree = est.tree_
+            if tree.n_outputs != 1:
+                raise CompileError("Only single-output forests are supported.")
+            n = tree.node_count
+            idx = np.arange(n)
+            leaf = tree.children_left == -1
+            lefts.append(np.where(leaf, idx, tree.children_left) + offset)
+            rights.append(np.where(leaf, idx, tree.children_right) + offset)
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            np.concatenate(lefts),
+            np.concatenate(rights),
+            np.concatenate(features),
+            np.concatenate(thresholds),
+            np.concatenate(values),
+            np.asarray(roots),
+            max_depth,
+        )
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.roots.size)).copy()
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node].mean(axis=1)
+
+
+def export_forest(reg_pipeline, directory: str | Path, source_checksum: str):
+    """
+    Write the compiled forest as plain .npy files (plus the small fitted
+    preprocessor) so workers can np.load(mmap_mode="r") them and share the
+    pages through the OS cache instead of each unpickling its own trees.
+    Written to a temp dir and renamed, so concurrent exporters are safe.
+    """
+    directory = Path(directory)
+    forest = CompiledForest.from_sklearn(reg_pipeline.named_steps["reg"])
+
+    tmp = Path(tempfile.mkdtemp(prefix=directory.name + ".", dir=directory.parent))
+    try:
+        for name in FOREST_ARRAYS:
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(getattr(forest, name)))
+        joblib.dump(reg_pipeline.named_steps["preprocess"], tmp / PREPROCESS_FILENAME)
+        meta = {"max_depth": forest.max_depth, "source_checksum": source_checksum}
+        (tmp / FOREST_META).write_text(json.dumps(meta), encoding="utf-8")
+
+        if directory.exists():
+            shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp, directory)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not _forest_matches(directory, source_checksum):
+            raise
+    return forest
+
+
+def _forest_matches(directory: Path, source_checksum: str) -> bool:
+    try:
+        meta = json.loads((Path(directory) / FOREST_META).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return meta.get("source_checksum") == source_checksum
+
+
+def load_forest(directory: str | Path, source_checksum: str, mmap_mode: str | None = "r"):
+    """
+    Returns (CompiledForest, reg_preprocessor) or None when the exported
+    arrays are missing or were built from a different artifact.
+    """
+    directory = Path(directory)
+    if not _forest_matches(directory, source_checksum):
+        return None
+    meta = json.loads((directory / FOREST_META).read_text(encoding="utf-8"))
+    arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode) for name in FOREST_ARRAYS}
+    preprocessor = joblib.load(directory / PREPROCESS_FILENAME)
+    return CompiledForest(max_depth=meta["max_depth"], **arrays), preprocessor
+
+
+class CompiledScorer:
+    def __init__(self, clf_pipeline, reg_pipeline=None, *, forest=None, reg_preprocessor=None):
+        """
+        Either pass the fitted regressor pipeline, or an already compiled
+        `forest` with its `reg_preprocessor` (see load_forest()).
+        """
+        logreg = clf_pipeline.named_steps["clf"]
+        if logreg.coef_.shape[0] != 1:
+            raise CompileError("Only binary logistic regression is supported.")
+
+        if reg_pipeline is not None:
+            reg_preprocessor = reg_pipeline.named_steps["preprocess"]
+            forest = CompiledForest.from_sklearn(reg_pipeline.named_steps["reg"])
+        if forest is None or reg_preprocessor is None:
+            raise CompileError("A regressor pipeline or a compiled forest is required.")
+
+        self.clf_pre = CompiledPreprocessor(clf_pipeline.named_steps["preprocess"])
+        self.reg_pre = CompiledPreprocessor(reg_preprocessor)
+        self.coef = logreg.coef_.ravel().astype(np.float64)
+        self.intercept = float(logreg.intercept_[0])
+        self.forest = forest
+        # both pipelines are fitted on the same columns, so one encoding usually serves both
+        self.shared_encoding = self.clf_pre.same_encoding(self.reg_pre)
+
+    def encode(self, payloads: list):
+        X = self.clf_pre.transform_many(payloads)
+        X_reg = X if self.shared_encoding else self.reg_pre.transform_many(payloads)
+        return X, X_reg
+
+    @property
+    def feature_names(self):
+        return self.clf_pre.feature_names
+
+    def proba(self, X: np.ndarray) -> np.ndarray:
+        z = X @ self.coef + self.intercept
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def months(self, X: np.ndarray) -> np.ndarray:
+        return self.forest.predict(X)
+
+    def impacts(self, X: np.ndarray) -> np.ndarray:
+        return X * self.coef
+
+
+def check_parity(clf_pipeline, reg_pipeline, payloads: list) -> dict:
+    """
+    Max absolute difference between the compiled and sklearn outputs.
+    """
+    scorer = CompiledScorer(clf_pipeline, reg_pipeline)
+    df = pd.DataFrame(payloads)
+
+    X_clf = scorer.clf_pre.transform_many(payloads)
+    X_reg = scorer.reg_pre.transform_many(payloads)
+    sk_X = clf_pipeline.named_steps["preprocess"].transform(df)
+
+    return {
+        "rows": len(payloads),
+        "transform": float(np.abs(X_clf - sk_X).max()),
+        "proba": float(np.abs(scorer.proba(X_clf) - clf_pipeline.predict_proba(df)[:, 1]).max()),
+        "months": float(np.abs(scorer.months(X_reg) - reg_pipeline.predict(df)).max()),
+    }
+
+
+def main():
+    # Run using: python -m app.ml.compiled
+    from .inference import CATEGORICAL_COLS, NUMERIC_COLS, validate_payload
+
+    base_dir = Path(__file__).resolve().parents[2]
+    df = pd.read_csv(base_dir / "app" / "seed" / "data" / "tunistartups_plausible_200.csv")
+    clf = joblib.load(base_dir / "models" / "reach100k_clf.joblib")
+    reg = joblib.load(base_dir / "models" / "months100k_reg.joblib")
+
+    raw = df[CATEGORICAL_COLS + NUMERIC_COLS].to_dict("records")
+    coerced = [validate_payload(r)[0] for r in raw]
+
+    tol = 1e-9
+    failed = False
+    for label, rows in (("raw csv rows", raw), ("route-coerced rows", coerced)):
+        diffs = check_parity(clf, reg, rows)
+        ok = max(diffs["transform"], diffs["proba"], diffs["months"]) <= tol
+        failed = failed or not ok
+        print(f"{label}: {diffs} -> {'OK' if ok else 'MISMATCH'}")
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 import os
 from pathlib import Path
 
-import joblib
 import numpy as np
 import pandas as pd
 
+from .cache import score_cache
+from .registry import model_registry
+
 
 CATEGORICAL_COLS = [
     "industry",
@@ -28,16 +30,34 @@ NUMERIC_COLS = [
 ]
 
 
-_MODEL_CACHE = {"clf": None, "reg": None}
+# SCORING_COMPILED=0 forces the original pandas/sklearn path.
+USE_COMPILED = os.getenv("SCORING_COMPILED", "1") != "0"
+
+
+def set_compiled_enabled(enabled: bool):
+    global USE_COMPILED
+    USE_COMPILED = bool(enabled)
+
 
+def get_bundle(model_dir: str | Path, version: str | None = None):
+    """
+    The active model bundle, or a specific resident version for A/B comparison.
+    """
+    model_registry.set_model_dir(model_dir)
+    if version:
+        return model_registry.get_by_version(version)
+    return model_registry.get()
 
-def load_models(model_dir: str | Path):
-    model_dir = Path(model_dir)
-    if _MODEL_CACHE["clf"] is None:
-        _MODEL_CACHE["clf"] = joblib.load(model_dir / "reach100k_clf.joblib")
-    if _MODEL_CACHE["reg"] is None:
-        _MODEL_CACHE["reg"] = joblib.load(model_dir / "months100k_reg.joblib")
-    return _MODEL_CACHE["clf"], _MODEL_CACHE["reg"]
+
+def load_models(model_dir: str | Path, version: str | None = None):
+    bundle = get_bundle(model_dir, version)
+    return bundle.clf, bundle.reg
+
+
+def _scorer(bundle):
+    if not USE_COMPILED:
+        return None
+    return bundle.compiled
 
 
 def _band_for_probability(p: float):
@@ -52,6 +72,30 @@ def _band_for_probability(p: float):
     return "Low", None
 
 
+def validate_payload(payload: dict):
+    """
+    Check required fields and coerce numeric columns to float.
+    Returns (clean_payload, None) or (None, error_dict).
+    """
+    if not isinstance(payload, dict):
+        return None, {"message": "Payload must be a JSON object."}
+
+    required = CATEGORICAL_COLS + NUMERIC_COLS
+    missing = [k for k in required if k not in payload or payload[k] in ("", None)]
+    if missing:
+        return None, {"message": "Missing fields", "missing": missing}
+
+    clean = dict(payload)
+    for key in NUMERIC_COLS:
+        try:
+            clean[key] = float(clean[key])
+        except (TypeError, ValueError):
+            return None, {"message": f"Invalid numeric value for {key}."}
+
+    clean["customer_traction"] = str(clean["customer_traction"])
+    return clean, None
+
+
 def _format_feature_name(name: str) -> str:
     if "_" in name and any(name.startswith(c + "_") for c in CATEGORICAL_COLS):
         base, value = name.split("_", 1)
@@ -59,16 +103,35 @@ def _format_feature_name(name: str) -> str:
     return name
 
 
+def display_feature_names(preprocessor) -> list:
+    """
+    get_feature_names_out() formatted for the drivers output. Registry bundles
+    compute this once at load (ModelBundle.feature_names).
+    """
+    return [_format_feature_name(n) for n in preprocessor.get_feature_names_out()]
+
+
 def explain_logreg(pipeline, payload_dict: dict, top_n: int = 5):
     preprocessor = pipeline.named_steps["preprocess"]
+    bundle = model_registry.bundle_for(pipeline)
+    feature_names = bundle.feature_names if bundle is not None else display_feature_names(preprocessor)
+
+    scorer = _scorer(bundle) if bundle is not None else None
+    if scorer is not None:
+        x = scorer.clf_pre.transform_one(payload_dict)
+        return _drivers_from_impacts(scorer.impacts(x), feature_names, top_n)
+
     clf = pipeline.named_steps["clf"]
 
     df = pd.DataFrame([payload_dict])
     X_trans = preprocessor.transform(df)
-    feature_names = preprocessor.get_feature_names_out()
 
     coef = clf.coef_.ravel()
     impacts = coef * X_trans.ravel()
+    return _drivers_from_impacts(impacts, feature_names, top_n)
+
+
+def _drivers_from_impacts(impacts, feature_names, top_n: int = 5):
     idx_sorted = np.argsort(impacts)
 
     top_negative_idx = idx_sorted[:top_n]
@@ -79,7 +142,7 @@ def explain_logreg(pipeline, payload_dict: dict, top_n: int = 5):
         for i in indices:
             items.append(
                 {
-                    "feature": _format_feature_name(feature_names[i]),
+                    "feature": feature_names[i],
                     "impact": float(round(impacts[i], 4)),
                 }
             )
@@ -91,17 +154,11 @@ def explain_logreg(pipeline, payload_dict: dict, top_n: int = 5):
     }
 
 
-def predict(payload_dict: dict, model_dir: str | Path):
-    clf, reg = load_models(model_dir)
-
-    df = pd.DataFrame([payload_dict])
-    p_reach = float(clf.predict_proba(df)[0][1])
-
+def _result_for(p_reach: float, months: float | None, model_version: str | None = None):
     band, years_range = _band_for_probability(p_reach)
 
     years_model_estimate = None
-    if p_reach >= 0.35:
-        months = float(reg.predict(df)[0])
+    if months is not None:
         years_model_estimate = round(months / 12.0, 2)
 
     return {
@@ -109,4 +166,240 @@ def predict(payload_dict: dict, model_dir: str | Path):
         "band": band,
         "years_range": years_range,
         "years_model_estimate": years_model_estimate,
+        "model_version": model_version,
+    }
+
+
+def _score_rows(rows: list, bundle, explain: bool = True):
+    """
+    Encode `rows` once and reuse the matrix for the probability, the months
+    regression (only where p >= 0.35) and the coefficient impacts.
+    Returns (p_reach, months, reg_mask, impacts); impacts is None if not requested.
+    """
+    months = np.full(len(rows), np.nan)
+
+    scorer = _scorer(bundle)
+    if scorer is not None:
+        X, X_reg = scorer.encode(rows)
+        p_reach = scorer.proba(X)
+        reg_mask = p_reach >= 0.35
+        if reg_mask.any():
+            months[reg_mask] = scorer.months(X_reg[reg_mask])
+        impacts = scorer.impacts(X) if explain else None
+        return p_reach, months, reg_mask, impacts
+
+    clf, reg = bundle.clf, bundle.reg
+    df = pd.DataFrame(rows, columns=CATEGORICAL_COLS + NUMERIC_COLS)
+    X = clf.named_steps["preprocess"].transform(df)
+    logreg = clf.named_steps["clf"]
+    p_reach = logreg.predict_proba(X)[:, 1]
+
+    reg_mask = p_reach >= 0.35
+    if reg_mask.any():
+        if bundle.compiled is not None and bundle.compiled.shared_encoding:
+            months[reg_mask] = reg.named_steps["reg"].predict(X[reg_mask])
+        else:
+            months[reg_mask] = reg.predict(df[reg_mask])
+
+    impacts = X * logreg.coef_.ravel() if explain else None
+    return p_reach, months, reg_mask, impacts
+
+
+def predict(payload_dict: dict, model_dir: str | Path, version: str | None = None):
+    bundle = get_bundle(model_dir, version)
+
+    p_reach, months, reg_mask, _ = _score_rows([payload_dict], bundle, explain=False)
+    m = float(months[0]) if reg_mask[0] else None
+    return _result_for(float(p_reach[0]), m, bundle.version)
+
+
+def cache_key(payload_dict: dict, model_version: str, top_n: int = 5):
+    """
+    Key for score_cache: model version + validated payload values in feature
+    order. None if a value is unhashable (such payloads are just not cached).
+    """
+    key = (model_version, top_n) + tuple(payload_dict[c] for c in CATEGORICAL_COLS + NUMERIC_COLS)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def score_and_explain(
+    payload_dict: dict,
+    model_dir: str | Path,
+    top_n: int = 5,
+    version: str | None = None,
+    use_cache: bool = True,
+):
+    """
+    predict() + explain_logreg() from a single preprocessing pass.
+    Expects a payload already passed through validate_payload().
+    Returns (result, drivers).
+    """
+    bundle = get_bundle(model_dir, version)
+
+    key = cache_key(payload_dict, bundle.version, top_n) if use_cache else None
+    if key is not None:
+        cached = score_cache.get(key)
+        if cached is not None:
+            return cached
+
+    feature_names = bundle.feature_names
+    p_reach, months, reg_mask, impacts = _score_rows([payload_dict], bundle)
+    m = float(months[0]) if reg_mask[0] else None
+    scored = (
+        _result_for(float(p_reach[0]), m, bundle.version),
+        _drivers_from_impacts(impacts[0], feature_names, top_n),
+    )
+
+    if key is not None:
+        score_cache.set(key, scored)
+    return scored
+
+
+def predict_batch(
+    payloads: list,
+    model_dir: str | Path,
+    top_n: int = 5,
+    version: str | None = None,
+    explain: bool = True,
+):
+    """
+    Score many payloads with one predict_proba / predict call per model.
+    Invalid rows are reported individually instead of failing the batch:
+    each item is either {"index", "input", "result", "drivers"} or {"index", "error"}
+    ("drivers" is left out when explain=False).
+    """
+    bundle = get_bundle(model_dir, version)
+
+    items = [None] * len(payloads)
+    valid_idx = []
+    valid_rows = []
+    for i, payload in enumerate(payloads):
+        clean, error = validate_payload(payload)
+        if error:
+            items[i] = {"index": i, "error": error}
+            continue
+        valid_idx.append(i)
+        valid_rows.append(clean)
+
+    if not valid_rows:
+        return items
+
+    feature_names = bundle.feature_names
+    p_reach, months, reg_mask, impacts = _score_rows(valid_rows, bundle, explain=explain)
+
+    for row, i in enumerate(valid_idx):
+        p = float(p_reach[row])
+        m = float(months[row]) if reg_mask[row] else None
+        items[i] = {
+            "index": i,
+            "input": valid_rows[row],
+            "result": _result_for(p, m, bundle.version),
+        }
+        if explain:
+            items[i]["drivers"] = _drivers_from_impacts(impacts[row], feature_names, top_n)
+
+    return items
+
+
+MAX_SENSITIVITY_POINTS = 10000
+
+
+def _sweep_values(sweep: dict):
+    field = sweep.get("field") if isinstance(sweep, dict) else None
+    if field not in NUMERIC_COLS:
+        raise ValueError(f"Sweep field must be one of: {', '.join(NUMERIC_COLS)}.")
+
+    # sizes are checked before anything is allocated; sensitivity() checks the product
+    if "values" in sweep:
+        raw = sweep["values"]
+        if not isinstance(raw, list):
+            raise ValueError(f"'values' for {field} must be a list.")
+        if len(raw) > MAX_SENSITIVITY_POINTS:
+            raise ValueError(f"Too many values for {field} ({len(raw)}, max {MAX_SENSITIVITY_POINTS}).")
+        try:
+            values = [float(v) for v in raw]
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid values for {field}.")
+    else:
+        try:
+            start, stop = float(sweep["start"]), float(sweep["stop"])
+            steps = int(sweep.get("steps", 20))
+        except (KeyError, TypeError, ValueError, OverflowError):
+            raise ValueError(f"Sweep for {field} needs 'values' or numeric 'start'/'stop'/'steps'.")
+        if steps < 2:
+            raise ValueError("'steps' must be at least 2.")
+        if steps > MAX_SENSITIVITY_POINTS:
+            raise ValueError(f"Too many steps for {field} ({steps}, max {MAX_SENSITIVITY_POINTS}).")
+        values = np.linspace(start, stop, steps).tolist()
+
+    if not values:
+        raise ValueError(f"No values to sweep for {field}.")
+    return field, values
+
+
+def sensitivity(base_payload: dict, sweeps: list, model_dir: str | Path, version: str | None = None):
+    """
+    Evaluate p_reach_100k (and the years estimate where p >= 0.35) while one
+    or two numeric fields sweep over value grids, in one vectorized pass:
+    the base payload is encoded once and the grid is written into copies
+    of that row.
+    """
+    if not isinstance(sweeps, list) or not 1 <= len(sweeps) <= 2:
+        raise ValueError("Provide one or two sweeps.")
+    axes = [_sweep_values(s) for s in sweeps]
+    fields = [f for f, _ in axes]
+    if len(set(fields)) != len(fields):
+        raise ValueError("Sweep fields must be different.")
+
+    shape = tuple(len(v) for _, v in axes)
+    n_points = int(np.prod(shape))
+    if n_points > MAX_SENSITIVITY_POINTS:
+        raise ValueError(f"Grid too large ({n_points} points, max {MAX_SENSITIVITY_POINTS}).")
+
+    grids = np.meshgrid(*[np.asarray(v, dtype=float) for _, v in axes], indexing="ij")
+    columns = {field: grid.ravel() for field, grid in zip(fields, grids)}
+
+    bundle = get_bundle(model_dir, version)
+    months = np.full(n_points, np.nan)
+
+    scorer = _scorer(bundle)
+    if scorer is not None:
+        def _grid_matrix(pre):
+            X = np.tile(pre.transform_one(base_payload), (n_points, 1))
+            for field, col in columns.items():
+                X[:, pre.numeric_position(field)] = col
+            return X
+
+        X = _grid_matrix(scorer.clf_pre)
+        p_reach = scorer.proba(X)
+        reg_mask = p_reach >= 0.35
+        if reg_mask.any():
+            X_reg = X if scorer.shared_encoding else _grid_matrix(scorer.reg_pre)
+            months[reg_mask] = scorer.months(X_reg[reg_mask])
+    else:
+        df = pd.DataFrame([base_payload] * n_points, columns=CATEGORICAL_COLS + NUMERIC_COLS)
+        for field, col in columns.items():
+            df[field] = col
+        p_reach = bundle.clf.predict_proba(df)[:, 1]
+        reg_mask = p_reach >= 0.35
+        if reg_mask.any():
+            months[reg_mask] = bundle.reg.predict(df[reg_mask])
+
+    years = np.where(reg_mask, np.round(months / 12.0, 2), np.nan)
+    p_grid = np.round(p_reach, 4).reshape(shape)
+    years_grid = years.reshape(shape)
+
+    def _to_list(a):
+        return [None if np.isnan(v) else float(v) for v in a] if a.ndim == 1 else [_to_list(r) for r in a]
+
+    return {
+        "fields": fields,
+        "values": [v for _, v in axes],
+        "p_reach_100k": _to_list(p_grid),
+        "years_model_estimate": _to_list(years_grid),
+        "model_version": bundle.version,
     }
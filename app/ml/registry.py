@@ -0,0 +1,365 @@
+"""
+Loaded scoring models.
+
+The active version is the pair of artifacts at the root of the model dir
+(reach100k_clf.joblib / months100k_reg.joblib). Other versions live under
+<model_dir>/versions/<name>/ with the same file names and can be kept
+resident next to the active one for A/B comparison. Only an admin loads a
+version (POST /models/reload); scoring requests can pick among the resident
+ones. At most SCORING_MAX_RESIDENT bundles are kept; loading another evicts
+the least recently loaded non-active one.
+
+A version is swapped in only after both artifacts are fully loaded and
+compiled, so requests never see a half-loaded pair. When the directory has
+a metrics.json listing artifact checksums (train_models.save_artifacts),
+a pair is only loaded once both files match it; the watcher keeps the
+previous pair until then.
+
+With mmap enabled the random forest is not unpickled per worker: its
+compiled node arrays are exported once next to the artifact
+(months100k_reg.arrays/) and memory-mapped read-only, so prefork workers
+share those pages. The full sklearn regressor is only loaded if the
+pandas/sklearn fallback path asks for it.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import joblib
+
+from .compiled import CompileError, CompiledScorer, export_forest, load_forest
+
+CLF_FILENAME = "reach100k_clf.joblib"
+REG_FILENAME = "months100k_reg.joblib"
+REG_ARRAYS_DIRNAME = "months100k_reg.arrays"
+METRICS_FILENAME = "metrics.json"
+VERSIONS_DIRNAME = "versions"
+
+_VERSION_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+
+log = logging.getLogger(__name__)
+
+
+class ModelNotFound(LookupError):
+    pass
+
+
+class ArtifactsMismatch(ModelNotFound):
+    """
+    The artifacts on disk do not match the checksums in metrics.json: a
+    new version is being written.
+    """
+
+
+def file_checksum(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _matches_metrics(directory: Path, checksums: dict) -> bool:
+    """
+    False when directory/metrics.json lists artifact checksums that differ
+    from checksums (or cannot be read); True without such a list.
+    """
+    try:
+        metrics = json.loads((directory / METRICS_FILENAME).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return True
+    except (OSError, ValueError):
+        return False
+    expected = metrics.get("artifacts") if isinstance(metrics, dict) else None
+    if not expected:
+        return True
+    return all(expected.get(name, checksum) == checksum for name, checksum in checksums.items())
+
+
+def _stat_signature(paths):
+    return tuple((p.stat().st_mtime_ns, p.stat().st_size) for p in paths)
+
+
+class ModelBundle:
+    def __init__(self, name: str, directory: Path, mmap: bool = True):
+        self.name = name
+        self.directory = Path(directory)
+        self.clf_path = self.directory / CLF_FILENAME
+        self.reg_path = self.directory / REG_FILENAME
+        if not self.clf_path.exists() or not self.reg_path.exists():
+            raise ModelNotFound(f"Model artifacts not found in {self.directory}")
+
+        started = time.perf_counter()
+        self.signature = _stat_signature((self.clf_path, self.reg_path))
+        clf_checksum = file_checksum(self.clf_path)
+        reg_checksum = file_checksum(self.reg_path)
+        if not _matches_metrics(self.directory, {CLF_FILENAME: clf_checksum, REG_FILENAME: reg_checksum}):
+            raise ArtifactsMismatch(f"Model artifacts in {self.directory} do not match {METRICS_FILENAME}")
+
+        combined = hashlib.sha256()
+        combined.update(clf_checksum.encode())
+        combined.update(reg_checksum.encode())
+        self.checksum = combined.hexdigest()
+        self.version = self.checksum[:12]
+
+        self._reg = None
+        self._reg_lock = threading.Lock()
+        self.mmap = False
+        self.clf = joblib.load(self.clf_path, mmap_mode="r" if mmap else None)
+        # inference imports this module, so its helper is imported here
+        from .inference import display_feature_names
+        self.feature_names = display_feature_names(self.clf.named_steps["preprocess"])
+        self.compiled = None
+        try:
+            if mmap:
+                self.compiled = self._compile_mmapped(reg_checksum)
+                self.mmap = self.compiled is not None
+            if self.compiled is None:
+                self.compiled = CompiledScorer(self.clf, self.reg)
+        except CompileError:
+            self.compiled = None
+
+        self.loaded_at = datetime.now(timezone.utc)
+        self.load_seconds = time.perf_counter() - started
+
+    @staticmethod
+    def _load_arrays(arrays_dir: Path, reg_checksum: str):
+        try:
+            return load_forest(arrays_dir, reg_checksum)
+        except (OSError, ValueError, EOFError) as e:
+            # another worker is replacing the directory (export_forest swaps it whole)
+            log.warning("Could not load forest arrays from %s (%s); using the pickled model", arrays_dir, e)
+            return None
+
+    def _compile_mmapped(self, reg_checksum: str):
+        arrays_dir = self.directory / REG_ARRAYS_DIRNAME
+        loaded = self._load_arrays(arrays_dir, reg_checksum)
+        if loaded is None:
+            try:
+                export_forest(joblib.load(self.reg_path), arrays_dir, reg_checksum)
+            except OSError:
+                log.warning("Could not export forest arrays to %s; using the pickled model", arrays_dir)
+                return None
+            loaded = self._load_arrays(arrays_dir, reg_checksum)
+            if loaded is None:
+                return None
+        forest, reg_preprocessor = loaded
+        return CompiledScorer(self.clf, forest=forest, reg_preprocessor=reg_preprocessor)
+
+    @property
+    def reg(self):
+        """
+        The full sklearn regressor pipeline, unpickled on first use when the
+        bundle was loaded from memory-mapped arrays.
+        """
+        if self._reg is None:
+            with self._reg_lock:
+                if self._reg is None:
+                    self._reg = joblib.load(self.reg_path)
+        return self._reg
+
+    def is_stale(self) -> bool:
+        try:
+            return _stat_signature((self.clf_path, self.reg_path)) != self.signature
+        except FileNotFoundError:
+            # mid-replace; keep serving the loaded copy
+            return False
+
+    def info(self) -> dict:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "checksum": self.checksum,
+            "loaded_at": self.loaded_at.isoformat(),
+            "load_seconds": round(self.load_seconds, 4),
+            "compiled": self.compiled is not None,
+            "mmap": self.mmap,
+        }
+
+
+class ModelRegistry:
+    ACTIVE = "active"
+
+    def __init__(self, max_resident: int = 4):
+        self._lock = threading.Lock()
+        self._model_dir = None
+        self._mmap = True
+        self.max_resident = max_resident
+        self._bundles = {}
+        self._listeners = []
+        self._watcher = None
+        self._started = False
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        self._model_dir = Path(app.config["MODEL_DIR"])
+        self._mmap = bool(app.config.get("SCORING_MMAP", True))
+        self.max_resident = max(int(app.config.get("SCORING_MAX_RESIDENT", self.max_resident)), 1)
+        app.extensions["model_registry"] = self
+
+        eager = bool(app.config.get("SCORING_EAGER_LOAD"))
+        interval = float(app.config.get("SCORING_MODEL_WATCH_INTERVAL") or 0)
+        if not eager and interval <= 0:
+            return
+
+        # on the first request a process serves, so CLI commands (db upgrade,
+        # seeds, training) neither pay for the load nor start the watcher
+        @app.before_request
+        def _start_model_registry():
+            if self._started:
+                return
+            with self._lock:
+                if self._started:
+                    return
+                self._started = True
+            if eager and self.ACTIVE not in self._bundles:
+                try:
+                    self.load()
+                except ModelNotFound as e:
+                    log.warning("Scoring models not loaded: %s", e)
+            if interval > 0:
+                self.start_watcher(interval)
+
+    # -------------------------
+    # Loading
+    # -------------------------
+    @property
+    def model_dir(self) -> Path:
+        if self._model_dir is None:
+            raise ModelNotFound("Model registry has no model directory configured.")
+        return self._model_dir
+
+    def set_model_dir(self, model_dir):
+        model_dir = Path(model_dir)
+        if self._model_dir != model_dir:
+            with self._lock:
+                self._model_dir = model_dir
+                self._bundles.clear()
+
+    def _directory_for(self, name: str) -> Path:
+        if name == self.ACTIVE:
+            return self.model_dir
+        if not _VERSION_NAME_RE.match(name):
+            raise ModelNotFound(f"Invalid model version name: {name}")
+        return self.model_dir / VERSIONS_DIRNAME / name
+
+    def load(self, name: str = ACTIVE) -> ModelBundle:
+        """
+        (Re)load a version and swap it in atomically.
+        """
+        bundle = ModelBundle(name, self._directory_for(name), mmap=self._mmap)
+        with self._lock:
+            previous = self._bundles.get(name)
+            self._bundles[name] = bundle
+            self._evict(keep=name)
+        if previous is not None and previous.checksum != bundle.checksum:
+            self._notify(name, bundle)
+        return bundle
+
+    def _evict(self, keep: str):
+        # caller holds self._lock
+        while len(self._bundles) > self.max_resident:
+            candidates = [b for n, b in self._bundles.items() if n not in (self.ACTIVE, keep)]
+            if not candidates:
+                return
+            oldest = min(candidates, key=lambda b: b.loaded_at)
+            del self._bundles[oldest.name]
+            log.info("Model version %s evicted (SCORING_MAX_RESIDENT=%s)", oldest.name, self.max_resident)
+
+    def get(self, name: str = ACTIVE) -> ModelBundle:
+        bundle = self._bundles.get(name)
+        if bundle is None:
+            with self._lock:
+                bundle = self._bundles.get(name)
+            if bundle is None:
+                bundle = self.load(name)
+        return bundle
+
+    def get_by_version(self, version: str, load: bool = False) -> ModelBundle:
+        """
+        Resolve a resident bundle by name or version hash. An on-disk version
+        that is not resident is only loaded with load=True (admin callers).
+        """
+        if version == self.ACTIVE:
+            return self.get()
+        for bundle in list(self._bundles.values()):
+            if version in (bundle.name, bundle.version):
+                return bundle
+        if load and _VERSION_NAME_RE.match(version) and (self.model_dir / VERSIONS_DIRNAME / version).is_dir():
+            return self.load(version)
+        raise ModelNotFound(f"Model version {version} is not loaded.")
+
+    def bundle_for(self, clf_pipeline):
+        for bundle in list(self._bundles.values()):
+            if bundle.clf is clf_pipeline:
+                return bundle
+        return None
+
+    def unload(self, name: str):
+        if name == self.ACTIVE:
+            raise ValueError("The active model cannot be unloaded.")
+        with self._lock:
+            self._bundles.pop(name, None)
+
+    def available_versions(self) -> list:
+        versions_dir = self.model_dir / VERSIONS_DIRNAME
+        if not versions_dir.is_dir():
+            return []
+        return sorted(
+            p.name for p in versions_dir.iterdir()
+            if (p / CLF_FILENAME).exists() and (p / REG_FILENAME).exists()
+        )
+
+    def resident(self) -> list:
+        return [b.info() for b in list(self._bundles.values())]
+
+    # -------------------------
+    # Hot reload
+    # -------------------------
+    def on_reload(self, callback):
+        """
+        Register callback(name, bundle) fired whenever a version's artifacts change.
+        """
+        self._listeners.append(callback)
+        return callback
+
+    def _notify(self, name, bundle):
+        for callback in list(self._listeners):
+            callback(name, bundle)
+
+    def reload_if_changed(self) -> list:
+        reloaded = []
+        for name, bundle in list(self._bundles.items()):
+            if bundle.is_stale():
+                try:
+                    self.load(name)
+                    reloaded.append(name)
+                except ArtifactsMismatch:
+                    log.info("Model %s is being replaced; keeping version %s until it is complete", name, bundle.version)
+                except Exception:
+                    log.exception("Reloading model %s failed; keeping version %s", name, bundle.version)
+        return reloaded
+
+    def start_watcher(self, interval: float):
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=_run, name="model-registry-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+        self._watcher = None
+
+
+model_registry = ModelRegistry()
@@ -1,16 +1,23 @@
+import json
 import os
+import shutil
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 
 import joblib
 import pandas as pd
+import sklearn
 from sklearn.compose import ColumnTransformer
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import mean_absolute_error, roc_auc_score
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import GridSearchCV, train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder
 
+from .registry import CLF_FILENAME, METRICS_FILENAME, REG_FILENAME, VERSIONS_DIRNAME, file_checksum
+
 
 CATEGORICAL_COLS = [
     "industry",
@@ -47,69 +54,214 @@ def _build_preprocessor():
     )
 
 
-def _build_classifier(preprocessor):
+def _build_classifier(preprocessor, C: float = 1.0):
     return Pipeline(
         steps=[
             ("preprocess", preprocessor),
-            ("clf", LogisticRegression(max_iter=1000, class_weight="balanced")),
+            ("clf", LogisticRegression(C=C, max_iter=1000, class_weight="balanced")),
         ]
     )
 
 
-def _build_regressor(preprocessor):
+def _build_regressor(preprocessor, n_jobs: int | None = None, **params):
+    rf_params = {"n_estimators": 300, "min_samples_leaf": 2, "random_state": 42}
+    rf_params.update(params)
     return Pipeline(
         steps=[
             ("preprocess", preprocessor),
-            (
-                "reg",
-                RandomForestRegressor(
-                    n_estimators=300,
-                    min_samples_leaf=2,
-                    random_state=42,
-                ),
-            ),
+            ("reg", RandomForestRegressor(n_jobs=n_jobs, **rf_params)),
         ]
     )
 
 
-def main():
-    base_dir = Path(__file__).resolve().parents[2]
-    data_path = base_dir / "app" / "seed" / "data" / "tunistartups_plausible_200.csv"
-    model_dir = base_dir / "models"
-    model_dir.mkdir(parents=True, exist_ok=True)
+CLF_PARAM_GRID = {"clf__C": [0.1, 0.3, 1.0, 3.0, 10.0]}
+REG_PARAM_GRID = {
+    "reg__n_estimators": [200, 300],
+    "reg__min_samples_leaf": [1, 2, 4],
+    "reg__max_depth": [None, 12],
+}
+
+
+# -------------------------
+# Data sources
+# -------------------------
+def load_csv_frame(path: str | Path | None = None) -> pd.DataFrame:
+    if path is None:
+        path = Path(__file__).resolve().parents[2] / "app" / "seed" / "data" / "tunistartups_plausible_200.csv"
+    return pd.read_csv(path)
+
+
+def iter_db_chunks(chunk_size: int = 5000):
+    """
+    Yield DataFrames of labelled startups from startup_metrics, `chunk_size`
+    rows at a time (keyset on startup_metrics.id, no OFFSET scans).
+    Must run inside an app context.
+    """
+    from ..extensions import db
+    from ..models.startup import StartupMetrics
+
+    cols = [getattr(StartupMetrics, c) for c in CATEGORICAL_COLS + NUMERIC_COLS]
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            db.select(StartupMetrics.id, *cols, StartupMetrics.reached_100k, StartupMetrics.months_to_100k)
+            .where(StartupMetrics.id > last_id, StartupMetrics.reached_100k.is_not(None))
+            .order_by(StartupMetrics.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
 
-    df = pd.read_csv(data_path)
+        df = pd.DataFrame(
+            [r[1:] for r in rows],
+            columns=CATEGORICAL_COLS + NUMERIC_COLS + [TARGET_CLASS, TARGET_MONTHS],
+        )
+        yield df.dropna(subset=CATEGORICAL_COLS + NUMERIC_COLS)
+
+
+def load_db_frame(chunk_size: int = 5000) -> pd.DataFrame:
+    chunks = list(iter_db_chunks(chunk_size))
+    if not chunks:
+        return pd.DataFrame(columns=CATEGORICAL_COLS + NUMERIC_COLS + [TARGET_CLASS, TARGET_MONTHS])
+    df = pd.concat(chunks, ignore_index=True)
+    for col in NUMERIC_COLS:
+        df[col] = df[col].astype(float)
+    df["customer_traction"] = df["customer_traction"].astype(int)
+    df[TARGET_CLASS] = df[TARGET_CLASS].astype(int)
+    return df
+
+
+# -------------------------
+# Training
+# -------------------------
+def train(df: pd.DataFrame, n_jobs: int = -1, search: bool = False, cv: int = 5, random_state: int = 42):
+    """
+    Fit the reach classifier and the months regressor.
+    n_jobs: cores for the forest and, with `search`, for the GridSearchCV
+    process pool (the forest is kept single-threaded inside the search).
+    Returns (clf, reg, metrics).
+    """
     features = CATEGORICAL_COLS + NUMERIC_COLS
+    started = time.perf_counter()
 
     X = df[features]
     y = df[TARGET_CLASS]
+    if y.nunique() < 2:
+        raise ValueError("Training data needs both reached and not-reached startups.")
 
     X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
+        X, y, test_size=0.2, random_state=random_state, stratify=y
     )
 
-    clf = _build_classifier(_build_preprocessor())
-    clf.fit(X_train, y_train)
+    metrics = {"rows": int(len(df)), "positives": int(y.sum()), "n_jobs": n_jobs, "search": None}
+
+    if search:
+        clf_search = GridSearchCV(
+            _build_classifier(_build_preprocessor()), CLF_PARAM_GRID,
+            scoring="roc_auc", cv=cv, n_jobs=n_jobs,
+        )
+        clf_search.fit(X_train, y_train)
+        clf = clf_search.best_estimator_
+        metrics["search"] = {"clf": {"best_params": clf_search.best_params_, "cv_auc": float(clf_search.best_score_)}}
+    else:
+        clf = _build_classifier(_build_preprocessor())
+        clf.fit(X_train, y_train)
+
     y_prob = clf.predict_proba(X_test)[:, 1]
-    auc = roc_auc_score(y_test, y_prob)
+    metrics["auc"] = float(roc_auc_score(y_test, y_prob))
 
-    df_pos = df[df[TARGET_CLASS] == 1].copy()
+    df_pos = df[df[TARGET_CLASS] == 1].dropna(subset=[TARGET_MONTHS])
     X_pos = df_pos[features]
     y_pos = df_pos[TARGET_MONTHS]
     X_train_r, X_test_r, y_train_r, y_test_r = train_test_split(
-        X_pos, y_pos, test_size=0.2, random_state=42
+        X_pos, y_pos, test_size=0.2, random_state=random_state
     )
 
-    reg = _build_regressor(_build_preprocessor())
+    if search:
+        reg_search = GridSearchCV(
+            _build_regressor(_build_preprocessor(), n_jobs=1), REG_PARAM_GRID,
+            scoring="neg_mean_absolute_error", cv=cv, n_jobs=n_jobs,
+        )
+        reg_search.fit(X_train_r, y_train_r)
+        best = {k.split("__", 1)[1]: v for k, v in reg_search.best_params_.items()}
+        metrics["search"]["reg"] = {"best_params": reg_search.best_params_, "cv_mae": float(-reg_search.best_score_)}
+        reg = _build_regressor(_build_preprocessor(), n_jobs=n_jobs, **best)
+    else:
+        reg = _build_regressor(_build_preprocessor(), n_jobs=n_jobs)
+
     reg.fit(X_train_r, y_train_r)
     y_pred_r = reg.predict(X_test_r)
-    mae = mean_absolute_error(y_test_r, y_pred_r)
+    metrics["mae"] = float(mean_absolute_error(y_test_r, y_pred_r))
+
+    # don't ship a thread pool into every request that uses the sklearn path
+    reg.named_steps["reg"].set_params(n_jobs=None)
+
+    metrics["train_seconds"] = round(time.perf_counter() - started, 3)
+    return clf, reg, metrics
+
+
+def _atomic_dump(obj, path: Path):
+    # registry watchers must never see a half-written artifact
+    tmp = path.with_name(path.name + ".tmp")
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+
+def _atomic_copy(src: Path, dst: Path):
+    tmp = dst.with_name(dst.name + ".tmp")
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _atomic_write_json(data: dict, path: Path):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def save_artifacts(clf, reg, metrics: dict, model_dir: str | Path, version: str | None = None, activate: bool = True):
+    """
+    Write models/versions/<version>/{artifacts, metrics.json} and, with
+    `activate`, replace the active artifacts at the root of `model_dir`.
+
+    metrics.json lists the checksum of each artifact. At the root it is
+    written before the artifacts are replaced: the registry only loads a pair
+    whose files match it, so a watcher polling between the two replaces
+    (including the very first activation) keeps serving the previous pair.
+    """
+    model_dir = Path(model_dir)
+    version = version or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    version_dir = model_dir / VERSIONS_DIRNAME / version
+    version_dir.mkdir(parents=True, exist_ok=True)
+
+    _atomic_dump(clf, version_dir / CLF_FILENAME)
+    _atomic_dump(reg, version_dir / REG_FILENAME)
+    metrics = dict(metrics, version=version, trained_at=datetime.now(timezone.utc).isoformat(),
+                   sklearn_version=sklearn.__version__,
+                   artifacts={name: file_checksum(version_dir / name) for name in (CLF_FILENAME, REG_FILENAME)})
+    _atomic_write_json(metrics, version_dir / METRICS_FILENAME)
+
+    if activate:
+        _atomic_write_json(metrics, model_dir / METRICS_FILENAME)
+        # byte-identical copies, so the checksums in metrics.json hold for the root too
+        _atomic_copy(version_dir / REG_FILENAME, model_dir / REG_FILENAME)
+        _atomic_copy(version_dir / CLF_FILENAME, model_dir / CLF_FILENAME)
+
+    return version, metrics
+
+
+def main():
+    base_dir = Path(__file__).resolve().parents[2]
+    model_dir = base_dir / "models"
+    model_dir.mkdir(parents=True, exist_ok=True)
 
-    joblib.dump(clf, model_dir / "reach100k_clf.joblib")
-    joblib.dump(reg, model_dir / "months100k_reg.joblib")
+    clf, reg, metrics = train(load_csv_frame(), n_jobs=-1)
+    version, _ = save_artifacts(clf, reg, dict(metrics, source="csv"), model_dir)
 
-    print(f"AUC (reach 100k classifier): {auc:.3f}")
-    print(f"MAE (months to 100k regressor): {mae:.2f}")
+    print(f"AUC (reach 100k classifier): {metrics['auc']:.3f}")
+    print(f"MAE (months to 100k regressor): {metrics['mae']:.2f}")
+    print(f"Saved model version: {version}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
 from .user import User, UserRole
-from .startup import Startup, ScoreEvent
+from .startup import Startup, ScoreEvent, StartupMetrics
 from .post import Post, Comment, Reaction
 from .notification import Notification
-from .hub import Bank, LoanRate
+from .hub import Bank, LoanRate, LegalResource
 from .contract import Contract
 from .signature import Signature
-from .task import Task
\ No newline at end of file
+from .task import Task
+from .fx import FxSnapshot
+from .holiday import HolidayYear
@@ -0,0 +1,22 @@
+from datetime import datetime
+from ..extensions import db
+
+
+class FxSnapshot(db.Model):
+    """
+    One USD-based rate per currency per day (USD -> currency), written by the
+    FX refresher. The last refresh of a day overwrites that day's row.
+    """
+    __tablename__ = "fx_snapshots"
+    __table_args__ = (
+        db.UniqueConstraint("currency", "rate_date", name="uq_fx_snapshots_currency_date"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    currency = db.Column(db.String(3), nullable=False)
+    rate_date = db.Column(db.Date, nullable=False, index=True)
+    usd_rate = db.Column(db.Float, nullable=False)
+
+    # provider timestamp of the table this rate came from
+    source_timestamp = db.Column(db.Integer, nullable=True)
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow)
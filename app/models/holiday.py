@@ -0,0 +1,20 @@
+from datetime import datetime
+from ..extensions import db
+
+
+class HolidayYear(db.Model):
+    """
+    Public holidays of one country for one year, as fetched from Calendarific.
+    `holidays` is a JSON list of {"date": "YYYY-MM-DD", "name": "..."}; a row
+    with an empty list still marks the year as fetched.
+    """
+    __tablename__ = "holiday_years"
+    __table_args__ = (
+        db.UniqueConstraint("country", "year", name="uq_holiday_years_country_year"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    country = db.Column(db.String(2), nullable=False)
+    year = db.Column(db.Integer, nullable=False)
+    holidays = db.Column(db.Text, nullable=False, default="[]")
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -19,6 +19,12 @@ class Bank(db.Model):
 
 class LoanRate(db.Model):
     __tablename__ = "loan_rates"
+    __table_args__ = (
+        # /api/hub/loans filters: product (+ rate order), bank + product, validity window
+        db.Index("ix_loan_rates_product_rate", "product_name", "rate_value"),
+        db.Index("ix_loan_rates_bank_product", "bank_id", "product_name"),
+        db.Index("ix_loan_rates_validity", "valid_from", "valid_to"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -3,6 +3,10 @@ from ..extensions import db
 
 class Post(db.Model):
     __tablename__ = "posts"
+    __table_args__ = (
+        # feed keyset pagination: startup_id = ? AND id < cursor ORDER BY id DESC
+        db.Index("ix_posts_startup_id_id", "startup_id", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -11,6 +15,11 @@ class Post(db.Model):
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # denormalized engagement counters (app/services/post_counters.py)
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    save_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     author_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
     startup_id = db.Column(db.Integer, db.ForeignKey("startups.id"), nullable=True, index=True)
     community_id = db.Column(db.Integer, nullable=True, index=True)  # reserved for later module
@@ -23,6 +32,10 @@ class Post(db.Model):
 
 class Comment(db.Model):
     __tablename__ = "comments"
+    __table_args__ = (
+        # comment threads: post_id = ? AND id > cursor ORDER BY id
+        db.Index("ix_comments_post_id_id", "post_id", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
@@ -19,6 +19,12 @@ class Startup(db.Model):
     owner_id = db.Column(db.Integer, db.ForeignKey("users.id"), create_constraint=False , nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # precomputed by the portfolio scoring job (app/services/portfolio_scoring_service.py)
+    p_reach_100k = db.Column(db.Float, nullable=True, index=True)
+    score_band = db.Column(db.String(20), nullable=True, index=True)
+    score_model_version = db.Column(db.String(64), nullable=True)
+    scored_at = db.Column(db.DateTime, nullable=True)
+
     owner = db.relationship(
         "User",
         back_populates="owned_startups",
@@ -27,6 +33,7 @@ class Startup(db.Model):
 
     posts = db.relationship("Post", back_populates="startup", lazy="dynamic")
     score_events = db.relationship("ScoreEvent", back_populates="startup", lazy="dynamic")
+    metrics = db.relationship("StartupMetrics", back_populates="startup", uselist=False)
 
 
 class ScoreEvent(db.Model):
@@ -39,4 +46,42 @@ class ScoreEvent(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     startup_id = db.Column(db.Integer, db.ForeignKey("startups.id"), nullable=False, index=True)
-    startup = db.relationship("Startup", back_populates="score_events")
\ No newline at end of file
+    startup = db.relationship("Startup", back_populates="score_events")
+
+class StartupMetrics(db.Model):
+    """
+    Scoring features for a startup (same columns as the 100k-reach models),
+    plus the observed outcome once known so the models can be retrained
+    from live data.
+    """
+    __tablename__ = "startup_metrics"
+
+    id = db.Column(db.Integer, primary_key=True)
+    startup_id = db.Column(db.Integer, db.ForeignKey("startups.id"), nullable=False, unique=True, index=True)
+
+    # categorical
+    industry = db.Column(db.String(120), nullable=True)
+    business_model = db.Column(db.String(40), nullable=True)
+    market_size = db.Column(db.String(40), nullable=True)
+    competition_level = db.Column(db.String(40), nullable=True)
+    customer_traction = db.Column(db.Integer, nullable=True)  # 0 / 1 / 2
+
+    # numeric
+    team_size = db.Column(db.Integer, nullable=True)
+    founder_experience_years = db.Column(db.Integer, nullable=True)
+    has_technical_cofounder = db.Column(db.Boolean, nullable=True)
+    mvp_ready = db.Column(db.Boolean, nullable=True)
+    months_since_start = db.Column(db.Integer, nullable=True)
+    monthly_growth_rate_pct = db.Column(db.Float, nullable=True)
+    initial_capital_tnd = db.Column(db.Float, nullable=True)
+    monthly_burn_tnd = db.Column(db.Float, nullable=True)
+    revenue_tnd_current_month = db.Column(db.Float, nullable=True)
+    has_investor = db.Column(db.Boolean, nullable=True)
+
+    # outcome labels (null until known)
+    reached_100k = db.Column(db.Boolean, nullable=True)
+    months_to_100k = db.Column(db.Float, nullable=True)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    startup = db.relationship("Startup", back_populates="metrics")
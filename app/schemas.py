@@ -56,10 +56,47 @@ class PostSchema(Schema):
     author_id = fields.Int()
     startup_id = fields.Int(allow_none=True)
     community_id = fields.Int(allow_none=True)
+    comment_count = fields.Int()
+    like_count = fields.Int()
+    save_count = fields.Int()
+
+class PostFeedQuerySchema(Schema):
+    limit = fields.Int(required=False, validate=validate.Range(min=1, max=100))
+    cursor = fields.Str(required=False)   # next_cursor of the previous page
+
+class PostPageSchema(Schema):
+    items = fields.List(fields.Nested(PostSchema))
+    next_cursor = fields.Str(allow_none=True)
+    limit = fields.Int()
 
 class CommentCreateSchema(Schema):
     content = fields.Str(required=True)
 
+class CommentAuthorSchema(Schema):
+    id = fields.Int()
+    username = fields.Str(allow_none=True)
+
+class CommentSchema(Schema):
+    id = fields.Int()
+    post_id = fields.Int()
+    content = fields.Str()
+    created_at = fields.DateTime()
+    author = fields.Nested(CommentAuthorSchema)
+
+class CommentThreadQuerySchema(Schema):
+    limit = fields.Int(required=False, validate=validate.Range(min=1, max=100))
+    cursor = fields.Str(required=False)   # next_cursor of the previous page
+
+class CommentPageSchema(Schema):
+    post_id = fields.Int()
+    items = fields.List(fields.Nested(CommentSchema))
+    next_cursor = fields.Str(allow_none=True)
+    limit = fields.Int()
+
+class CommentPreviewQuerySchema(Schema):
+    post_ids = fields.Str(required=True)  # ?post_ids=12,11,9
+    per_post = fields.Int(required=False, validate=validate.Range(min=1, max=10))
+
 class ReactionCreateSchema(Schema):
     type = fields.Str(required=True, validate=validate.OneOf(["LIKE", "SAVE"]))
 
@@ -8,12 +8,169 @@ seed_blp = Blueprint("seed", __name__)
 
 @seed_blp.cli.command("seed-hub")
 @click.option("--clear", is_flag=True, help="Clear hub tables before seeding")
-def seed_hub(clear: bool):
+@click.option("--dry-run", is_flag=True, help="Only report what would be inserted")
+def seed_hub(clear: bool, dry_run: bool):
     """
     Seed mock hub data (banks, loan rates, legal resources).
     Usage:
-      flask --app run.py seed-hub
-      flask --app run.py seed-hub --clear
+      flask --app run.py seed seed-hub
+      flask --app run.py seed seed-hub --clear
+      flask --app run.py seed seed-hub --dry-run
     """
-    result = seed_hub_data(clear_first=clear)
-    click.echo(f"Seed completed: {result}")
+    result = seed_hub_data(clear_first=clear, dry_run=dry_run)
+
+    label = "Dry run (nothing written)" if dry_run else "Seed completed"
+    click.echo(f"{label}:")
+    if result["cleared"]:
+        click.echo(f"  cleared: {result['cleared']}")
+    for table in ("banks", "loan_rates", "legal_resources"):
+        new = result[table]["new"]
+        click.echo(f"  {table}: {result[table]['existing']} existing, {len(new)} new")
+        for item in new:
+            click.echo(f"    + {item}")
+    click.echo("  timings (ms): " + ", ".join(f"{k}={v}" for k, v in result["timings_ms"].items()))
+
+
+@seed_blp.cli.command("train-models")
+@click.option("--source", type=click.Choice(["csv", "db"]), default="csv", show_default=True,
+              help="Train from the seed CSV or from labelled rows in startup_metrics")
+@click.option("--csv", "csv_path", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="CSV to train from (default: app/seed/data/tunistartups_plausible_200.csv)")
+@click.option("--chunk-size", type=int, default=5000, show_default=True, help="Rows per DB chunk (--source db)")
+@click.option("--n-jobs", type=int, default=-1, show_default=True, help="Cores to use (-1 = all)")
+@click.option("--search", is_flag=True, help="Cross-validated hyperparameter search in a process pool")
+@click.option("--cv", type=int, default=5, show_default=True, help="Folds for --search")
+@click.option("--version", "version", default=None, help="Version name (default: UTC timestamp)")
+@click.option("--no-activate", is_flag=True, help="Only write models/versions/<version>, keep the active models")
+def train_models_cmd(source, csv_path, chunk_size, n_jobs, search, cv, version, no_activate):
+    """
+    Train the 100k-reach classifier and months regressor.
+    Usage:
+      flask --app run.py seed train-models
+      flask --app run.py seed train-models --source db --search --n-jobs 8
+    """
+    from flask import current_app
+    from ..ml.train_models import load_csv_frame, load_db_frame, save_artifacts, train
+
+    df = load_csv_frame(csv_path) if source == "csv" else load_db_frame(chunk_size)
+    click.echo(f"Loaded {len(df)} rows from {source}.")
+
+    clf, reg, metrics = train(df, n_jobs=n_jobs, search=search, cv=cv)
+    version, metrics = save_artifacts(
+        clf, reg, dict(metrics, source=source),
+        current_app.config["MODEL_DIR"], version=version, activate=not no_activate,
+    )
+
+    click.echo(f"AUC (reach 100k classifier): {metrics['auc']:.3f}")
+    click.echo(f"MAE (months to 100k regressor): {metrics['mae']:.2f}")
+    click.echo(f"Saved model version {version}{'' if no_activate else ' (active)'} in {metrics['train_seconds']}s")
+
+
+@seed_blp.cli.command("score-portfolio")
+@click.option("--chunk-size", type=int, default=1000, show_default=True, help="Startups per batch")
+@click.option("--version", "version", default=None, help="Resident model version (default: active)")
+def score_portfolio_cmd(chunk_size, version):
+    """
+    Score every startup with stored metrics and persist the results.
+    Usage:
+      flask --app run.py seed score-portfolio
+    """
+    from ..services.portfolio_scoring_service import score_portfolio
+
+    stats = score_portfolio(
+        chunk_size=chunk_size,
+        version=version,
+        progress=lambda s: click.echo(f"  scored {s['scored']} / processed {s['processed']}"),
+    )
+    click.echo(f"Portfolio scoring completed: {stats}")
+
+
+@seed_blp.cli.command("fx-backfill")
+@click.option("--from", "date_from", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="First day to fetch (default: the day after the newest snapshot, or 30 days ago)")
+@click.option("--to", "date_to", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Last day to fetch (default: today)")
+def fx_backfill_cmd(date_from, date_to):
+    """
+    Fetch end-of-day FX tables for days missing from fx_snapshots. Run it
+    daily so days without FX reads still get a snapshot.
+    Usage:
+      flask --app run.py seed fx-backfill [--from 2026-01-01]
+    """
+    from datetime import datetime, timedelta
+
+    from ..services.fx_history import backfill, latest_snapshot_day
+
+    end = date_to.date() if date_to else datetime.utcnow().date()
+    if date_from:
+        start = date_from.date()
+    else:
+        latest = latest_snapshot_day()
+        start = latest + timedelta(days=1) if latest else end - timedelta(days=30)
+    fetched = backfill(start, end)
+    click.echo(f"FX backfill completed: {fetched} day(s) fetched")
+
+
+@seed_blp.cli.command("load-data")
+@click.option("--users", type=int, default=10000, show_default=True)
+@click.option("--startups", type=int, default=None, help="Default: users / 8")
+@click.option("--posts", type=int, default=None, help="Default: users * 2")
+@click.option("--comments-per-post", type=int, default=None, help="Mean, default 3")
+@click.option("--reactions-per-post", type=int, default=None, help="Mean, default 4")
+@click.option("--tasks-per-startup", type=int, default=None, help="Default 10")
+@click.option("--notifications-per-user", type=int, default=None, help="Default 5")
+@click.option("--contracts", type=int, default=None, help="Default: users / 4")
+@click.option("--seed", "seed", type=int, default=42, show_default=True)
+@click.option("--anchor-date", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Newest generated timestamp (default: 2026-01-01, fixed so runs are comparable)")
+@click.option("--batch-size", type=int, default=5000, show_default=True, help="Rows per multi-row INSERT")
+def load_data_cmd(users, startups, posts, comments_per_post, reactions_per_post,
+                  tasks_per_startup, notifications_per_user, contracts, seed, anchor_date, batch_size):
+    """
+    Generate a large synthetic dataset for benchmarks (use a dedicated database).
+    Usage:
+      flask --app run.py seed load-data --users 200000
+    """
+    from .load_data import DEFAULT_ANCHOR, LOAD_PASSWORD, generate_load_data, plan_counts
+
+    try:
+        counts = plan_counts(
+            users,
+            startups=startups,
+            posts=posts,
+            comments_per_post=comments_per_post,
+            reactions_per_post=reactions_per_post,
+            tasks_per_startup=tasks_per_startup,
+            notifications_per_user=notifications_per_user,
+            contracts=contracts,
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    click.echo(f"Generating: {counts}")
+    report = generate_load_data(
+        counts,
+        seed=seed,
+        batch_size=batch_size,
+        anchor=anchor_date or DEFAULT_ANCHOR,
+        progress=lambda name, r: click.echo(f"  {name}: {r['rows'] if r['rows'] is not None else '-'} rows in {r['seconds']}s"),
+    )
+    total = sum(r["seconds"] for r in report.values())
+    click.echo(f"Load data completed in {total:.1f}s (users load_<id>, password '{LOAD_PASSWORD}')")
+
+
+@seed_blp.cli.command("reconcile-post-counters")
+@click.option("--dry-run", is_flag=True, help="Only report drifted posts")
+def reconcile_post_counters_cmd(dry_run):
+    """
+    Recompute posts.comment_count / like_count / save_count from comments and reactions.
+    Usage:
+      flask --app run.py seed reconcile-post-counters [--dry-run]
+    """
+    from ..services.post_counters import reconcile_post_counters
+
+    report = reconcile_post_counters(dry_run=dry_run)
+    click.echo(f"Checked {report['posts']} posts in {report['seconds']}s: {report['drifted']} drifted"
+               f"{' (not fixed, dry run)' if dry_run and report['drifted'] else ''}")
+    for row in report["examples"]:
+        click.echo(f"  post {row['id']}: comments={row['comment_count']} likes={row['like_count']} saves={row['save_count']}")
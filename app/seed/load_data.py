@@ -0,0 +1,390 @@
+"""
+Synthetic load data for benchmarks.
+
+Generates users, startups (+ scoring metrics), posts, comments, reactions,
+tasks, notifications, contracts and signatures at any scale, deterministic
+for a given seed and anchor date. Rows are streamed in batches and written with multi-row
+INSERTs; primary keys are assigned up front (continuing after the current
+max id of each table), so foreign keys never need a round-trip.
+
+Every generated user is named load_<id> and has the password LOAD_PASSWORD,
+so load tests can log in as any of them. Use a dedicated database.
+"""
+import csv
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from passlib.hash import bcrypt
+
+from app.extensions import db
+from app.models import (
+    Comment,
+    Contract,
+    Notification,
+    Post,
+    Reaction,
+    Signature,
+    Startup,
+    StartupMetrics,
+    Task,
+    User,
+)
+from app.services.post_counters import reconcile_post_counters
+
+LOAD_PASSWORD = "loadtest-pass"
+USERNAME_PREFIX = "load_"
+
+STAGES = ["Idea", "MVP", "Seed", "Series A", "Growth"]
+POST_TYPES = ["UPDATE", "QUESTION", "ANNOUNCEMENT", "HIRING", None]
+TEMPLATE_TYPES = ["NDA", "PARTNERSHIP", "EMPLOYMENT", "SERVICE"]
+WORDS = (
+    "startup product market growth team funding pitch customer revenue launch "
+    "tunis sfax sousse investor mentor prototype design data cloud mobile "
+    "agritech fintech health education energy logistics platform feedback"
+).split()
+
+# span of created_at values, oldest first, ending at the anchor date
+HISTORY_DAYS = 730
+# fixed, so the same seed gives the same rows on every run (not the wall clock)
+DEFAULT_ANCHOR = datetime(2026, 1, 1)
+
+
+def plan_counts(users: int, **overrides) -> dict:
+    """
+    Row counts derived from the number of users; any key can be overridden.
+    """
+    counts = {
+        "users": users,
+        "startups": max(users // 8, 1),
+        "posts": users * 2,
+        "comments_per_post": 3,
+        "reactions_per_post": 4,
+        "tasks_per_startup": 10,
+        "notifications_per_user": 5,
+        "contracts": max(users // 4, 1),
+        "signatures_per_contract": 2,
+    }
+    counts.update({k: v for k, v in overrides.items() if v is not None})
+    if counts["users"] < 2 or not 1 <= counts["startups"] < counts["users"]:
+        raise ValueError("Need at least 2 users and 1 <= startups < users.")
+    return counts
+
+
+def _seed_categories() -> dict:
+    path = os.path.join(os.path.dirname(__file__), "data", "tunistartups_plausible_200.csv")
+    cols = ("industry", "business_model", "market_size", "competition_level")
+    values = {c: set() for c in cols}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            for c in cols:
+                values[c].add(row[c])
+    return {c: sorted(v) for c, v in values.items()}
+
+
+def _max_id(model) -> int:
+    return db.session.execute(db.select(db.func.max(model.id))).scalar() or 0
+
+
+def _insert(model, rows, batch_size: int) -> int:
+    n = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.session.execute(db.insert(model), batch)
+            n += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(db.insert(model), batch)
+        n += len(batch)
+    db.session.commit()
+    return n
+
+
+class _Generator:
+    def __init__(self, counts: dict, seed: int, anchor: datetime = DEFAULT_ANCHOR):
+        self.c = counts
+        self.rnd = random.Random(seed)
+        self.now = anchor.replace(microsecond=0)
+        self.start = self.now - timedelta(days=HISTORY_DAYS)
+
+        self.u0 = _max_id(User)
+        self.s0 = _max_id(Startup)
+        self.p0 = _max_id(Post)
+        self.k0 = _max_id(Contract)
+        self.password_hash = bcrypt.hash(LOAD_PASSWORD)
+        self.categories = _seed_categories()
+
+    # ids: user u0+1 is an admin, u0+2 .. u0+1+startups own startup s0+1 .. s0+startups
+    def user_ids(self):
+        return range(self.u0 + 1, self.u0 + self.c["users"] + 1)
+
+    def owner_of(self, startup_id: int) -> int:
+        return self.u0 + 1 + (startup_id - self.s0)
+
+    def is_owner(self, uid: int) -> bool:
+        return self.u0 + 2 <= uid <= self.u0 + 1 + self.c["startups"]
+
+    def startup_of(self, uid: int):
+        """
+        Membership rule shared with the SQL UPDATE in _assign_members():
+        owners belong to their startup, 40% of other users to a hashed one.
+        """
+        if self.is_owner(uid):
+            return self.s0 + (uid - self.u0 - 1)
+        if uid > self.u0 + 1 + self.c["startups"] and uid % 5 < 2:
+            return self.s0 + 1 + (uid * 7919) % self.c["startups"]
+        return None
+
+    def random_user(self) -> int:
+        return self.rnd.randint(self.u0 + 1, self.u0 + self.c["users"])
+
+    def created_at(self, i: int, n: int) -> datetime:
+        # increasing with the id, with some jitter
+        frac = (i + self.rnd.random()) / max(n, 1)
+        return self.start + timedelta(seconds=int(frac * HISTORY_DAYS * 86400))
+
+    def text(self, words: int) -> str:
+        return " ".join(self.rnd.choice(WORDS) for _ in range(words))
+
+    # -------------------------
+    # Tables
+    # -------------------------
+    def users(self):
+        n = self.c["users"]
+        for i, uid in enumerate(self.user_ids()):
+            if uid == self.u0 + 1:
+                role = "ADMIN"
+            elif self.is_owner(uid):
+                role = "STARTUPER"
+            else:
+                role = self.rnd.choices(["STUDENT", "STARTUPER", "ANGEL"], weights=[6, 3, 1])[0]
+            yield {
+                "id": uid,
+                "username": f"{USERNAME_PREFIX}{uid}",
+                "email": f"{USERNAME_PREFIX}{uid}@example.test",
+                "password_hash": self.password_hash,
+                "role": role,
+                "location": self.rnd.choice(["Tunis", "Sfax", "Sousse", "Bizerte", "Nabeul", None]),
+                "field": self.rnd.choice(["Data Analytics", "Marketing", "Software", "Finance", None]),
+                "skills": self.rnd.choice(["Python, SQL", "Sales", "React, Node", "Design", None]),
+                "startup_id": None,
+                "created_at": self.created_at(i, n),
+            }
+
+    def startups(self):
+        n = self.c["startups"]
+        for i in range(n):
+            sid = self.s0 + 1 + i
+            yield {
+                "id": sid,
+                "name": f"Load Startup {sid}",
+                "industry": self.rnd.choice(self.categories["industry"]),
+                "stage": self.rnd.choice(STAGES),
+                "pitch": self.text(25),
+                "score_total": self.rnd.randint(0, 500),
+                "join_code": f"LD{sid:010d}",
+                "owner_id": self.owner_of(sid),
+                "created_at": self.created_at(i, n),
+            }
+
+    def metrics(self):
+        r = self.rnd
+        for sid in range(self.s0 + 1, self.s0 + self.c["startups"] + 1):
+            reached = r.random() < 0.35
+            yield {
+                "startup_id": sid,
+                "industry": r.choice(self.categories["industry"]),
+                "business_model": r.choice(self.categories["business_model"]),
+                "market_size": r.choice(self.categories["market_size"]),
+                "competition_level": r.choice(self.categories["competition_level"]),
+                "customer_traction": r.randint(0, 2),
+                "team_size": r.randint(1, 12),
+                "founder_experience_years": r.randint(0, 12),
+                "has_technical_cofounder": r.random() < 0.6,
+                "mvp_ready": r.random() < 0.5,
+                "months_since_start": r.randint(1, 60),
+                "monthly_growth_rate_pct": round(r.uniform(-15, 40), 2),
+                "initial_capital_tnd": float(r.randint(0, 200000)),
+                "monthly_burn_tnd": float(r.randint(1000, 22000)),
+                "revenue_tnd_current_month": float(r.randint(0, 35000)),
+                "has_investor": r.random() < 0.3,
+                "reached_100k": reached if r.random() < 0.5 else None,
+                "months_to_100k": round(r.uniform(3, 48), 1) if reached else None,
+                "updated_at": self.now,
+            }
+
+    def posts(self):
+        n = self.c["posts"]
+        for i in range(n):
+            author = self.random_user()
+            startup_id = self.startup_of(author)
+            yield {
+                "id": self.p0 + 1 + i,
+                "title": self.text(5).capitalize(),
+                "content": self.text(40),
+                "post_type": self.rnd.choice(POST_TYPES),
+                "author_id": author,
+                # 30% of members' posts go to their startup workspace, the rest are public
+                "startup_id": startup_id if startup_id and self.rnd.random() < 0.3 else None,
+                "created_at": self.created_at(i, n),
+            }
+
+    def _post_ids(self):
+        return range(self.p0 + 1, self.p0 + self.c["posts"] + 1)
+
+    def _per_post(self, mean: int) -> int:
+        # skewed: most posts get a few, some get many
+        return min(int(self.rnd.expovariate(1 / mean)), mean * 20) if mean else 0
+
+    def comments(self):
+        n = self.c["posts"]
+        for i, pid in enumerate(self._post_ids()):
+            base = self.created_at(i, n)
+            for j in range(self._per_post(self.c["comments_per_post"])):
+                yield {
+                    "post_id": pid,
+                    "author_id": self.random_user(),
+                    "content": self.text(12),
+                    "created_at": base + timedelta(minutes=5 * (j + 1)),
+                }
+
+    def reactions(self):
+        n = self.c["posts"]
+        for i, pid in enumerate(self._post_ids()):
+            base = self.created_at(i, n)
+            seen = set()
+            for j in range(self._per_post(self.c["reactions_per_post"])):
+                key = (self.random_user(), "LIKE" if self.rnd.random() < 0.8 else "SAVE")
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield {
+                    "post_id": pid,
+                    "user_id": key[0],
+                    "type": key[1],
+                    "created_at": base + timedelta(minutes=3 * (j + 1)),
+                }
+
+    def tasks(self):
+        n = self.c["startups"] * self.c["tasks_per_startup"]
+        i = 0
+        for sid in range(self.s0 + 1, self.s0 + self.c["startups"] + 1):
+            owner = self.owner_of(sid)
+            for _ in range(self.c["tasks_per_startup"]):
+                created = self.created_at(i, n)
+                i += 1
+                yield {
+                    "title": self.text(4).capitalize(),
+                    "description": self.text(15),
+                    "status": self.rnd.choice(["TODO", "IN_PROGRESS", "DONE"]),
+                    "priority": self.rnd.choice(["LOW", "MEDIUM", "HIGH"]),
+                    "due_date": (created + timedelta(days=self.rnd.randint(1, 60))).date(),
+                    "startup_id": sid,
+                    "created_by_id": owner,
+                    "assigned_to_id": owner if self.rnd.random() < 0.5 else None,
+                    "created_at": created,
+                }
+
+    def notifications(self):
+        n = self.c["users"] * self.c["notifications_per_user"]
+        for i in range(n):
+            kind = self.rnd.choice(["COMMENT", "REACTION", "TASK_ASSIGNED"])
+            yield {
+                "user_id": self.random_user(),
+                "message": {"COMMENT": "New comment on your post",
+                            "REACTION": "New reaction: LIKE",
+                            "TASK_ASSIGNED": "A task was assigned to you"}[kind],
+                "kind": kind,
+                "related_post_id": self.rnd.choice(self._post_ids()) if kind != "TASK_ASSIGNED" and self.c["posts"] else None,
+                "is_read": self.rnd.random() < 0.6,
+                "created_at": self.created_at(i, n),
+            }
+
+    def contracts(self):
+        n = self.c["contracts"]
+        for i in range(n):
+            yield {
+                "id": self.k0 + 1 + i,
+                "created_by_id": self.random_user(),
+                "title": f"{self.rnd.choice(TEMPLATE_TYPES).title()} agreement {self.k0 + 1 + i}",
+                "template_type": self.rnd.choice(TEMPLATE_TYPES),
+                "content": self.text(120),
+                "status": self.rnd.choice(["DRAFT", "SENT", "SIGNED", "CANCELLED"]),
+                "created_at": self.created_at(i, n),
+            }
+
+    def signatures(self):
+        n = self.c["contracts"]
+        for i, cid in enumerate(range(self.k0 + 1, self.k0 + n + 1)):
+            created = self.created_at(i, n)
+            users = set()
+            while len(users) < min(self.c["signatures_per_contract"], self.c["users"]):
+                users.add(self.random_user())
+            for uid in sorted(users):
+                status = self.rnd.choice(["PENDING", "SIGNED", "REJECTED"])
+                yield {
+                    "contract_id": cid,
+                    "user_id": uid,
+                    "status": status,
+                    "signed_at": created + timedelta(days=1) if status == "SIGNED" else None,
+                    "created_at": created,
+                }
+
+
+def _assign_members(gen: _Generator):
+    """
+    Set users.startup_id with two set-based UPDATEs (same rule as
+    _Generator.startup_of()), after the startups exist.
+    """
+    owners_lo, owners_hi = gen.u0 + 2, gen.u0 + 1 + gen.c["startups"]
+    db.session.execute(
+        db.update(User)
+        .where(User.id.between(owners_lo, owners_hi))
+        .values(startup_id=User.id + (gen.s0 - gen.u0 - 1))
+    )
+    db.session.execute(
+        db.update(User)
+        .where(User.id > owners_hi, User.id <= gen.u0 + gen.c["users"], User.id % 5 < 2)
+        .values(startup_id=gen.s0 + 1 + (User.id * 7919) % gen.c["startups"])
+    )
+    db.session.commit()
+
+
+def generate_load_data(counts: dict, seed: int = 42, batch_size: int = 5000, progress=None,
+                       anchor: datetime = DEFAULT_ANCHOR) -> dict:
+    """
+    Insert one full synthetic dataset. Returns {table: {"rows": n, "seconds": s}}.
+    Timestamps and due dates are placed relative to `anchor`.
+    Must run inside an app context.
+    """
+    gen = _Generator(counts, seed, anchor)
+    report = {}
+
+    steps = [
+        ("users", User, gen.users),
+        ("startups", Startup, gen.startups),
+        ("startup_metrics", StartupMetrics, gen.metrics),
+        ("memberships", None, lambda: _assign_members(gen)),
+        ("posts", Post, gen.posts),
+        ("comments", Comment, gen.comments),
+        ("reactions", Reaction, gen.reactions),
+        ("post_counters", None, reconcile_post_counters),
+        ("tasks", Task, gen.tasks),
+        ("notifications", Notification, gen.notifications),
+        ("contracts", Contract, gen.contracts),
+        ("signatures", Signature, gen.signatures),
+    ]
+    for name, model, rows in steps:
+        t0 = time.perf_counter()
+        if model is None:
+            rows()
+            n = None
+        else:
+            n = _insert(model, rows(), batch_size)
+        report[name] = {"rows": n, "seconds": round(time.perf_counter() - t0, 2)}
+        if progress:
+            progress(name, report[name])
+    return report
@@ -1,7 +1,8 @@
 import json
 import os
+import re
+import time
 from datetime import date
-from flask import current_app
 
 from app.extensions import db
 from app.models.hub import Bank, LoanRate, LegalResource
@@ -15,92 +16,181 @@ def _parse_date(s):
     return date(int(y), int(m), int(d))
 
 
-def seed_hub_data():
-    """
-    Idempotent seeding:
-    - banks are created if missing
-    - loan rates are inserted if the (bank_id, product_name, rate_value, valid_from, valid_to) combo is missing
-    - legal resources are inserted if title missing
-    """
-    base_dir = os.path.join(os.path.dirname(__file__), "data")
+def _load_json(base_dir, filename):
+    with open(os.path.join(base_dir, filename), "r", encoding="utf-8") as f:
+        return json.load(f)
 
-    banks_path = os.path.join(base_dir, "banks.json")
-    rates_path = os.path.join(base_dir, "loan_rates.json")
-    legal_path = os.path.join(base_dir, "legal_resources.json")
 
-    with open(banks_path, "r", encoding="utf-8") as f:
-        banks_data = json.load(f)
+def _bank_name(b):
+    return (b.get("name") or b.get("bank_name") or "").strip()
 
-    with open(rates_path, "r", encoding="utf-8") as f:
-        rates_data = json.load(f)
 
-    with open(legal_path, "r", encoding="utf-8") as f:
-        legal_data = json.load(f)
-
-    # ---- Banks
-    name_to_bank = {}
-    for b in banks_data:
-        name = b["name"].strip()
-        bank = Bank.query.filter_by(name=name).first()
-        if not bank:
-            bank = Bank(name=name)
-            db.session.add(bank)
-            db.session.flush()
-        name_to_bank[name] = bank
+def _rate_value(r):
+    """
+    rate_value, or the lower bound of a "20.1% to 23.5%" style rate_type.
+    """
+    if r.get("rate_value") is not None:
+        return float(r["rate_value"])
+    match = re.search(r"\d+(?:[.,]\d+)?", r.get("rate_type") or "")
+    if not match:
+        raise ValueError(f"No rate for loan product {r.get('product_name')!r}")
+    return float(match.group().replace(",", "."))
 
-    db.session.commit()
 
-    # ---- Loan Rates
+def _normalize_rates(rates_data, bank_names_by_id):
+    rows = []
     for r in rates_data:
-        bank_name = r["bank_name"].strip()
-        bank = name_to_bank.get(bank_name) or Bank.query.filter_by(name=bank_name).first()
-        if not bank:
-            bank = Bank(name=bank_name)
-            db.session.add(bank)
-            db.session.flush()
-
-        valid_from = _parse_date(r.get("valid_from"))
-        valid_to = _parse_date(r.get("valid_to"))
-
-        exists = (
-            LoanRate.query.filter_by(
-                bank_id=bank.id,
-                product_name=r["product_name"].strip(),
-                rate_value=float(r["rate_value"]),
-                valid_from=valid_from,
-                valid_to=valid_to,
-            ).first()
-        )
-
-        if not exists:
-            db.session.add(
-                LoanRate(
-                    bank_id=bank.id,
-                    product_name=r["product_name"].strip(),
-                    rate_value=float(r["rate_value"]),
-                    valid_from=valid_from,
-                    valid_to=valid_to,
-                    source_note=r.get("source_note"),
-                )
-            )
+        bank_name = (r.get("bank_name") or bank_names_by_id.get(r.get("bank_id")) or "").strip()
+        if not bank_name:
+            raise ValueError(f"Unknown bank for loan product {r.get('product_name')!r}")
+        rows.append({
+            "bank_name": bank_name,
+            "product_name": r["product_name"].strip(),
+            "rate_value": _rate_value(r),
+            "valid_from": _parse_date(r.get("valid_from")),
+            "valid_to": _parse_date(r.get("valid_to")),
+            "source_note": r.get("source_note") or r.get("url"),
+        })
+    return rows
+
+
+def _rate_key(bank_id, product_name, rate_value, valid_from, valid_to):
+    # rounded so FLOAT columns compare equal to the values in the seed file
+    return (bank_id, product_name, round(float(rate_value), 6), valid_from, valid_to)
+
+
+def seed_hub_data(clear_first: bool = False, dry_run: bool = False) -> dict:
+    """
+    Idempotent, set-based seeding:
+    - one query per table loads the existing natural keys
+      (bank name; bank_id+product_name+rate_value+valid_from+valid_to; legal title)
+    - the diff against the seed files is computed in memory
+    - missing rows are inserted with multi-row INSERTs, all in one transaction
+
+    clear_first deletes the hub tables first (same transaction); dry_run only
+    reports what would be inserted. Returns counts and timings (ms).
+    """
+    timings = {}
+    started = time.perf_counter()
+    mark = started
 
-    db.session.commit()
-
-    # ---- Legal Resources
-    for item in legal_data:
-        title = item["title"].strip()
-        exists = LegalResource.query.filter_by(title=title).first()
-        if not exists:
-            db.session.add(
-                LegalResource(
-                    title=title,
-                    category=item.get("category"),
-                    summary=item.get("summary"),
-                    last_updated=_parse_date(item.get("last_updated")),
-                )
-            )
+    def _lap(name):
+        nonlocal mark
+        now = time.perf_counter()
+        timings[name] = round((now - mark) * 1000, 2)
+        mark = now
 
-    db.session.commit()
+    base_dir = os.path.join(os.path.dirname(__file__), "data")
+    banks_data = _load_json(base_dir, "banks.json")
+    rates_data = _load_json(base_dir, "loan_rates.json")
+    legal_data = _load_json(base_dir, "legal_resources.json")
+
+    bank_names_by_id = {b.get("bank_id"): _bank_name(b) for b in banks_data if b.get("bank_id")}
+    rate_rows = _normalize_rates(rates_data, bank_names_by_id)
+    bank_names = list(dict.fromkeys(
+        [_bank_name(b) for b in banks_data if _bank_name(b)] + [r["bank_name"] for r in rate_rows]
+    ))
+    _lap("load_files")
+
+    try:
+        if clear_first:
+            existing_banks, existing_rates, existing_titles = {}, set(), set()
+            cleared = {
+                "loan_rates": db.session.query(LoanRate).count(),
+                "banks": db.session.query(Bank).count(),
+                "legal_resources": db.session.query(LegalResource).count(),
+            }
+            if not dry_run:
+                db.session.execute(db.delete(LoanRate))
+                db.session.execute(db.delete(Bank))
+                db.session.execute(db.delete(LegalResource))
+        else:
+            cleared = None
+            existing_banks = dict(db.session.execute(db.select(Bank.name, Bank.id)).all())
+            existing_rates = {_rate_key(*row) for row in db.session.execute(db.select(
+                LoanRate.bank_id, LoanRate.product_name, LoanRate.rate_value,
+                LoanRate.valid_from, LoanRate.valid_to,
+            )).all()}
+            existing_titles = set(db.session.execute(db.select(LegalResource.title)).scalars())
+        _lap("load_existing")
+
+        # ---- Banks
+        new_banks = [name for name in bank_names if name not in existing_banks]
+        bank_ids = dict(existing_banks)
+        if new_banks and not dry_run:
+            db.session.execute(db.insert(Bank), [{"name": name} for name in new_banks])
+            bank_ids.update(db.session.execute(
+                db.select(Bank.name, Bank.id).where(Bank.name.in_(new_banks))
+            ).all())
+
+        # ---- Loan Rates (banks only created in a dry run have no id yet; their rates are all new)
+        new_rates = []
+        seen = set(existing_rates)
+        for row in rate_rows:
+            key = _rate_key(
+                bank_ids.get(row["bank_name"], row["bank_name"]),
+                row["product_name"], row["rate_value"], row["valid_from"], row["valid_to"],
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            new_rates.append(row)
+        if new_rates and not dry_run:
+            db.session.execute(db.insert(LoanRate), [
+                {
+                    "bank_id": bank_ids[row["bank_name"]],
+                    "product_name": row["product_name"],
+                    "rate_value": row["rate_value"],
+                    "valid_from": row["valid_from"],
+                    "valid_to": row["valid_to"],
+                    "source_note": row["source_note"],
+                }
+                for row in new_rates
+            ])
+
+        # ---- Legal Resources
+        new_legal = []
+        seen_titles = set(existing_titles)
+        for item in legal_data:
+            title = item["title"].strip()
+            if title in seen_titles:
+                continue
+            seen_titles.add(title)
+            new_legal.append({
+                "title": title,
+                "category": item.get("category"),
+                "summary": item.get("summary"),
+                "last_updated": _parse_date(item.get("last_updated")),
+            })
+        if new_legal and not dry_run:
+            db.session.execute(db.insert(LegalResource), new_legal)
+        _lap("diff_and_insert")
+
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+        _lap("commit")
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if not dry_run:
+        from app.services.hub_service import best_rates
+        best_rates.invalidate()
+
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+    return {
+        "dry_run": dry_run,
+        "cleared": cleared,
+        "banks": {"existing": len(existing_banks), "new": new_banks},
+        "loan_rates": {
+            "existing": len(existing_rates),
+            "new": [f"{r['bank_name']} / {r['product_name']} @ {r['rate_value']}" for r in new_rates],
+        },
+        "legal_resources": {"existing": len(existing_titles), "new": [item["title"] for item in new_legal]},
+        "timings_ms": timings,
+    }
 
 
 def main():
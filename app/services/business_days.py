@@ -0,0 +1,174 @@
+"""
+Business-day arithmetic on top of the holiday calendar.
+
+Each country-year is turned once into a day-kind bitmap (one uint8 per day:
+workday / weekend / holiday) plus a running count of workdays, so counting
+the workdays between two dates is two array reads per year touched, and
+moving N workdays forward or back is one searchsorted per year.
+"""
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+from .holiday_calendar import holiday_calendar
+
+WORKDAY = 0
+WEEKEND = 1
+HOLIDAY = 2
+KIND_NAMES = ("WORKDAY", "WEEKEND", "HOLIDAY")
+
+# Sat=5, Sun=6 in Python weekday()
+WEEKEND_DAYS = (5, 6)
+
+MAX_SPAN_YEARS = 20
+MAX_RANGE_DAYS = 1100
+
+
+class YearMask:
+    def __init__(self, year: int, holidays: dict):
+        first = date(year, 1, 1)
+        n = (date(year + 1, 1, 1) - first).days
+        self.year = year
+        self.start = first.toordinal()
+
+        weekday = (np.arange(n) + first.weekday()) % 7
+        kinds = np.where(np.isin(weekday, WEEKEND_DAYS), WEEKEND, WORKDAY).astype(np.uint8)
+        for d in holidays:
+            if d.year == year:
+                kinds[d.toordinal() - self.start] = HOLIDAY
+        self.kinds = kinds
+        # cum[i] = workdays strictly before day i of the year
+        self.cum = np.concatenate(([0], np.cumsum(kinds == WORKDAY)))
+
+    @property
+    def workdays(self) -> int:
+        return int(self.cum[-1])
+
+    def index(self, d: date) -> int:
+        return d.toordinal() - self.start
+
+    def day(self, i: int) -> date:
+        return date.fromordinal(self.start + int(i))
+
+
+_lock = threading.Lock()
+_masks = {}
+
+
+def year_mask(country: str, year: int) -> YearMask:
+    """
+    Bitmap for a country-year, rebuilt only when the calendar reloads the year.
+    """
+    holidays = holiday_calendar.year(country, year)
+    key = (country, year)
+    cached = _masks.get(key)
+    if cached is not None and cached[0] is holidays:
+        return cached[1]
+    mask = YearMask(year, holidays)
+    with _lock:
+        _masks[key] = (holidays, mask)
+    return mask
+
+
+def _country(country):
+    return (country or holiday_calendar.default_country).upper()
+
+
+def _check_span(first_year: int, last_year: int):
+    if last_year - first_year > MAX_SPAN_YEARS:
+        raise ValueError(f"Date span too large (max {MAX_SPAN_YEARS} years)")
+
+
+def business_days_between(start: date, end: date, country: str | None = None) -> int:
+    """
+    Workdays in [start, end) - start counted, end not (like numpy.busday_count).
+    When end is before start, minus the workdays in (end, start].
+    """
+    if end < start:
+        one = timedelta(days=1)
+        return -business_days_between(end + one, start + one, country)
+    country = _country(country)
+    _check_span(start.year, end.year)
+
+    total = 0
+    for year in range(start.year, end.year + 1):
+        mask = year_mask(country, year)
+        lo = mask.index(max(start, date(year, 1, 1)))
+        hi = len(mask.kinds) if end.year > year else mask.index(end)
+        total += int(mask.cum[hi] - mask.cum[lo])
+    return total
+
+
+def add_business_days(start: date, n: int, country: str | None = None) -> date:
+    """
+    The date `n` workdays after `start` (before it when n < 0). A start that
+    is not a workday is first rolled forward, so n=0 gives the next workday
+    on or after `start` (numpy.busday_offset with roll="forward").
+    """
+    country = _country(country)
+    year = start.year
+    mask = year_mask(country, year)
+    i0 = mask.index(start)
+
+    if n >= 0:
+        need = n
+        while True:
+            avail = mask.workdays - int(mask.cum[i0])
+            if need < avail:
+                target = mask.cum[i0] + need + 1
+                return mask.day(np.searchsorted(mask.cum, target) - 1)
+            need -= avail
+            year += 1
+            _check_span(start.year, year)
+            mask = year_mask(country, year)
+            i0 = 0
+
+    need = -n
+    while True:
+        avail = int(mask.cum[i0])
+        if need <= avail:
+            target = mask.cum[i0] - need + 1
+            return mask.day(np.searchsorted(mask.cum, target) - 1)
+        need -= avail
+        year -= 1
+        _check_span(year, start.year)
+        mask = year_mask(country, year)
+        i0 = len(mask.kinds)
+
+
+def classify_range(start: date, end: date, country: str | None = None) -> dict:
+    """
+    Day kind of every date in [start, end] (inclusive), plus holiday names
+    and per-kind counts.
+    """
+    if end < start:
+        raise ValueError("'from' must be on or before 'to'")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"Range too large (max {MAX_RANGE_DAYS} days)")
+    country = _country(country)
+
+    parts = []
+    for year in range(start.year, end.year + 1):
+        mask = year_mask(country, year)
+        lo = mask.index(max(start, date(year, 1, 1)))
+        hi = mask.index(min(end, date(year, 12, 31))) + 1
+        parts.append(mask.kinds[lo:hi])
+    kinds = np.concatenate(parts)
+
+    days = []
+    for offset, kind in enumerate(kinds.tolist()):
+        d = start + timedelta(days=offset)
+        item = {"date": d.isoformat(), "type": KIND_NAMES[kind]}
+        if kind == HOLIDAY:
+            item["holidays"] = [name for name in holiday_calendar.holidays_on(d, country) if name]
+        days.append(item)
+
+    counts = np.bincount(kinds, minlength=len(KIND_NAMES))
+    return {
+        "country": country,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "counts": {name: int(c) for name, c in zip(KIND_NAMES, counts)},
+        "days": days,
+    }
@@ -0,0 +1,94 @@
+"""
+Reading comment threads.
+
+- comment_page(): one post's comments, oldest first, keyset-paginated on
+  ix_comments_post_id_id ((post_id, id)): `post_id = ? AND id > cursor
+  ORDER BY id LIMIT n`.
+- comment_previews(): the latest comments of many posts at once (a feed
+  page), one query: a UNION ALL of per-post `ORDER BY id DESC LIMIT k`
+  index scans (no window functions, so it runs on MySQL 5.7 too).
+
+Authors of a page are resolved with a single `users.id IN (...)` query.
+"""
+from ..extensions import db
+from ..models.post import Comment, Post
+from ..models.user import User
+from .feed_service import decode_cursor, encode_cursor
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+CURSOR_PREFIX = "c"
+
+
+def _authors(comments) -> dict:
+    ids = {c.author_id for c in comments}
+    if not ids:
+        return {}
+    rows = db.session.execute(db.select(User.id, User.username).where(User.id.in_(ids))).all()
+    return {uid: {"id": uid, "username": username} for uid, username in rows}
+
+
+def _comment_dict(c, authors: dict) -> dict:
+    return {
+        "id": c.id,
+        "post_id": c.post_id,
+        "content": c.content,
+        "created_at": c.created_at,
+        "author": authors.get(c.author_id, {"id": c.author_id, "username": None}),
+    }
+
+
+def comment_page(post_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> dict:
+    """
+    { "post_id", "items": [...], "next_cursor": str | None, "limit" }
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    after_id = decode_cursor(cursor, CURSOR_PREFIX) if cursor else None
+
+    q = db.select(Comment).where(Comment.post_id == post_id)
+    if after_id is not None:
+        q = q.where(Comment.id > after_id)
+    rows = db.session.execute(q.order_by(Comment.id.asc()).limit(limit + 1)).scalars().all()
+
+    items = rows[:limit]
+    authors = _authors(items)
+    return {
+        "post_id": post_id,
+        "items": [_comment_dict(c, authors) for c in items],
+        "next_cursor": encode_cursor(items[-1].id, CURSOR_PREFIX) if len(rows) > limit else None,
+        "limit": limit,
+    }
+
+
+def comment_previews(post_ids: list, per_post: int = 3) -> dict:
+    """
+    { post_id: { "count": total comments, "items": latest per_post comments, oldest first } }
+    for the given (already access-checked) posts.
+    """
+    if not post_ids:
+        return {}
+
+    counts = dict(db.session.execute(
+        db.select(Post.id, Post.comment_count).where(Post.id.in_(post_ids))
+    ).all())
+
+    latest = db.union_all(*[
+        db.select(Comment.id)
+        .where(Comment.post_id == pid)
+        .order_by(Comment.id.desc())
+        .limit(per_post)
+        .subquery()
+        .select()
+        for pid in post_ids
+    ]).subquery()
+    comments = db.session.execute(
+        db.select(Comment)
+        .join(latest, latest.c.id == Comment.id)
+        .order_by(Comment.post_id, Comment.id)
+    ).scalars().all()
+
+    authors = _authors(comments)
+    out = {pid: {"count": counts[pid], "items": []} for pid in post_ids if pid in counts}
+    for c in comments:
+        out[c.post_id]["items"].append(_comment_dict(c, authors))
+    return out
@@ -0,0 +1,88 @@
+"""
+Post feed with keyset (cursor) pagination.
+
+A user sees the public posts (startup_id IS NULL) plus their own startup's
+workspace posts, newest first. Each visibility branch is one range scan of
+ix_posts_startup_id_id ((startup_id, id)): `startup_id = ? AND id < cursor
+ORDER BY id DESC LIMIT n`, and the two sorted branches are merged in
+Python. The cost of a page depends on the page size, not on how deep the
+cursor is or how many posts the table holds.
+
+Branches are answered from the precomputed timelines (services/timeline.py)
+when they cover the page, so a typical page is a single `id IN (...)`
+query to hydrate the posts.
+
+The cursor is opaque to clients: the id of the last post of the previous
+page, urlsafe-base64 encoded.
+"""
+import base64
+import binascii
+import heapq
+
+from ..extensions import db
+from ..models.post import Post
+from .timeline import timelines
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(last_id: int, prefix: str = "p") -> str:
+    return base64.urlsafe_b64encode(f"{prefix}:{last_id}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, prefix: str = "p") -> int:
+    """
+    prefix keeps cursors of different lists apart ("p" posts, "c" comments).
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        kind, last_id = raw.split(":", 1)
+        if kind != prefix or not last_id.isdigit():
+            raise ValueError
+        return int(last_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError("Invalid cursor.")
+
+
+def visible_startup_ids(startup_id: int | None) -> list:
+    """
+    Workspaces whose posts a user sees: None (public) plus their own startup.
+    """
+    return [None, startup_id] if startup_id else [None]
+
+
+def _branch_ids(startup_id: int | None, before_id: int | None, limit: int) -> list:
+    if timelines.enabled:
+        ids = timelines.page_ids(startup_id, before_id, limit)
+        if ids is not None:
+            return ids
+
+    # only touches ix_posts_startup_id_id
+    q = db.select(Post.id)
+    q = q.where(Post.startup_id.is_(None)) if startup_id is None else q.where(Post.startup_id == startup_id)
+    if before_id is not None:
+        q = q.where(Post.id < before_id)
+    return list(db.session.execute(q.order_by(Post.id.desc()).limit(limit)).scalars())
+
+
+def feed_page(startup_id: int | None, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None) -> dict:
+    """
+    { "items": [Post, ...], "next_cursor": str | None, "limit": limit }
+    next_cursor is None on the last page.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    before_id = decode_cursor(cursor) if cursor else None
+
+    # one extra id tells whether another page exists
+    branches = [_branch_ids(sid, before_id, limit + 1) for sid in visible_startup_ids(startup_id)]
+    merged = list(heapq.merge(*branches, reverse=True))
+
+    page_ids = merged[:limit]
+    by_id = {}
+    if page_ids:
+        by_id = {p.id: p for p in db.session.execute(db.select(Post).where(Post.id.in_(page_ids))).scalars()}
+    items = [by_id[i] for i in page_ids if i in by_id]
+
+    next_cursor = encode_cursor(page_ids[-1]) if len(merged) > limit else None
+    return {"items": items, "next_cursor": next_cursor, "limit": limit}
@@ -0,0 +1,278 @@
+"""
+Single client for every FX provider call.
+
+- one pooled requests.Session (keep-alive) shared by all callers
+- retries with exponential backoff on connection errors and 429/5xx
+- a circuit breaker: after `failure_threshold` consecutive failures calls
+  fail fast for `reset_after` seconds, then one trial call is let through
+- FX_PROVIDER=stub swaps OpenExchangeRates for a local deterministic table,
+  so the FX stack can be tested and benchmarked without network access
+"""
+import os
+import re
+import threading
+import time
+from datetime import date, datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+OXR_BASE_URL = "https://openexchangerates.org/api"
+
+_APP_ID_RE = re.compile(r"(app_id=)[^&\s]+")
+
+
+def redact(text: str, secret: str | None = None) -> str:
+    """
+    Strip the OXR key from URLs and messages before they are logged or returned.
+    """
+    text = _APP_ID_RE.sub(r"\1***", text)
+    return text.replace(secret, "***") if secret else text
+
+
+class FxClientError(Exception):
+    """
+    Provider call failed. `status` is the HTTP status a route should answer with.
+    """
+
+    def __init__(self, message: str, status: int = 502):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpen(FxClientError):
+    def __init__(self, retry_in: float):
+        super().__init__(f"FX provider circuit open, retrying in {retry_in:.0f}s", status=503)
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def before_call(self):
+        with self._lock:
+            if self.opened_at is None:
+                return
+            waited = time.monotonic() - self.opened_at
+            if waited < self.reset_after:
+                raise CircuitOpen(self.reset_after - waited)
+            # half-open: let this call through, keep the others out until it settles
+            self.opened_at = time.monotonic()
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    def reset(self):
+        self.record_success()
+
+
+class OxrProvider:
+    """
+    OpenExchangeRates. Free plan base is always USD, so base=... is never sent.
+    """
+
+    name = "oxr"
+
+    def __init__(self, app_id: str | None = None, timeout: float = 10.0, retries: int = 2,
+                 backoff: float = 0.5, pool_size: int = 10, base_url: str = OXR_BASE_URL):
+        self.app_id = app_id
+        self.timeout = timeout
+        self.base_url = base_url.rstrip("/")
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _get(self, path: str, params: dict) -> dict:
+        app_id = self.app_id or os.getenv("OXR_APP_ID")
+        if not app_id:
+            raise FxClientError("Missing OXR_APP_ID environment variable", status=500)
+
+        try:
+            # key in a header, so it never shows up in URLs (urllib3 retry logs, error messages)
+            r = self.session.get(
+                f"{self.base_url}/{path}",
+                params=params,
+                headers={"Authorization": f"Token {app_id}"},
+                timeout=self.timeout,
+            )
+            r.raise_for_status()
+            data = r.json()
+        except requests.exceptions.HTTPError as e:
+            # Often 401 here means app_id is wrong OR plan limitations
+            raise FxClientError(f"OXR HTTP error: {redact(str(e), app_id)}")
+        except requests.exceptions.RequestException as e:
+            raise FxClientError(f"OXR request failed: {redact(str(e), app_id)}")
+        except ValueError:
+            raise FxClientError("OXR returned a non-JSON response")
+
+        if "rates" not in data:
+            raise FxClientError(f"Unexpected response format: {data}")
+        return data
+
+    def latest(self, symbols: list | None = None) -> dict:
+        params = {"symbols": ",".join(sorted(set(symbols)))} if symbols else {}
+        return self._get("latest.json", params)
+
+    def historical(self, day: date, symbols: list | None = None) -> dict:
+        params = {"symbols": ",".join(sorted(set(symbols)))} if symbols else {}
+        return self._get(f"historical/{day.isoformat()}.json", params)
+
+    def close(self):
+        self.session.close()
+
+
+# USD-based rates close to the real ones, so stub responses look plausible
+STUB_USD_RATES = {
+    "USD": 1.0,
+    "TND": 3.12,
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "CHF": 0.88,
+    "CAD": 1.36,
+    "JPY": 149.5,
+    "CNY": 7.24,
+    "AED": 3.6725,
+    "SAR": 3.75,
+    "QAR": 3.64,
+    "KWD": 0.308,
+    "LYD": 4.83,
+    "DZD": 134.6,
+    "MAD": 10.05,
+    "EGP": 48.3,
+    "TRY": 32.4,
+}
+
+
+class StubProvider:
+    """
+    Local provider with a fixed USD table. `latency` (seconds) and
+    `fail` let tests and benchmarks simulate a slow or broken upstream.
+    """
+
+    name = "stub"
+
+    def __init__(self, rates: dict | None = None, latency: float = 0.0, fail: bool = False):
+        self.rates = dict(rates or STUB_USD_RATES)
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+
+    def _table(self, timestamp: int, symbols: list | None) -> dict:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail:
+            raise FxClientError("Stub FX provider set to fail")
+        rates = self.rates if not symbols else {k: v for k, v in self.rates.items() if k in symbols}
+        return {"base": "USD", "timestamp": timestamp, "rates": dict(rates)}
+
+    def latest(self, symbols: list | None = None) -> dict:
+        return self._table(int(time.time()), symbols)
+
+    def historical(self, day: date, symbols: list | None = None) -> dict:
+        midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        return self._table(int(midnight.timestamp()), symbols)
+
+    def close(self):
+        pass
+
+
+class FxClient:
+    def __init__(self, provider=None, breaker: CircuitBreaker | None = None):
+        self.provider = provider or OxrProvider()
+        self.breaker = breaker or CircuitBreaker()
+
+    def init_app(self, app):
+        name = (app.config.get("FX_PROVIDER") or "oxr").lower()
+        if name == "stub":
+            provider = StubProvider()
+        elif name == "oxr":
+            provider = OxrProvider(
+                app_id=app.config.get("OXR_APP_ID"),
+                timeout=float(app.config.get("FX_TIMEOUT", 10)),
+                retries=int(app.config.get("FX_RETRIES", 2)),
+                backoff=float(app.config.get("FX_RETRY_BACKOFF", 0.5)),
+            )
+        else:
+            raise ValueError(f"Unknown FX_PROVIDER: {name}")
+
+        self.set_provider(provider)
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(app.config.get("FX_BREAKER_THRESHOLD", 5)),
+            reset_after=float(app.config.get("FX_BREAKER_RESET", 30)),
+        )
+        app.extensions["fx_client"] = self
+
+    def set_provider(self, provider):
+        previous, self.provider = self.provider, provider
+        if previous is not None and previous is not provider:
+            previous.close()
+        self.breaker.reset()
+
+    def latest(self, symbols: list | None = None) -> dict:
+        """
+        USD-based table: {"base": "USD", "timestamp": <unix>, "rates": {...}}.
+        Raises FxClientError (CircuitOpen while the breaker is open).
+        """
+        return self._call(self.provider.latest, symbols)
+
+    def historical(self, day: date, symbols: list | None = None) -> dict:
+        """
+        End-of-day USD-based table for `day`, same shape as latest().
+        """
+        return self._call(self.provider.historical, day, symbols)
+
+    def _call(self, fn, *args) -> dict:
+        self.breaker.before_call()
+        try:
+            data = fn(*args)
+        except FxClientError:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return {
+            "base": data.get("base", "USD"),
+            "timestamp": data.get("timestamp", 0),
+            "rates": data.get("rates", {}),
+        }
+
+    def info(self) -> dict:
+        return {
+            "provider": self.provider.name,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+        }
+
+
+fx_client = FxClient()
@@ -0,0 +1,197 @@
+"""
+Historical FX rates.
+
+Every successful refresh of the in-memory store (fx_store) is persisted to
+fx_snapshots as one USD-based row per currency per day. Ranges are read with
+the (currency, rate_date) index; conversions at past dates use the last rate
+on or before each date.
+
+Refreshes only happen on reads (or with FX_BACKGROUND_REFRESH=1), so a quiet
+day would leave a gap. Schedule `flask seed fx-backfill` daily (e.g. cron at
+00:30 UTC): without --from it fetches every day since the newest snapshot.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+from ..extensions import db
+from ..models.fx import FxSnapshot
+from .fx_client import fx_client
+
+MAX_HISTORY_DAYS = 3660
+
+
+def _rate_date(timestamp) -> date:
+    if not timestamp:
+        return datetime.utcnow().date()
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc).date()
+
+
+def record_snapshot(table: dict) -> int:
+    """
+    Upsert the table's rates for its (UTC) day. Returns the number of rows
+    written. Must run inside an app context.
+    """
+    rates = {ccy.upper(): float(v) for ccy, v in (table.get("rates") or {}).items() if v}
+    if not rates:
+        return 0
+    day = _rate_date(table.get("timestamp"))
+    now = datetime.utcnow()
+
+    existing = dict(db.session.execute(
+        db.select(FxSnapshot.currency, FxSnapshot.id)
+        .where(FxSnapshot.rate_date == day, FxSnapshot.currency.in_(list(rates)))
+    ).all())
+
+    updates = []
+    inserts = []
+    for ccy, usd_rate in rates.items():
+        row = {"usd_rate": usd_rate, "source_timestamp": table.get("timestamp"), "fetched_at": now}
+        if ccy in existing:
+            updates.append({"id": existing[ccy], **row})
+        else:
+            inserts.append({"currency": ccy, "rate_date": day, **row})
+
+    if updates:
+        db.session.execute(db.update(FxSnapshot), updates)
+    if inserts:
+        db.session.execute(db.insert(FxSnapshot), inserts)
+    db.session.commit()
+    return len(updates) + len(inserts)
+
+
+def init_app(app, store):
+    """
+    Persist every table the store fetches.
+    """
+    def _persist(table):
+        with app.app_context():
+            try:
+                record_snapshot(table)
+            except Exception:
+                db.session.rollback()
+                raise
+
+    store.on_refresh(_persist)
+
+
+def latest_snapshot_day():
+    return db.session.execute(
+        db.select(db.func.max(FxSnapshot.rate_date)).where(FxSnapshot.currency == "TND")
+    ).scalar()
+
+
+def backfill(start: date, end: date) -> int:
+    """
+    Fetch and store end-of-day tables for every day in [start, end] that has
+    no snapshot yet. Returns the number of days fetched.
+    """
+    have = set(db.session.execute(
+        db.select(FxSnapshot.rate_date)
+        .where(FxSnapshot.currency == "TND", FxSnapshot.rate_date.between(start, end))
+    ).scalars())
+
+    fetched = 0
+    day = start
+    while day <= end:
+        if day not in have:
+            record_snapshot(fx_client.historical(day))
+            fetched += 1
+        day += timedelta(days=1)
+    return fetched
+
+
+def _parse_range(date_from, date_to):
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or (date_to - timedelta(days=30))
+    if date_from > date_to:
+        raise ValueError("'from' must be on or before 'to'")
+    if (date_to - date_from).days > MAX_HISTORY_DAYS:
+        raise ValueError(f"Range too large (max {MAX_HISTORY_DAYS} days)")
+    return date_from, date_to
+
+
+def _series(currency: str, date_from: date, date_to: date):
+    """
+    (day ordinals, usd rates) for a currency in [date_from, date_to], plus
+    the last row before date_from so as-of lookups at the start resolve.
+    """
+    q = db.select(FxSnapshot.rate_date, FxSnapshot.usd_rate).where(FxSnapshot.currency == currency)
+    rows = db.session.execute(
+        q.where(FxSnapshot.rate_date < date_from).order_by(FxSnapshot.rate_date.desc()).limit(1)
+    ).all()
+    rows += db.session.execute(
+        q.where(FxSnapshot.rate_date.between(date_from, date_to)).order_by(FxSnapshot.rate_date)
+    ).all()
+
+    days = np.fromiter((r[0].toordinal() for r in rows), dtype=np.int64, count=len(rows))
+    rates = np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+    return days, rates
+
+
+def history(symbol: str, date_from: date | None = None, date_to: date | None = None) -> dict:
+    """
+    TND-based daily rates (TND -> symbol) for the range, only for days where
+    both currencies were recorded.
+    """
+    symbol = symbol.strip().upper()
+    date_from, date_to = _parse_range(date_from, date_to)
+
+    rows = db.session.execute(
+        db.select(FxSnapshot.rate_date, FxSnapshot.currency, FxSnapshot.usd_rate)
+        .where(
+            FxSnapshot.currency.in_([symbol, "TND"]),
+            FxSnapshot.rate_date.between(date_from, date_to),
+        )
+        .order_by(FxSnapshot.rate_date)
+    ).all()
+
+    by_day = {}
+    for day, ccy, usd_rate in rows:
+        by_day.setdefault(day, {})[ccy] = usd_rate
+
+    points = []
+    for day, rates in by_day.items():
+        if symbol in rates and rates.get("TND"):
+            points.append({"date": day.isoformat(), "rate": round(rates[symbol] / rates["TND"], 6)})
+
+    return {
+        "base": "TND",
+        "symbol": symbol,
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "points": points,
+    }
+
+
+def convert(amounts, dates, ccy: str, to: str = "TND") -> np.ndarray:
+    """
+    Convert `amounts` in `ccy` to `to` at the rate of each matching date
+    (the last recorded rate on or before it). One query per currency, then
+    np.searchsorted over the series, so thousands of rows cost no more
+    lookups than one. Raises ValueError if a date precedes all recorded rates.
+    """
+    ccy = ccy.strip().upper()
+    to = to.strip().upper()
+    amounts = np.asarray(amounts, dtype=np.float64)
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64)
+    if amounts.shape != ordinals.shape:
+        raise ValueError("amounts and dates must have the same length")
+    if ccy == to or ordinals.size == 0:
+        return amounts.copy()
+
+    first = date.fromordinal(int(ordinals.min()))
+    last = date.fromordinal(int(ordinals.max()))
+
+    def _as_of(currency):
+        if currency == "USD":
+            return np.ones(ordinals.size)
+        days, rates = _series(currency, first, last)
+        idx = np.searchsorted(days, ordinals, side="right") - 1
+        if idx.size and idx.min() < 0:
+            missing = date.fromordinal(int(ordinals[idx < 0].min()))
+            raise ValueError(f"No {currency} rate recorded on or before {missing.isoformat()}")
+        return rates[idx]
+
+    # usd_rate is USD -> currency, so 1 ccy = (usd->to / usd->ccy) to
+    return amounts * _as_of(to) / _as_of(ccy)
@@ -1,8 +1,4 @@
-import requests
-
-
-# ✅ Put your REAL key here (no env file)
-OXR_APP_ID = "3c8796bacac444489db587810b8fc316"
+from .fx_client import FxClientError, fx_client
 
 
 class FxServiceError(Exception):
@@ -11,31 +7,12 @@ class FxServiceError(Exception):
 
 def get_latest_rates(symbols: str = "TND,EUR") -> dict:
     """
-    Fetch latest FX rates from OpenExchangeRates.
+    Fetch latest FX rates from the configured provider (see fx_client).
     Free plan base is always USD, so we never set base=...
     """
-    url = "https://openexchangerates.org/api/latest.json"
-    params = {
-        "app_id": OXR_APP_ID,
-        "symbols": symbols.replace(" ", ""),  # clean spaces
-    }
+    symbols_list = [s.strip().upper() for s in symbols.split(",") if s.strip()]
 
     try:
-        res = requests.get(url, params=params, timeout=15)
-        res.raise_for_status()
-        data = res.json()
-    except requests.exceptions.HTTPError as e:
-        # Often 401 here means app_id is wrong OR plan limitations
-        raise FxServiceError(f"OpenExchangeRates HTTP error: {e}") from e
-    except requests.exceptions.RequestException as e:
-        raise FxServiceError(f"Network error calling OpenExchangeRates: {e}") from e
-
-    # Basic validation
-    if "rates" not in data or "base" not in data:
-        raise FxServiceError(f"Unexpected response format: {data}")
-
-    return {
-        "base": data.get("base", "USD"),
-        "timestamp": data.get("timestamp", 0),
-        "rates": data.get("rates", {}),
-    }
+        return fx_client.latest(symbols_list)
+    except FxClientError as e:
+        raise FxServiceError(str(e)) from e
@@ -0,0 +1,212 @@
+import logging
+import threading
+import time
+
+from .fx_client import FxClientError, fx_client
+
+log = logging.getLogger(__name__)
+
+
+class FxUnavailable(Exception):
+    """
+    No rates in memory and the provider could not be reached.
+    `status` is the HTTP status the route should answer with.
+    """
+
+    def __init__(self, message: str, status: int = 502):
+        super().__init__(message)
+        self.status = status
+
+
+def _fetch_usd_table() -> dict:
+    """
+    Full USD-based rate table (one call for every symbol).
+    """
+    try:
+        data = fx_client.latest()
+    except FxClientError as e:
+        raise FxUnavailable(str(e), status=e.status)
+    return {"timestamp": data.get("timestamp"), "rates": data.get("rates", {})}
+
+
+def pivot_to_tnd(rates_usd: dict, symbols: list) -> dict:
+    """
+    (USD->CCY) / (USD->TND) = (TND->CCY). Unknown symbols are skipped.
+    """
+    usd_to_tnd = rates_usd.get("TND")
+    if not usd_to_tnd:
+        raise FxUnavailable("TND rate missing from OXR response")
+
+    rates_tnd = {"TND": 1.0}
+    for ccy in symbols:
+        if ccy == "TND":
+            continue
+        usd_to_ccy = rates_usd.get(ccy)
+        if usd_to_ccy is None:
+            continue
+        rates_tnd[ccy] = round(usd_to_ccy / usd_to_tnd, 6)
+    return dict(sorted(rates_tnd.items()))
+
+
+class FxRateStore:
+    """
+    In-memory USD rate table refreshed in the background.
+
+    - first request with an empty store fetches synchronously
+    - afterwards requests are served from memory; once the table is older
+      than `refresh_interval` a refresh is kicked off in the background and
+      the current (stale) table is served meanwhile
+    - if the provider is down, the last good table keeps being served
+    """
+
+    def __init__(self, fetcher=_fetch_usd_table, refresh_interval: float = 3600.0, error_backoff: float = 60.0):
+        self._fetcher = fetcher
+        self.refresh_interval = refresh_interval
+        self.error_backoff = error_backoff
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._table = None
+        self._fetched_at = None       # time.time()
+        self._fetched_mono = None     # time.monotonic()
+        self.last_error = None
+        self.last_error_at = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._listeners = []
+
+    def init_app(self, app):
+        self.refresh_interval = float(app.config.get("FX_REFRESH_INTERVAL", self.refresh_interval))
+        app.extensions["fx_store"] = self
+        if app.config.get("FX_BACKGROUND_REFRESH"):
+            # lazily, so CLI commands (db upgrade, seeds, training) never start it
+            @app.before_request
+            def _start_fx_background_refresh():
+                if self._thread is None:
+                    self.start_background_refresh()
+
+    def set_fetcher(self, fetcher):
+        with self._lock:
+            self._fetcher = fetcher
+            self._table = None
+            self._fetched_at = self._fetched_mono = None
+
+    def on_refresh(self, callback):
+        """
+        Register callback(table) fired after every successful fetch.
+        """
+        self._listeners.append(callback)
+        return callback
+
+    # -------------------------
+    # Refresh
+    # -------------------------
+    def refresh(self) -> bool:
+        """
+        Fetch a new table. Returns False (keeping the old table) on failure.
+        Concurrent callers piggy-back on the refresh already in flight.
+        """
+        if not self._refreshing.acquire(blocking=False):
+            with self._refreshing:
+                return self._table is not None
+        try:
+            table = self._fetcher()
+            with self._lock:
+                self._table = table
+                self._fetched_at = time.time()
+                self._fetched_mono = time.monotonic()
+                self.last_error = None
+        except FxUnavailable as e:
+            with self._lock:
+                self.last_error = str(e)
+                self.last_error_at = time.time()
+            if self._table is None:
+                raise
+            log.warning("FX refresh failed, serving cached rates: %s", e)
+            return False
+        finally:
+            self._refreshing.release()
+
+        for callback in list(self._listeners):
+            try:
+                callback(table)
+            except Exception:
+                log.exception("FX refresh listener failed")
+        return True
+
+    def _refresh_async(self):
+        def _run():
+            try:
+                self.refresh()
+            except FxUnavailable:
+                pass
+
+        threading.Thread(target=_run, name="fx-refresh", daemon=True).start()
+
+    def start_background_refresh(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            thread = self._thread = threading.Thread(
+                target=self._background_loop, name="fx-background-refresh", daemon=True
+            )
+        thread.start()
+
+    def _background_loop(self):
+        while True:
+            try:
+                self.refresh()
+            except FxUnavailable as e:
+                log.warning("FX background refresh failed: %s", e)
+            if self._stop.wait(self.refresh_interval):
+                return
+
+    def stop_background_refresh(self):
+        self._stop.set()
+        self._thread = None
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def age_seconds(self):
+        if self._fetched_mono is None:
+            return None
+        return time.monotonic() - self._fetched_mono
+
+    def snapshot(self):
+        """
+        Returns (table, cache_info). Raises FxUnavailable only when nothing
+        has ever been fetched and the provider is unreachable.
+        """
+        if self._table is None:
+            self.refresh()
+            if self._table is None:
+                raise FxUnavailable(self.last_error or "FX rates unavailable")
+
+        age = self.age_seconds()
+        stale = age is not None and age > self.refresh_interval
+        backing_off = self.last_error_at is not None and time.time() - self.last_error_at < self.error_backoff
+        if stale and not backing_off and not self._refreshing.locked():
+            self._refresh_async()
+
+        with self._lock:
+            table = self._table
+            info = {
+                "age_seconds": round(self.age_seconds() or 0.0, 3),
+                "fetched_at": int(self._fetched_at) if self._fetched_at else None,
+                "stale": stale,
+                "last_error": self.last_error,
+            }
+        return table, info
+
+    def latest_tnd(self, symbols: list) -> dict:
+        table, info = self.snapshot()
+        return {
+            "base": "TND",
+            "timestamp": table.get("timestamp"),
+            "rates": pivot_to_tnd(table.get("rates", {}), symbols),
+            "cache": info,
+        }
+
+
+fx_store = FxRateStore()
@@ -0,0 +1,177 @@
+"""
+Public holiday calendar.
+
+A country-year is fetched from Calendarific once, stored in holiday_years and
+kept in memory as {date: [names]}, so `is_holiday()` is a dict lookup. Loading
+the current year also prefetches the next one in the background, so the
+first request after New Year does not wait on the provider.
+"""
+import json
+import logging
+import threading
+import time
+from datetime import date
+
+import requests
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models.holiday import HolidayYear
+
+log = logging.getLogger(__name__)
+
+# seconds before a failed background prefetch is attempted again
+PREFETCH_RETRY_AFTER = 3600
+
+
+class HolidayProviderError(Exception):
+    """
+    The year is not cached and Calendarific could not be reached.
+    `status` is the HTTP status the route should answer with.
+    """
+
+    def __init__(self, message: str, status: int = 502):
+        super().__init__(message)
+        self.status = status
+
+
+_session = requests.Session()
+
+
+def fetch_calendarific(country: str, year: int, api_key: str, base_url: str) -> list:
+    """
+    All national holidays of a country-year: [{"date": "YYYY-MM-DD", "name": ...}].
+    """
+    if not api_key:
+        raise HolidayProviderError("CALENDARIFIC_API_KEY is not set in environment.", status=500)
+
+    params = {"api_key": api_key, "country": country, "year": year, "type": "national"}
+    try:
+        r = _session.get(f"{base_url}/holidays", params=params, timeout=10)
+        r.raise_for_status()
+        payload = r.json()
+    except (requests.RequestException, ValueError):
+        raise HolidayProviderError("Holiday provider error (Calendarific request failed).")
+
+    holidays = payload.get("response", {}).get("holidays", []) or []
+    out = []
+    for h in holidays:
+        iso = ((h.get("date") or {}).get("iso") or "")[:10]
+        if iso:
+            out.append({"date": iso, "name": h.get("name") or ""})
+    return out
+
+
+class HolidayCalendar:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._year_locks = {}
+        self._years = {}
+        self._prefetching = set()
+        self._prefetch_failed = {}
+        self._app = None
+        self._fetcher = None
+        self.default_country = "TN"
+        self.prefetch = True
+
+    def init_app(self, app):
+        self._app = app
+        self.default_country = app.config.get("CALENDARIFIC_COUNTRY", "TN").upper()
+        self.prefetch = bool(app.config.get("HOLIDAY_PREFETCH", True))
+        if self._fetcher is None:
+            self._fetcher = lambda country, year: fetch_calendarific(
+                country,
+                year,
+                app.config.get("CALENDARIFIC_API_KEY", ""),
+                app.config.get("CALENDARIFIC_BASE_URL", "https://calendarific.com/api/v2"),
+            )
+        app.extensions["holiday_calendar"] = self
+
+    def set_fetcher(self, fetcher):
+        """
+        fetcher(country, year) -> [{"date": "YYYY-MM-DD", "name": ...}].
+        Drops the in-memory years (rows already stored are kept).
+        """
+        with self._lock:
+            self._fetcher = fetcher
+            self._years.clear()
+
+    # -------------------------
+    # Loading
+    # -------------------------
+    def _year_lock(self, key):
+        with self._lock:
+            return self._year_locks.setdefault(key, threading.Lock())
+
+    def _load_stored(self, country: str, year: int):
+        row = HolidayYear.query.filter_by(country=country, year=year).first()
+        return json.loads(row.holidays) if row else None
+
+    def _store(self, country: str, year: int, holidays: list):
+        db.session.add(HolidayYear(country=country, year=year, holidays=json.dumps(holidays)))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # another worker stored the same year first
+            db.session.rollback()
+
+    def year(self, country: str, year: int, prefetch_next: bool = True) -> dict:
+        """
+        {date: [names]} for a country-year: memory, then database, then provider.
+        """
+        key = (country, year)
+        days = self._years.get(key)
+        if days is None:
+            with self._year_lock(key):
+                days = self._years.get(key)
+                if days is None:
+                    holidays = self._load_stored(country, year)
+                    if holidays is None:
+                        holidays = self._fetcher(country, year)
+                        self._store(country, year, holidays)
+                    days = {}
+                    for h in holidays:
+                        days.setdefault(date.fromisoformat(h["date"]), []).append(h["name"])
+                    self._years[key] = days
+
+        if prefetch_next and self.prefetch and year == date.today().year:
+            self._prefetch(country, year + 1)
+        return days
+
+    def _prefetch(self, country: str, year: int):
+        key = (country, year)
+        if key in self._years or self._app is None:
+            return
+        with self._lock:
+            failed_at = self._prefetch_failed.get(key)
+            if key in self._prefetching or (failed_at and time.monotonic() - failed_at < PREFETCH_RETRY_AFTER):
+                return
+            self._prefetching.add(key)
+
+        app = self._app
+
+        def _run():
+            try:
+                with app.app_context():
+                    self.year(country, year, prefetch_next=False)
+            except Exception:
+                self._prefetch_failed[key] = time.monotonic()
+                log.warning("Prefetching holidays for %s %s failed", country, year, exc_info=True)
+            finally:
+                with self._lock:
+                    self._prefetching.discard(key)
+
+        threading.Thread(target=_run, name=f"holiday-prefetch-{country}-{year}", daemon=True).start()
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def holidays_on(self, d: date, country: str | None = None) -> list:
+        country = (country or self.default_country).upper()
+        return self.year(country, d.year).get(d, [])
+
+    def is_holiday(self, d: date, country: str | None = None) -> bool:
+        return bool(self.holidays_on(d, country))
+
+
+holiday_calendar = HolidayCalendar()
@@ -0,0 +1,230 @@
+"""
+Loans hub data.
+
+banks.json / loan_rates.json only change when the seed data is edited, so the
+combined payload is read once, serialized once and kept as bytes with an
+ETag. Each request only stats the two files; a changed mtime/size rebuilds
+the payload.
+
+The seeded loan_rates table backs the filtered queries and the best-rate
+lookup.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date
+
+from ..extensions import db
+from ..models.hub import Bank, LoanRate
+
+HUB_FILES = ("banks.json", "loan_rates.json")
+
+
+def seed_data_dir():
+    # app/services -> app
+    return os.path.join(os.path.dirname(os.path.dirname(__file__)), "seed", "data")
+
+
+class HubDataError(Exception):
+    pass
+
+
+class LoansPayloadCache:
+    def __init__(self, data_dir: str | None = None):
+        self.data_dir = data_dir or seed_data_dir()
+        self._lock = threading.Lock()
+        self._signature = None
+        self._body = None
+        self._etag = None
+
+    def _paths(self):
+        return [os.path.join(self.data_dir, name) for name in HUB_FILES]
+
+    def _stat_signature(self):
+        sig = []
+        for path in self._paths():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                raise HubDataError(f"File not found: {path}")
+            sig.append((st.st_mtime_ns, st.st_size))
+        return tuple(sig)
+
+    def _build(self):
+        loaded = []
+        for path in self._paths():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    loaded.append(json.load(f))
+            except (OSError, ValueError) as e:
+                raise HubDataError(str(e))
+        banks, rates = loaded
+        body = json.dumps({"banks": banks, "rates": rates}, ensure_ascii=False).encode("utf-8")
+        return body, hashlib.sha256(body).hexdigest()[:32]
+
+    def get(self):
+        """
+        Returns (body_bytes, etag), rebuilding only when a file changed.
+        """
+        signature = self._stat_signature()
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._body, self._etag = self._build()
+                    self._signature = signature
+        return self._body, self._etag
+
+    def clear(self):
+        with self._lock:
+            self._signature = self._body = self._etag = None
+
+
+loans_payload = LoansPayloadCache()
+
+
+# -------------------------------------------------
+# Loan-rate queries (loan_rates table)
+# -------------------------------------------------
+LOAN_SORTS = {
+    "rate": lambda: (LoanRate.rate_value.asc(), LoanRate.id.asc()),
+    "-rate": lambda: (LoanRate.rate_value.desc(), LoanRate.id.asc()),
+    "bank": lambda: (Bank.name.asc(), LoanRate.rate_value.asc(), LoanRate.id.asc()),
+    "product": lambda: (LoanRate.product_name.asc(), LoanRate.rate_value.asc(), LoanRate.id.asc()),
+    "valid_from": lambda: (LoanRate.valid_from.desc(), LoanRate.id.asc()),
+}
+
+
+def _rate_dict(rate, bank_name):
+    return {
+        "id": rate.id,
+        "bank_id": rate.bank_id,
+        "bank_name": bank_name,
+        "product_name": rate.product_name,
+        "rate_value": rate.rate_value,
+        "valid_from": rate.valid_from.isoformat() if rate.valid_from else None,
+        "valid_to": rate.valid_to.isoformat() if rate.valid_to else None,
+        "source_note": rate.source_note,
+    }
+
+
+def product_key(product: str) -> str:
+    """
+    Products match case-insensitively and ignoring surrounding spaces
+    ("credit auto" == "Credit Auto ") in every loan-rate lookup.
+    """
+    return product.strip().casefold()
+
+
+def _product_names(product: str) -> list:
+    # stored spellings of a product, so the filter stays an IN on the indexed column
+    key = product_key(product)
+    names = db.session.execute(db.select(LoanRate.product_name).distinct()).scalars()
+    return [n for n in names if n and product_key(n) == key]
+
+
+def _valid_on(d: date):
+    return db.and_(
+        db.or_(LoanRate.valid_from.is_(None), LoanRate.valid_from <= d),
+        db.or_(LoanRate.valid_to.is_(None), LoanRate.valid_to >= d),
+    )
+
+
+def query_loan_rates(bank=None, product=None, max_rate=None, valid_on=None,
+                     sort: str = "rate", limit: int = 100, offset: int = 0) -> dict:
+    """
+    Filtered, sorted page of loan rates. `bank` is a bank name or id,
+    `product` a product name (see product_key()); both hit the composite
+    indexes.
+    """
+    if sort not in LOAN_SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(LOAN_SORTS)}")
+
+    q = db.select(LoanRate, Bank.name).join(Bank, Bank.id == LoanRate.bank_id)
+    if bank:
+        bank = str(bank)
+        # isdigit() alone accepts "²" or "٣", which int() rejects
+        q = q.where(LoanRate.bank_id == int(bank)) if bank.isascii() and bank.isdigit() else q.where(Bank.name == bank)
+    if product:
+        q = q.where(LoanRate.product_name.in_(_product_names(product)))
+    if max_rate is not None:
+        q = q.where(LoanRate.rate_value <= max_rate)
+    if valid_on is not None:
+        q = q.where(_valid_on(valid_on))
+
+    total = db.session.execute(db.select(db.func.count()).select_from(q.subquery())).scalar_one()
+    rows = db.session.execute(q.order_by(*LOAN_SORTS[sort]()).limit(limit).offset(offset)).all()
+    return {
+        "count": total,
+        "limit": limit,
+        "offset": offset,
+        "items": [_rate_dict(rate, bank_name) for rate, bank_name in rows],
+    }
+
+
+class BestRateIndex:
+    """
+    Per-product lists of rates sorted by rate_value, so the best rate valid on
+    a date is the first entry whose window contains it (no scan of the other
+    products, and usually no scan past the first few entries).
+
+    Rebuilt when the table's (count, max id) signature changes, checked at
+    most every `check_interval` seconds; call invalidate() after writes.
+    """
+
+    def __init__(self, check_interval: float = 30.0):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._by_product = None
+        self._signature = None
+        self._checked_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._by_product = None
+            self._signature = None
+
+    def _table_signature(self):
+        return tuple(db.session.execute(db.select(db.func.count(LoanRate.id), db.func.max(LoanRate.id))).one())
+
+    def _build(self):
+        by_product = {}
+        rows = db.session.execute(
+            db.select(LoanRate, Bank.name)
+            .join(Bank, Bank.id == LoanRate.bank_id)
+        ).all()
+        for rate, bank_name in rows:
+            by_product.setdefault(product_key(rate.product_name), []).append((
+                rate.valid_from or date.min,
+                rate.valid_to or date.max,
+                _rate_dict(rate, bank_name),
+            ))
+        for entries in by_product.values():
+            entries.sort(key=lambda e: (e[2]["rate_value"], e[2]["id"]))
+        return by_product
+
+    def _current(self):
+        now = time.monotonic()
+        if self._by_product is not None and now - self._checked_at < self.check_interval:
+            return self._by_product
+        with self._lock:
+            signature = self._table_signature()
+            if self._by_product is None or signature != self._signature:
+                self._by_product = self._build()
+                self._signature = signature
+            self._checked_at = now
+            return self._by_product
+
+    def best(self, product: str, on: date | None = None, limit: int = 1) -> list:
+        on = on or date.today()
+        out = []
+        for valid_from, valid_to, item in self._current().get(product_key(product), []):
+            if valid_from <= on <= valid_to:
+                out.append(item)
+                if len(out) >= limit:
+                    break
+        return out
+
+
+best_rates = BestRateIndex()
@@ -0,0 +1,116 @@
+import threading
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import update
+
+from ..extensions import db
+from ..ml.inference import CATEGORICAL_COLS, NUMERIC_COLS, predict_batch
+from ..models.startup import Startup, StartupMetrics
+
+
+FEATURE_COLS = CATEGORICAL_COLS + NUMERIC_COLS
+
+_job_lock = threading.Lock()
+_job_state = {"running": False}
+
+
+def _iter_feature_chunks(chunk_size: int):
+    """
+    Yield lists of (startup_id, features) for startups that have metrics,
+    keyset-paginated on startups.id so no chunk re-scans earlier rows.
+    """
+    cols = [getattr(StartupMetrics, c) for c in FEATURE_COLS]
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            db.select(Startup.id, *cols)
+            .join(StartupMetrics, StartupMetrics.startup_id == Startup.id)
+            .where(Startup.id > last_id)
+            .order_by(Startup.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield [(r[0], dict(zip(FEATURE_COLS, r[1:]))) for r in rows]
+
+
+def score_portfolio(model_dir=None, chunk_size: int = 1000, version: str | None = None, progress=None) -> dict:
+    """
+    Score every startup with stored metrics and persist p_reach_100k,
+    score_band, score_model_version and scored_at on the startup row.
+    Each chunk is one vectorized predict_batch() call and one executemany
+    UPDATE, committed per chunk. Must run inside an app context.
+    """
+    model_dir = model_dir or current_app.config["MODEL_DIR"]
+    stats = {"processed": 0, "scored": 0, "skipped": 0, "model_version": None}
+
+    for chunk in _iter_feature_chunks(chunk_size):
+        results = predict_batch([features for _, features in chunk], model_dir, version=version, explain=False)
+        now = datetime.utcnow()
+
+        updates = []
+        for (startup_id, _), item in zip(chunk, results):
+            if "error" in item:
+                stats["skipped"] += 1
+                continue
+            result = item["result"]
+            stats["model_version"] = result["model_version"]
+            updates.append({
+                "id": startup_id,
+                "p_reach_100k": result["p_reach_100k"],
+                "score_band": result["band"],
+                "score_model_version": result["model_version"],
+                "scored_at": now,
+            })
+
+        if updates:
+            db.session.execute(update(Startup), updates)
+        db.session.commit()
+
+        stats["processed"] += len(chunk)
+        stats["scored"] += len(updates)
+        if progress:
+            progress(dict(stats))
+
+    return stats
+
+
+def portfolio_job_status() -> dict:
+    with _job_lock:
+        return dict(_job_state)
+
+
+def start_portfolio_job(app, chunk_size: int = 1000, version: str | None = None) -> bool:
+    """
+    Run score_portfolio() in a background thread. Returns False if a job is
+    already running in this process.
+    """
+    with _job_lock:
+        if _job_state.get("running"):
+            return False
+        _job_state.clear()
+        _job_state.update({"running": True, "started_at": datetime.utcnow().isoformat(), "error": None})
+
+    def _progress(stats):
+        with _job_lock:
+            _job_state.update(stats)
+
+    def _run():
+        with app.app_context():
+            try:
+                stats = score_portfolio(chunk_size=chunk_size, version=version, progress=_progress)
+                _progress(stats)
+            except Exception as e:  # report instead of dying silently in the thread
+                db.session.rollback()
+                with _job_lock:
+                    _job_state["error"] = str(e)
+            finally:
+                db.session.remove()
+                with _job_lock:
+                    _job_state["running"] = False
+                    _job_state["finished_at"] = datetime.utcnow().isoformat()
+
+    threading.Thread(target=_run, name="portfolio-scoring", daemon=True).start()
+    return True
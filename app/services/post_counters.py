@@ -0,0 +1,86 @@
+"""
+Denormalized per-post engagement counters (posts.comment_count,
+like_count, save_count).
+
+Writers bump them with a single `UPDATE posts SET x = x + 1` in the same
+transaction as the comment/reaction insert, so the increment is atomic in
+the database and never lost to a read-modify-write race.
+
+reconcile_post_counters() repairs drift (bulk imports, manual deletes) with
+one set-based `UPDATE posts SET x = (SELECT COUNT(*) ...)` limited to the
+posts whose counters differ, like migration c3a7f1d9e254. Each row is
+recomputed inside the UPDATE itself, so a bump committed while the job runs
+is never overwritten with a count read before it.
+"""
+import time
+
+from ..extensions import db
+from ..models.post import Comment, Post, Reaction
+
+REACTION_COUNTERS = {"LIKE": "like_count", "SAVE": "save_count"}
+COUNTER_COLUMNS = ("comment_count", "like_count", "save_count")
+
+
+def bump_post_counter(post_id: int, column: str, delta: int = 1):
+    """
+    Atomic `column = column + delta`; the caller commits.
+    """
+    if column not in COUNTER_COLUMNS:
+        raise ValueError(f"Unknown post counter: {column}")
+    col = getattr(Post, column)
+    db.session.execute(db.update(Post).where(Post.id == post_id).values({col: col + delta}))
+
+
+def _expected_counts() -> dict:
+    """
+    {column: correlated COUNT(*) subquery} for each counter of the outer posts row.
+    """
+    expected = {
+        "comment_count": db.select(db.func.count()).where(Comment.post_id == Post.id).scalar_subquery(),
+    }
+    for kind, column in REACTION_COUNTERS.items():
+        expected[column] = (
+            db.select(db.func.count())
+            .where(Reaction.post_id == Post.id, Reaction.type == kind)
+            .scalar_subquery()
+        )
+    return expected
+
+
+def reconcile_post_counters(dry_run: bool = False) -> dict:
+    """
+    Returns {"posts": n, "drifted": n, "examples": [...], "seconds": s}.
+    """
+    t0 = time.perf_counter()
+    expected = _expected_counts()
+    drifted = db.or_(*[getattr(Post, c) != expected[c] for c in COUNTER_COLUMNS])
+
+    posts = db.session.execute(db.select(db.func.count(Post.id))).scalar_one()
+    examples = [
+        {"id": post_id, **dict(zip(COUNTER_COLUMNS, counts))}
+        for post_id, *counts in db.session.execute(
+            db.select(Post.id, *[expected[c] for c in COUNTER_COLUMNS]).where(drifted).order_by(Post.id).limit(10)
+        )
+    ]
+
+    if dry_run:
+        n_drifted = db.session.execute(db.select(db.func.count(Post.id)).where(drifted)).scalar_one()
+    else:
+        try:
+            result = db.session.execute(
+                db.update(Post).where(drifted).values({getattr(Post, c): expected[c] for c in COUNTER_COLUMNS})
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        n_drifted = result.rowcount
+
+    return {
+        "posts": posts,
+        "drifted": n_drifted,
+        "examples": examples,
+        "dry_run": dry_run,
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
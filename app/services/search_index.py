@@ -0,0 +1,480 @@
+"""
+Full-text search over posts (title + content), comments and legal
+resources (title + summary).
+
+An in-process inverted index: term -> (doc numbers, term frequencies) in
+append-only arrays, plus per-document kind, visibility (startup_id, -1 for
+public) and length. A query scores the posting lists of its terms with
+BM25 in numpy, masks out documents the user may not see (same rule as the
+post feed: public posts plus their own startup's) and returns the top
+ranks; only the requested page is loaded from the database.
+
+Text is case- and accent-folded ("Crédit" matches "credit"); titles count
+twice.
+
+The index is built and kept current by a background thread, started by the
+first search a process serves (never by CLI commands). Until the first build
+is done, searches are answered by like_search() (LIKE '%term%' scans,
+newest first, unranked). Rebuilds happen off to the side and are swapped
+in, so searches never wait for one.
+
+Kept current by
+- add_post() / add_comment(), called by the routes after commit
+- a catch-up pass every SEARCH_SYNC_INTERVAL seconds (rows written by other
+  workers, seed scripts), primary-key lookups only:
+  1. rows above the highest id read by a previous pass (route-time adds do
+     not move it)
+  2. ids below it that were missing when it was read (gaps), re-read for
+     GAP_TTL seconds: rows committed out of id order
+  3. a full rebuild when MAX(id) fell below that watermark (the table was
+     cleared, e.g. seed-hub --clear)
+- a full rebuild every SEARCH_REBUILD_INTERVAL seconds, which drops deleted
+  rows (until then they are skipped when a page is loaded) and picks up
+  tables refilled with reused ids
+"""
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from array import array
+
+import numpy as np
+
+from ..extensions import db
+from ..models.hub import LegalResource
+from ..models.post import Comment, Post
+
+log = logging.getLogger(__name__)
+
+KINDS = ("post", "comment", "legal")
+_KIND_CODE = {k: i for i, k in enumerate(KINDS)}
+PUBLIC = -1
+
+STOPWORDS = frozenset(
+    "the and for with from this that are was were our your you not but has have "
+    "les des une pour dans par sur avec est sont aux ces qui que pas plus "
+    "de la le et en du un au ou".split()
+)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+
+# missing ids tracked per pass: only the newest ids can belong to open transactions
+GAP_SPAN = 1000
+GAP_TTL = 300.0
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", (text or "").casefold())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall(fold(text)) if len(t) > 1 and t not in STOPWORDS]
+
+
+class _Postings:
+    __slots__ = ("docs", "tfs")
+
+    def __init__(self):
+        self.docs = array("i")
+        self.tfs = array("f")
+
+
+def _id_column(kind: str):
+    return {"post": Post.id, "comment": Comment.id, "legal": LegalResource.id}[kind]
+
+
+def _rows(kind: str, where):
+    if kind == "post":
+        q = db.select(Post.id, Post.startup_id, Post.title, Post.content)
+    elif kind == "comment":
+        q = (
+            db.select(Comment.id, Post.startup_id, db.null(), Comment.content)
+            .join(Post, Post.id == Comment.post_id)
+        )
+    else:
+        q = db.select(LegalResource.id, db.null(), LegalResource.title, LegalResource.summary)
+    return db.session.execute(q.where(where).order_by(_id_column(kind))).all()
+
+
+class _IndexData:
+    """
+    One generation of the index. Documents are only appended; a rebuild
+    fills a new instance and swaps it in.
+    """
+
+    def __init__(self):
+        self.terms = {}
+        self.kinds = array("b")
+        self.ids = array("i")
+        self.startups = array("i")
+        self.lengths = array("f")
+        self.by_key = {}
+        self.counts = dict.fromkeys(KINDS, 0)
+        # highest id read by a sync pass, per kind
+        self.synced_id = dict.fromkeys(KINDS, 0)
+        # kind -> {missing id below synced_id: monotonic time first missed}
+        self.gaps = {k: {} for k in KINDS}
+        self._meta = None
+        self._meta_n = 0
+
+    def add(self, kind: str, doc_id: int, startup_id, title: str | None, body: str | None):
+        if (kind, doc_id) in self.by_key:
+            return
+        tf = {}
+        for t in tokenize(title):
+            tf[t] = tf.get(t, 0) + TITLE_WEIGHT
+        for t in tokenize(body):
+            tf[t] = tf.get(t, 0) + 1
+
+        n = len(self.ids)
+        self.by_key[(kind, doc_id)] = n
+        self.kinds.append(_KIND_CODE[kind])
+        self.ids.append(doc_id)
+        self.startups.append(PUBLIC if startup_id is None else startup_id)
+        self.lengths.append(sum(tf.values()))
+        for term, count in tf.items():
+            postings = self.terms.get(term)
+            if postings is None:
+                postings = self.terms[term] = _Postings()
+            postings.docs.append(n)
+            postings.tfs.append(count)
+
+        self.counts[kind] += 1
+
+    def add_rows(self, kind: str, rows):
+        for doc_id, startup_id, title, body in rows:
+            self.add(kind, doc_id, startup_id, title, body)
+
+    def advance(self, kind: str, read_ids, now: float):
+        """
+        Move the watermark past the ids read above it; ids skipped on the way
+        (and not indexed by a route) become gaps.
+        """
+        gaps = self.gaps[kind]
+        for doc_id in read_ids:
+            gaps.pop(doc_id, None)
+        for doc_id, first_missed in list(gaps.items()):
+            if now - first_missed >= GAP_TTL:
+                del gaps[doc_id]
+
+        previous = self.synced_id[kind]
+        top = max(read_ids, default=previous)
+        if top <= previous:
+            return
+        read = set(read_ids)
+        for doc_id in range(max(previous + 1, top - GAP_SPAN), top):
+            if doc_id not in read and (kind, doc_id) not in self.by_key:
+                gaps.setdefault(doc_id, now)
+        self.synced_id[kind] = top
+
+    def meta_arrays(self, n_docs: int):
+        # appended into preallocated buffers: only the new documents are copied
+        meta = self._meta
+        if meta is None or len(meta[0]) < n_docs:
+            capacity = max(1024, 2 * n_docs)
+            grown = (
+                np.empty(capacity, dtype=np.float32),
+                np.empty(capacity, dtype=np.int8),
+                np.empty(capacity, dtype=np.int64),
+                np.empty(capacity, dtype=np.int64),
+            )
+            if meta is not None:
+                for new, old in zip(grown, meta):
+                    new[:self._meta_n] = old[:self._meta_n]
+            meta = self._meta = grown
+        if self._meta_n < n_docs:
+            start = self._meta_n
+            for buf, src in zip(meta, (self.lengths, self.kinds, self.startups, self.ids)):
+                buf[start:n_docs] = src[start:n_docs]
+            self._meta_n = n_docs
+        return tuple(buf[:n_docs] for buf in meta)
+
+
+class SearchIndex:
+    def __init__(self, sync_interval: float = 5.0, rebuild_interval: float = 3600.0):
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._built_at = 0.0
+        self._lock = threading.RLock()
+        self._start_lock = threading.Lock()
+        self._app = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._data = _IndexData()
+        self._built = False
+
+    def init_app(self, app):
+        self.sync_interval = float(app.config.get("SEARCH_SYNC_INTERVAL", self.sync_interval))
+        self.rebuild_interval = float(app.config.get("SEARCH_REBUILD_INTERVAL", self.rebuild_interval))
+        self._app = app
+        self.stop()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._data = _IndexData()
+            self._built = False
+
+    @property
+    def ready(self) -> bool:
+        return self._built
+
+    # -------------------------
+    # Background build / catch-up
+    # -------------------------
+    def start(self):
+        """
+        Build the index and keep it current in a background thread (once per process).
+        """
+        if self._thread is not None or self._app is None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            stop = self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(stop,), name="search-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self, stop):
+        with self._app.app_context():
+            while not stop.is_set():
+                try:
+                    self.sync()
+                except Exception:
+                    log.exception("Search index: sync failed")
+                finally:
+                    db.session.remove()
+                stop.wait(self.sync_interval)
+
+    # -------------------------
+    # Indexing
+    # -------------------------
+    def add_post(self, post):
+        if not self._built:
+            return
+        with self._lock:
+            self._data.add("post", post.id, post.startup_id, post.title, post.content)
+
+    def add_comment(self, comment, post):
+        if not self._built:
+            return
+        with self._lock:
+            self._data.add("comment", comment.id, post.startup_id, None, comment.content)
+
+    def build(self):
+        """
+        Read every row into a new index and swap it in.
+        """
+        data = _IndexData()
+        now = time.monotonic()
+        for kind in KINDS:
+            rows = _rows(kind, _id_column(kind) > 0)
+            data.add_rows(kind, rows)
+            data.advance(kind, [r[0] for r in rows], now)
+        with self._lock:
+            self._data = data
+            self._built = True
+            self._built_at = time.monotonic()
+
+    def sync(self):
+        """
+        One catch-up pass (a full build the first time, when a table was
+        cleared or when the index is older than rebuild_interval).
+        """
+        if not self._built or 0 < self.rebuild_interval <= time.monotonic() - self._built_at:
+            self.build()
+            return
+        data = self._data
+        maxima = {
+            kind: db.session.execute(db.select(db.func.max(_id_column(kind)))).scalar() or 0
+            for kind in KINDS
+        }
+        if any(maxima[k] < data.synced_id[k] for k in KINDS):
+            log.info("Search index: rows were deleted, rebuilding")
+            self.build()
+            return
+
+        now = time.monotonic()
+        for kind in KINDS:
+            id_col = _id_column(kind)
+            where = id_col > data.synced_id[kind]
+            if data.gaps[kind]:
+                where = db.or_(where, id_col.in_(list(data.gaps[kind])))
+            rows = _rows(kind, where)
+            with self._lock:
+                if data is not self._data:
+                    return
+                data.add_rows(kind, rows)
+                data.advance(kind, [r[0] for r in rows], now)
+
+    # -------------------------
+    # Query
+    # -------------------------
+    def search(self, query: str, startup_id: int | None = None, kinds=KINDS,
+               limit: int = 20, offset: int = 0) -> dict:
+        """
+        { "count": matches, "hits": [(kind, id, score), ...] } for one page,
+        best first. Documents match when they contain any query term.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+
+        with self._lock:
+            data = self._data
+            n_docs = len(data.ids)
+            postings = [(data.terms[t].docs, data.terms[t].tfs) for t in terms if t in data.terms]
+            if not n_docs or not postings:
+                return {"count": 0, "hits": []}
+            # copies, so writers can keep appending while we score
+            postings = [(np.array(d, dtype=np.int64), np.array(f, dtype=np.float32)) for d, f in postings]
+            lengths, kind_codes, startups, ids = data.meta_arrays(n_docs)
+
+        avg_len = float(lengths.mean()) or 1.0
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for docs, tfs in postings:
+            idf = math.log(1.0 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * lengths[docs] / avg_len)
+            np.add.at(scores, docs, idf * tfs * (BM25_K1 + 1.0) / (tfs + norm))
+
+        visible = startups == PUBLIC
+        if startup_id is not None:
+            visible |= startups == startup_id
+        wanted = np.isin(kind_codes, [_KIND_CODE[k] for k in kinds])
+        matches = np.flatnonzero((scores > 0) & visible & wanted)
+
+        end = offset + limit
+        if end < len(matches):
+            top = matches[np.argpartition(-scores[matches], end - 1)[:end]]
+        else:
+            top = matches
+        # best first; ties: newest first
+        top = top[np.lexsort((-ids[top], -scores[top]))][offset:end]
+        hits = [(KINDS[kind_codes[i]], int(ids[i]), round(float(scores[i]), 4)) for i in top]
+        return {"count": int(len(matches)), "hits": hits}
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "documents": len(self._data.ids),
+                "terms": len(self._data.terms),
+                "by_kind": dict(self._data.counts),
+                "built": self._built,
+            }
+
+
+search_index = SearchIndex()
+
+
+# -------------------------
+# Results
+# -------------------------
+def snippet(text: str | None, terms: list, width: int = 160) -> str:
+    text = " ".join((text or "").split())
+    folded = fold(text)
+    positions = [m.start() for m in (re.search(rf"\b{re.escape(t)}", folded) for t in terms) if m]
+    start = max(min(positions) - width // 4, 0) if positions else 0
+    out = text[start:start + width]
+    return ("…" if start else "") + out + ("…" if start + width < len(text) else "")
+
+
+def like_search(query: str, startup_id: int | None = None, kinds=KINDS, limit: int = 20) -> list:
+    """
+    [(kind, id, None), ...] from LIKE '%term%' scans with the same visibility
+    rule, newest first per kind, unranked: the answer while the index is
+    being built (and the baseline of app/bench/search.py).
+    """
+    terms = tokenize(query)
+    if not terms:
+        return []
+    visible = Post.startup_id.is_(None) if startup_id is None else db.or_(
+        Post.startup_id.is_(None), Post.startup_id == startup_id
+    )
+
+    def _any(*cols):
+        return db.or_(*[col.like(f"%{t}%") for t in terms for col in cols])
+
+    hits = []
+    if "post" in kinds:
+        hits += [("post", i, None) for i in db.session.execute(
+            db.select(Post.id).where(visible, _any(Post.title, Post.content)).order_by(Post.id.desc()).limit(limit)
+        ).scalars()]
+    if "comment" in kinds:
+        hits += [("comment", i, None) for i in db.session.execute(
+            db.select(Comment.id).join(Post, Post.id == Comment.post_id)
+            .where(visible, _any(Comment.content)).order_by(Comment.id.desc()).limit(limit)
+        ).scalars()]
+    if "legal" in kinds:
+        hits += [("legal", i, None) for i in db.session.execute(
+            db.select(LegalResource.id).where(_any(LegalResource.title, LegalResource.summary))
+            .order_by(LegalResource.id.desc()).limit(limit)
+        ).scalars()]
+    return hits
+
+
+def search(query: str, startup_id: int | None = None, kinds=KINDS, limit: int = 20, offset: int = 0) -> dict:
+    """
+    A ranked page of search results with titles and snippets, loaded with
+    one query per result kind. While the index is not built yet the page
+    comes from like_search() ("ranked": false, scores null, "count" only
+    covers the rows scanned).
+    """
+    search_index.start()
+    ranked = search_index.ready
+    if ranked:
+        result = search_index.search(query, startup_id, kinds, limit, offset)
+    else:
+        hits = like_search(query, startup_id, kinds, offset + limit)
+        result = {"count": len(hits), "hits": hits[offset:offset + limit]}
+    terms = tokenize(query)
+
+    wanted = {}
+    for kind, doc_id, _ in result["hits"]:
+        wanted.setdefault(kind, []).append(doc_id)
+
+    rows = {}
+    if "post" in wanted:
+        for p in db.session.execute(db.select(Post).where(Post.id.in_(wanted["post"]))).scalars():
+            rows[("post", p.id)] = {
+                "title": p.title,
+                "snippet": snippet(p.content, terms),
+                "startup_id": p.startup_id,
+                "created_at": p.created_at.isoformat() if p.created_at else None,
+            }
+    if "comment" in wanted:
+        for c in db.session.execute(db.select(Comment).where(Comment.id.in_(wanted["comment"]))).scalars():
+            rows[("comment", c.id)] = {
+                "post_id": c.post_id,
+                "snippet": snippet(c.content, terms),
+                "created_at": c.created_at.isoformat() if c.created_at else None,
+            }
+    if "legal" in wanted:
+        for r in db.session.execute(db.select(LegalResource).where(LegalResource.id.in_(wanted["legal"]))).scalars():
+            rows[("legal", r.id)] = {
+                "title": r.title,
+                "category": r.category,
+                "snippet": snippet(r.summary, terms),
+            }
+
+    items = [
+        {"type": kind, "id": doc_id, "score": score, **rows[(kind, doc_id)]}
+        for kind, doc_id, score in result["hits"]
+        if (kind, doc_id) in rows
+    ]
+    return {
+        "query": query,
+        "count": result["count"],
+        "limit": limit,
+        "offset": offset,
+        "ranked": ranked,
+        "items": items,
+    }
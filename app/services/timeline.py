@@ -0,0 +1,215 @@
+"""
+Precomputed feed timelines (fan-out on write).
+
+Each workspace has a timeline: the newest post ids, newest first, trimmed
+to TIMELINE_MAX_LEN. "public" holds the posts without a startup,
+"startup:<id>" a workspace's posts; a user's home feed merges the public
+timeline with their startup's, so creating a post writes to exactly one
+list.
+
+Posts are not committed in id order when several workers or threads
+write, so a timeline is never extended by "ids newer than the head":
+writes and catch-ups merge ids into it (union, deduplicated, sorted by
+id, trimmed).
+
+Backends:
+- memory (default): per process. Posts created by this process are merged
+  in immediately.
+- redis (TIMELINE_REDIS_URL, needs the `redis` package): shared by all
+  workers, a sorted set per timeline (ZADD + trim by rank). Falls back to
+  memory when the package is missing or the server is unreachable at
+  startup.
+
+With either backend, the newest TIMELINE_MAX_LEN ids of a timeline are
+re-read from the database and merged in at most every
+TIMELINE_SYNC_INTERVAL seconds, which picks up posts written by other
+workers and any write whose push failed. Store errors are logged and the
+feed falls back to the database.
+
+A timeline is loaded from the database on first use. Pages that reach
+past the trimmed end are served by feed_service's keyset queries instead.
+"""
+import logging
+import threading
+import time
+
+from ..extensions import db
+from ..models.post import Post
+
+log = logging.getLogger(__name__)
+
+
+def timeline_key(startup_id: int | None) -> str:
+    return "public" if startup_id is None else f"startup:{startup_id}"
+
+
+def _branch_filter(startup_id: int | None):
+    return Post.startup_id.is_(None) if startup_id is None else Post.startup_id == startup_id
+
+
+def _recent_ids(startup_id: int | None, limit: int) -> list:
+    q = db.select(Post.id).where(_branch_filter(startup_id))
+    return list(db.session.execute(q.order_by(Post.id.desc()).limit(limit)).scalars())
+
+
+class MemoryTimelineBackend:
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lists = {}
+
+    def load(self, key: str):
+        return self._lists.get(key)
+
+    def replace(self, key: str, ids: list):
+        with self._lock:
+            self._lists[key] = sorted(set(ids), reverse=True)
+
+    def merge(self, key: str, ids: list, max_len: int):
+        """
+        Union of a loaded timeline and ids, newest first, trimmed; unknown
+        timelines are left alone (they are loaded from the DB on first read).
+        """
+        with self._lock:
+            current = self._lists.get(key)
+            if current is None:
+                return
+            merged = sorted(set(current).union(ids), reverse=True)[:max_len]
+            if merged != current:
+                self._lists[key] = merged
+
+    def clear(self):
+        with self._lock:
+            self._lists.clear()
+
+
+class RedisTimelineBackend:
+    shared = True
+    LOADED_SET = "timeline:loaded"
+
+    def __init__(self, url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._redis.ping()
+
+    def _key(self, key: str) -> str:
+        return f"timeline:{key}"
+
+    def load(self, key: str):
+        pipe = self._redis.pipeline()
+        pipe.sismember(self.LOADED_SET, key)
+        pipe.zrevrange(self._key(key), 0, -1)
+        loaded, ids = pipe.execute()
+        return [int(i) for i in ids] if loaded else None
+
+    def replace(self, key: str, ids: list):
+        pipe = self._redis.pipeline()
+        pipe.delete(self._key(key))
+        if ids:
+            pipe.zadd(self._key(key), {i: i for i in ids})
+        pipe.sadd(self.LOADED_SET, key)
+        pipe.execute()
+
+    def merge(self, key: str, ids: list, max_len: int):
+        if not ids or not self._redis.sismember(self.LOADED_SET, key):
+            return
+        pipe = self._redis.pipeline()
+        pipe.zadd(self._key(key), {i: i for i in ids})
+        # keep the max_len highest ids
+        pipe.zremrangebyrank(self._key(key), 0, -(max_len + 1))
+        pipe.execute()
+
+    def clear(self):
+        keys = [self._key(k.decode()) for k in self._redis.smembers(self.LOADED_SET)]
+        self._redis.delete(self.LOADED_SET, *keys)
+
+
+class TimelineCache:
+    def __init__(self, max_len: int = 500, sync_interval: float = 2.0):
+        self.max_len = max_len
+        self.sync_interval = sync_interval
+        self.backend = MemoryTimelineBackend()
+        self._synced_at = {}
+
+    def init_app(self, app):
+        self.max_len = int(app.config.get("TIMELINE_MAX_LEN", self.max_len))
+        self.sync_interval = float(app.config.get("TIMELINE_SYNC_INTERVAL", self.sync_interval))
+        self.backend = MemoryTimelineBackend()
+        self._synced_at = {}
+
+        url = app.config.get("TIMELINE_REDIS_URL")
+        if url:
+            try:
+                self.backend = RedisTimelineBackend(url)
+            except Exception as e:  # ImportError, connection errors
+                log.warning("Timeline store: Redis unavailable (%s), using in-memory timelines", e)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_len > 0
+
+    def push(self, post):
+        """
+        Fan-out on write: call after the post is committed. Never raises; a
+        failed push is repaired by the next catch-up from the database.
+        """
+        if not self.enabled:
+            return
+        key = timeline_key(post.startup_id)
+        try:
+            self.backend.merge(key, [post.id], self.max_len)
+        except Exception as e:
+            log.warning("Timeline store: push of post %s to %s failed (%s)", post.id, key, e)
+            self._synced_at.pop(key, None)
+
+    def ids(self, startup_id: int | None) -> list:
+        """
+        The timeline (newest first), loaded or caught up from the DB if needed.
+        """
+        key = timeline_key(startup_id)
+        ids = self.backend.load(key)
+        if ids is None:
+            ids = _recent_ids(startup_id, self.max_len)
+            self.backend.replace(key, ids)
+            self._synced_at[key] = time.monotonic()
+            return ids
+
+        if time.monotonic() - self._synced_at.get(key, 0.0) >= self.sync_interval:
+            # re-read the whole window: a lower id may have been committed after a higher one
+            window = _recent_ids(startup_id, self.max_len)
+            self._synced_at[key] = time.monotonic()
+            if not set(window).issubset(ids):
+                self.backend.merge(key, window, self.max_len)
+                ids = self.backend.load(key)
+        return ids
+
+    def page_ids(self, startup_id: int | None, before_id: int | None, n: int):
+        """
+        Up to n ids older than before_id, or None when the page reaches past
+        the trimmed end of the timeline or the store failed (the caller
+        queries the DB instead).
+        """
+        try:
+            ids = self.ids(startup_id)
+        except Exception as e:
+            if not self.backend.shared:
+                raise
+            log.warning("Timeline store: read of %s failed (%s)", timeline_key(startup_id), e)
+            return None
+        if before_id is None:
+            start = 0
+        else:
+            start = next((i for i, post_id in enumerate(ids) if post_id < before_id), len(ids))
+        page = ids[start:start + n]
+        if len(page) < n and len(ids) >= self.max_len:
+            return None
+        return page
+
+    def clear(self):
+        self.backend.clear()
+        self._synced_at = {}
+
+
+timelines = TimelineCache()
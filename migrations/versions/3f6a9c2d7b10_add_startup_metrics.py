@@ -0,0 +1,52 @@
+"""add startup metrics
+
+Revision ID: 3f6a9c2d7b10
+Revises: 98b4ecc3096f
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6a9c2d7b10'
+down_revision = '98b4ecc3096f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('startup_metrics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('startup_id', sa.Integer(), nullable=False),
+    sa.Column('industry', sa.String(length=120), nullable=True),
+    sa.Column('business_model', sa.String(length=40), nullable=True),
+    sa.Column('market_size', sa.String(length=40), nullable=True),
+    sa.Column('competition_level', sa.String(length=40), nullable=True),
+    sa.Column('customer_traction', sa.Integer(), nullable=True),
+    sa.Column('team_size', sa.Integer(), nullable=True),
+    sa.Column('founder_experience_years', sa.Integer(), nullable=True),
+    sa.Column('has_technical_cofounder', sa.Boolean(), nullable=True),
+    sa.Column('mvp_ready', sa.Boolean(), nullable=True),
+    sa.Column('months_since_start', sa.Integer(), nullable=True),
+    sa.Column('monthly_growth_rate_pct', sa.Float(), nullable=True),
+    sa.Column('initial_capital_tnd', sa.Float(), nullable=True),
+    sa.Column('monthly_burn_tnd', sa.Float(), nullable=True),
+    sa.Column('revenue_tnd_current_month', sa.Float(), nullable=True),
+    sa.Column('has_investor', sa.Boolean(), nullable=True),
+    sa.Column('reached_100k', sa.Boolean(), nullable=True),
+    sa.Column('months_to_100k', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['startup_id'], ['startups.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('startup_metrics', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_startup_metrics_startup_id'), ['startup_id'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('startup_metrics', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_startup_metrics_startup_id'))
+
+    op.drop_table('startup_metrics')
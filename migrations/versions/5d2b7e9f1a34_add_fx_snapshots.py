@@ -0,0 +1,38 @@
+"""add fx snapshots
+
+Revision ID: 5d2b7e9f1a34
+Revises: 7c1e4b8a9d22
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2b7e9f1a34'
+down_revision = '7c1e4b8a9d22'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('fx_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('rate_date', sa.Date(), nullable=False),
+    sa.Column('usd_rate', sa.Float(), nullable=False),
+    sa.Column('source_timestamp', sa.Integer(), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('currency', 'rate_date', name='uq_fx_snapshots_currency_date')
+    )
+    with op.batch_alter_table('fx_snapshots', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_fx_snapshots_rate_date'), ['rate_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('fx_snapshots', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_fx_snapshots_rate_date'))
+
+    op.drop_table('fx_snapshots')
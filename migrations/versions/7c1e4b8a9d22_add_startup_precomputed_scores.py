@@ -0,0 +1,36 @@
+"""add precomputed scores to startups
+
+Revision ID: 7c1e4b8a9d22
+Revises: 3f6a9c2d7b10
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4b8a9d22'
+down_revision = '3f6a9c2d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('startups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('p_reach_100k', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('score_band', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('score_model_version', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('scored_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_startups_p_reach_100k'), ['p_reach_100k'], unique=False)
+        batch_op.create_index(batch_op.f('ix_startups_score_band'), ['score_band'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('startups', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_startups_score_band'))
+        batch_op.drop_index(batch_op.f('ix_startups_p_reach_100k'))
+        batch_op.drop_column('scored_at')
+        batch_op.drop_column('score_model_version')
+        batch_op.drop_column('score_band')
+        batch_op.drop_column('p_reach_100k')
@@ -0,0 +1,32 @@
+"""add holiday years
+
+Revision ID: 8e4f1c6b2d57
+Revises: 5d2b7e9f1a34
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4f1c6b2d57'
+down_revision = '5d2b7e9f1a34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('holiday_years',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('country', sa.String(length=2), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('holidays', sa.Text(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('country', 'year', name='uq_holiday_years_country_year')
+    )
+
+
+def downgrade():
+    op.drop_table('holiday_years')
@@ -0,0 +1,30 @@
+"""add loan rate query indexes
+
+Revision ID: a1f3c5e7b902
+Revises: 8e4f1c6b2d57
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1f3c5e7b902'
+down_revision = '8e4f1c6b2d57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('loan_rates', schema=None) as batch_op:
+        batch_op.create_index('ix_loan_rates_product_rate', ['product_name', 'rate_value'], unique=False)
+        batch_op.create_index('ix_loan_rates_bank_product', ['bank_id', 'product_name'], unique=False)
+        batch_op.create_index('ix_loan_rates_validity', ['valid_from', 'valid_to'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('loan_rates', schema=None) as batch_op:
+        batch_op.drop_index('ix_loan_rates_validity')
+        batch_op.drop_index('ix_loan_rates_bank_product')
+        batch_op.drop_index('ix_loan_rates_product_rate')
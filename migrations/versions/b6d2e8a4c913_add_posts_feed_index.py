@@ -0,0 +1,26 @@
+"""add posts (startup_id, id) feed index
+
+Revision ID: b6d2e8a4c913
+Revises: a1f3c5e7b902
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2e8a4c913'
+down_revision = 'a1f3c5e7b902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_startup_id_id', ['startup_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_startup_id_id')
@@ -0,0 +1,38 @@
+"""add post engagement counters
+
+Revision ID: c3a7f1d9e254
+Revises: b6d2e8a4c913
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a7f1d9e254'
+down_revision = 'b6d2e8a4c913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('like_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('save_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # initial values; afterwards `flask seed reconcile-post-counters` repairs drift
+    op.execute(
+        "UPDATE posts SET "
+        "comment_count = (SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id), "
+        "like_count = (SELECT COUNT(*) FROM reactions WHERE reactions.post_id = posts.id AND reactions.type = 'LIKE'), "
+        "save_count = (SELECT COUNT(*) FROM reactions WHERE reactions.post_id = posts.id AND reactions.type = 'SAVE')"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('save_count')
+        batch_op.drop_column('like_count')
+        batch_op.drop_column('comment_count')
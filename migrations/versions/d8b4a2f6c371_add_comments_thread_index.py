@@ -0,0 +1,26 @@
+"""add comments (post_id, id) thread index
+
+Revision ID: d8b4a2f6c371
+Revises: c3a7f1d9e254
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b4a2f6c371'
+down_revision = 'c3a7f1d9e254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_post_id_id', ['post_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_post_id_id')